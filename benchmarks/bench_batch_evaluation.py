@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of evaluating one calculator graph for many input rows.
+
+Builds ``(a + b) * a / b`` in a headless :class:`~nodeeditor.node_scene.Scene` and evaluates it for every row,
+once by typing the values into the inputs row by row and once by
+:py:meth:`~nodeeditor.node_scene.Scene.evaluateBatch` over NumPy arrays.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_batch_evaluation --rows 1000,1000000
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_scene import Scene
+from examples.example_calculator.calc_conf import get_class_from_opcode, \
+    OP_NODE_INPUT, OP_NODE_ADD, OP_NODE_MUL, OP_NODE_DIV, OP_NODE_OUTPUT
+
+
+def build_graph():
+    scene = Scene(headless=True)
+    a, b = [get_class_from_opcode(OP_NODE_INPUT)(scene) for i in range(2)]
+    add = get_class_from_opcode(OP_NODE_ADD)(scene)
+    mul = get_class_from_opcode(OP_NODE_MUL)(scene)
+    div = get_class_from_opcode(OP_NODE_DIV)(scene)
+    output = get_class_from_opcode(OP_NODE_OUTPUT)(scene)
+    Edge(scene, a.outputs[0], add.inputs[0])
+    Edge(scene, b.outputs[0], add.inputs[1])
+    Edge(scene, add.outputs[0], mul.inputs[0])
+    Edge(scene, a.outputs[0], mul.inputs[1])
+    Edge(scene, mul.outputs[0], div.inputs[0])
+    Edge(scene, b.outputs[0], div.inputs[1])
+    Edge(scene, div.outputs[0], output.inputs[0])
+    return scene, a, b, output
+
+
+def bench_rows(a_values, b_values) -> float:
+    scene, a, b, output = build_graph()
+    # the calculator nodes print a lot while evaluating
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for a_value, b_value in zip(a_values, b_values):
+            a.setInputText(str(a_value))
+            b.setInputText(str(b_value))
+        return time.perf_counter() - start
+
+
+def bench_batch(a_values, b_values) -> float:
+    scene, a, b, output = build_graph()
+    start = time.perf_counter()
+    scene.evaluateBatch({a.id: a_values, b.id: b_values})
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', default="1000,1000000", help="comma separated number of input rows")
+    parser.add_argument('--max-scalar-rows', type=int, default=10000,
+                        help="row by row evaluation is measured on at most this many rows and extrapolated")
+    args = parser.parse_args(argv)
+
+    print("%10s %14s %12s %10s" % ("rows", "row by row", "batch", "speedup"))
+    for rows in [int(rows) for rows in args.rows.split(",")]:
+        a_values = numpy.arange(rows)
+        b_values = numpy.arange(rows) % 7
+        measured = min(rows, args.max_scalar_rows)
+        scalar = bench_rows(a_values[:measured], b_values[:measured]) * rows / measured
+        batch = bench_batch(a_values, b_values)
+        print("%10d %13.3fs %11.4fs %9.0fx" % (rows, scalar, batch, scalar / batch))
+
+
+if __name__ == '__main__':
+    main()
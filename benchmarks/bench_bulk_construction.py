@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of building big graphs with the regular `Node` / `Edge` constructors compared to
+:py:meth:`~nodeeditor.node_scene.Scene.addNodesBulk` and :py:meth:`~nodeeditor.node_scene.Scene.addEdgesBulk`.
+
+Builds a chain of nodes with the Qt graphics layer (offscreen). Creating the Qt content widgets dominates the
+time, the bulk API saves the per-item socket repositioning and BSP index updates.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_bulk_construction --sizes 1000,5000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from nodeeditor.node_scene import Scene
+from nodeeditor.node_node import Node
+from nodeeditor.node_edge import Edge
+
+
+def node_pos(i:int) -> tuple:
+    return (i % 100) * 200, (i // 100) * 300
+
+
+def bench_regular(size:int) -> float:
+    scene = Scene()
+    start = time.perf_counter()
+    prev = None
+    for i in range(size):
+        node = Node(scene, "Node %d" % i, inputs=[1], outputs=[1])
+        node.setPos(*node_pos(i))
+        if prev is not None: Edge(scene, prev.outputs[0], node.inputs[0])
+        prev = node
+    scene.grScene.items(scene.grScene.sceneRect())
+    return time.perf_counter() - start
+
+
+def bench_bulk(size:int) -> float:
+    scene = Scene()
+    start = time.perf_counter()
+    nodes = scene.addNodesBulk(
+        {'title': "Node %d" % i, 'inputs': [1], 'outputs': [1], 'pos': node_pos(i)} for i in range(size)
+    )
+    scene.addEdgesBulk((a.outputs[0], b.inputs[0]) for a, b in zip(nodes, nodes[1:]))
+    scene.grScene.items(scene.grScene.sceneRect())
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default="1000,5000", help="comma separated graph sizes")
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication([])
+
+    print("%10s %12s %12s" % ("nodes", "regular", "bulk"))
+    for size in [int(size) for size in args.sizes.split(",")]:
+        print("%10d %11.3fs %11.3fs" % (size, bench_regular(size), bench_bulk(size)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of re-evaluating a calculator graph after an input change.
+
+Builds a chain of `Add` nodes in a headless :class:`~nodeeditor.node_scene.Scene`, every one adding the input
+to the previous result, and types new values into the input. Compares the evaluation through the `Nodes` with
+the function generated by :class:`~nodeeditor.node_scene_compiler.SceneCompiler`.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_compiled_evaluation --sizes 100,1000,5000
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_scene import Scene
+from examples.example_calculator.calc_conf import get_class_from_opcode, OP_NODE_INPUT, OP_NODE_ADD, OP_NODE_OUTPUT
+
+
+def build_chain(size:int):
+    scene = Scene(headless=True)
+    input_node = get_class_from_opcode(OP_NODE_INPUT)(scene)
+    prev = input_node
+    for i in range(size):
+        add = get_class_from_opcode(OP_NODE_ADD)(scene)
+        Edge(scene, prev.outputs[0], add.inputs[0])
+        Edge(scene, input_node.outputs[0], add.inputs[1])
+        prev = add
+    output = get_class_from_opcode(OP_NODE_OUTPUT)(scene)
+    Edge(scene, prev.outputs[0], output.inputs[0])
+    return scene, input_node
+
+
+def bench(size:int, compiled:bool, edits:int) -> float:
+    scene, input_node = build_chain(size)
+    scene.compiler.setEnabled(compiled)
+    # the calculator nodes print a lot while evaluating
+    with contextlib.redirect_stdout(io.StringIO()):
+        input_node.setInputText("0")        # compiles the graph
+        start = time.perf_counter()
+        for i in range(edits): input_node.setInputText(str(i + 1))
+        return (time.perf_counter() - start) / edits
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default="100,1000,5000", help="comma separated number of Add nodes")
+    parser.add_argument('--edits', type=int, default=10, help="number of measured input changes")
+    args = parser.parse_args(argv)
+
+    print("%8s %14s %14s %10s" % ("nodes", "interpreted", "compiled", "speedup"))
+    for size in [int(size) for size in args.sizes.split(",")]:
+        interpreted = bench(size, False, args.edits)
+        compiled = bench(size, True, args.edits)
+        print("%8d %13.2fms %13.2fms %9.1fx" % (size, interpreted * 1000, compiled * 1000, interpreted / compiled))
+
+
+if __name__ == '__main__':
+    main()
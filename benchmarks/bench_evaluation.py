@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of evaluating calculator graphs after an input change.
+
+Builds a lattice of diamonds (every layer has two `Add` nodes taking both nodes of the previous layer as inputs)
+in a headless :class:`~nodeeditor.node_scene.Scene` and changes the input. Compares the topological
+:class:`~nodeeditor.node_scene_evaluator.SceneEvaluator` with the old recursive ``evalChildren``, which
+evaluates shared descendants once per path.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_evaluation --depths 12,16,20
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_node import Node
+from nodeeditor.node_scene import Scene
+from examples.example_calculator.calc_conf import get_class_from_opcode, OP_NODE_INPUT, OP_NODE_ADD
+
+
+def recursive_eval_children(self):
+    # evalChildren as it used to be
+    for node in self.getChildrenNodes():
+        node.eval()
+
+
+def build_diamonds(depth:int):
+    scene = Scene(headless=True)
+    input_node = get_class_from_opcode(OP_NODE_INPUT)(scene)
+    layer = [input_node, input_node]
+    for i in range(depth):
+        new_layer = [get_class_from_opcode(OP_NODE_ADD)(scene) for j in range(2)]
+        for node in new_layer:
+            Edge(scene, layer[0].outputs[0], node.inputs[0])
+            Edge(scene, layer[1].outputs[0], node.inputs[1])
+        layer = new_layer
+    return scene, input_node
+
+
+def bench(depth:int, recursive:bool=False) -> float:
+    scene, input_node = build_diamonds(depth)
+    original = Node.evalChildren
+    if recursive: Node.evalChildren = recursive_eval_children
+    try:
+        # the calculator nodes print a lot while evaluating
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            input_node.setInputText("2")
+            return time.perf_counter() - start
+    finally:
+        Node.evalChildren = original
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--depths', default="12,16,20", help="comma separated number of diamond layers")
+    args = parser.parse_args(argv)
+
+    print("%8s %8s %12s %12s" % ("depth", "nodes", "recursive", "topological"))
+    for depth in [int(depth) for depth in args.depths.split(",")]:
+        print("%8d %8d %11.3fs %11.3fs" % (depth, 2 * depth + 1, bench(depth, recursive=True), bench(depth)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the JSON backends from :mod:`nodeeditor.node_json_backend`.
+
+For every installed backend measures ``dumps`` and ``loads`` of a whole serialized headless `Scene` (as the
+clipboard does), ``dumps`` / ``loads`` of the `Nodes` one by one (as JSONL batch files and the binary format do)
+and the compact :py:meth:`~nodeeditor.node_scene.Scene.saveToFile`.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_json_backend --size 100000
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from benchmarks.bench_save import build_scene
+from nodeeditor.node_json_backend import BACKENDS, setJsonBackend
+
+
+def timed(function) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=100000, help="number of nodes")
+    args = parser.parse_args(argv)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        scene = build_scene(args.size)
+    data = scene.serialize()
+    filename = os.path.join(tempfile.mkdtemp(), "scene.json")
+
+    print("%10s %12s %12s %14s %14s %12s" % ("backend", "dumps", "loads", "dumps nodes", "loads nodes", "save"))
+    for name, backend in BACKENDS.items():
+        if not backend.isAvailable():
+            print("%10s not installed" % name)
+            continue
+        setJsonBackend(name)
+        text = backend.dumps(data, compact=True)
+        lines = [backend.dumps(node_data) for node_data in data['nodes']]
+        with contextlib.redirect_stdout(io.StringIO()):
+            save = timed(lambda: scene.saveToFile(filename, compact=True))
+        print("%10s %11.3fs %11.3fs %13.3fs %13.3fs %11.3fs" % (
+            name,
+            timed(lambda: backend.dumps(data, compact=True)),
+            timed(lambda: backend.loads(text)),
+            timed(lambda: [backend.dumps(node_data) for node_data in data['nodes']]),
+            timed(lambda: [backend.loads(line) for line in lines]),
+            save,
+        ))
+    os.remove(filename)
+
+
+if __name__ == '__main__':
+    main()
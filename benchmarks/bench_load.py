@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of loading big graphs with :py:meth:`~nodeeditor.node_scene.Scene.loadFromFile`.
+
+Compares the old path (whole file read to a string and decoded by ``json.loads`` before any `Node` exists) with
+the incremental :class:`~nodeeditor.node_json_reader.JsonStreamReader`. Every measurement runs in its own process,
+peak RSS growth includes the loaded model itself, which is the same for both.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_load --sizes 10000,100000
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from benchmarks.bench_save import build_scene, peak_rss
+
+MODES = ("loads", "stream")
+
+
+def measure(mode:str, filename:str) -> dict:
+    from nodeeditor.node_scene import Scene
+
+    gc.collect()
+    before = peak_rss()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        scene = Scene(headless=True)
+        if mode == "loads":
+            # the path used before incremental loading
+            with open(filename, 'r', encoding='utf-8') as file:
+                scene.deserialize(json.loads(file.read()))
+        else:
+            scene.loadFromFile(filename)
+    return {'time': time.perf_counter() - start, 'rss': peak_rss() - before, 'nodes': len(scene.nodes)}
+
+
+def run_child(mode:str, filename:str) -> dict:
+    output = subprocess.check_output([sys.executable, "-m", "benchmarks.bench_load", "--child", mode, filename],
+                                     cwd=os.path.join(os.path.dirname(__file__), ".."))
+    return json.loads(output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default="10000,100000", help="comma separated graph sizes")
+    parser.add_argument('--child', nargs=2, metavar=("MODE", "FILE"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure(*args.child)))
+        return
+
+    print("%10s %8s %10s %16s %12s" % ("nodes", "mode", "time", "peak RSS growth", "file size"))
+    with tempfile.TemporaryDirectory() as directory:
+        for size in [int(size) for size in args.sizes.split(",")]:
+            filename = os.path.join(directory, "scene_%d.json" % size)
+            with contextlib.redirect_stdout(io.StringIO()):
+                build_scene(size).saveToFile(filename)
+            for mode in MODES:
+                result = run_child(mode, filename)
+                print("%10d %8s %9.3fs %13.1f MB %9.1f MB" % (
+                    size, mode, result['time'], result['rss'] / 2**20, os.path.getsize(filename) / 2**20))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of parallel evaluation of wide fan-out graphs.
+
+One source `Node` feeds ``--width`` independent branch `Nodes` which all feed one sink. The branch kernels
+release the GIL like NumPy or I/O bound kernels do: ``--kernel hash`` hashes a buffer with ``hashlib``,
+``--kernel sleep`` waits as an I/O call would. The graph is evaluated by
+:class:`~nodeeditor.node_scene_evaluator.SceneEvaluator` with different numbers of worker threads.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_parallel_evaluation --width 64 --workers 1,2,4,8
+"""
+import argparse
+import hashlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_node import Node
+from nodeeditor.node_scene import Scene
+
+
+BUFFER = bytes(4 * 1024 * 1024)
+
+
+class KernelNode(Node):
+    """Thread-safe `Node` with a GIL releasing kernel"""
+    eval_thread_safe = True
+    kernel = "hash"
+
+    def eval(self):
+        if self.kernel == "hash": hashlib.sha256(BUFFER).digest()
+        else: time.sleep(0.005)
+        self.markDirty(False)
+        self.markDescendantsDirty()
+        self.evalChildren()
+        return 0
+
+
+def bench(width:int, workers:int, kernel:str) -> float:
+    KernelNode.kernel = kernel
+    scene = Scene(headless=True)
+    source = KernelNode(scene, "Source", inputs=[], outputs=[1])
+    sink = KernelNode(scene, "Sink", inputs=[1], outputs=[])
+    sink.inputs[0].is_multi_edges = True
+    for i in range(width):
+        branch = KernelNode(scene, "Branch", inputs=[1], outputs=[1])
+        Edge(scene, source.outputs[0], branch.inputs[0])
+        Edge(scene, branch.outputs[0], sink.inputs[0])
+
+    scene.evaluator.setMaxWorkers(workers)
+    try:
+        start = time.perf_counter()
+        scene.evaluator.evaluate([source])
+        return time.perf_counter() - start
+    finally:
+        scene.evaluator.shutdown()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--width', type=int, default=64, help="number of parallel branches")
+    parser.add_argument('--workers', default="1,2,4,8", help="comma separated worker counts")
+    parser.add_argument('--kernel', choices=("hash", "sleep"), default="hash", help="branch kernel")
+    args = parser.parse_args(argv)
+
+    print("%8s %12s" % ("workers", "time"))
+    for workers in [int(workers) for workers in args.workers.split(",")]:
+        print("%8d %11.3fs" % (workers, bench(args.width, workers, args.kernel)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of saving big graphs with :py:meth:`~nodeeditor.node_scene.Scene.saveToFile`.
+
+Compares the old path (``json.dumps(scene.serialize(), indent=4)`` written at once) with the streaming
+:class:`~nodeeditor.node_json_writer.JsonStreamWriter`, indented and compact. Every measurement runs in its own
+process building a headless chain of nodes, so the peak RSS growth while saving is not hidden by the previous run.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_save --sizes 10000,100000
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+MODES = ("dumps", "stream", "compact")
+
+
+def build_scene(size:int) -> 'Scene':
+    from nodeeditor.node_scene import Scene
+    from nodeeditor.node_node import Node
+    from nodeeditor.node_edge import Edge
+
+    scene = Scene(headless=True)
+    prev = None
+    for i in range(size):
+        node = Node(scene, "Node %d" % i, inputs=[1, 1], outputs=[1])
+        if prev is not None: Edge(scene, prev.outputs[0], node.inputs[0])
+        prev = node
+    return scene
+
+
+def peak_rss() -> int:
+    """Returns peak RSS of this process in bytes"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def measure(mode:str, size:int) -> dict:
+    with contextlib.redirect_stdout(io.StringIO()):
+        scene = build_scene(size)
+    gc.collect()
+    filename = os.path.join(tempfile.mkdtemp(), "scene.json")
+    before = peak_rss()
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == "dumps":
+            # the path used before streaming
+            with open(filename, "w") as file:
+                file.write(json.dumps(scene.serialize(), indent=4))
+        else:
+            scene.saveToFile(filename, compact=(mode == "compact"))
+    elapsed = time.perf_counter() - start
+
+    result = {'time': elapsed, 'rss': peak_rss() - before, 'size': os.path.getsize(filename)}
+    os.remove(filename)
+    return result
+
+
+def run_child(mode:str, size:int) -> dict:
+    output = subprocess.check_output([sys.executable, "-m", "benchmarks.bench_save", "--child", mode, str(size)],
+                                     cwd=os.path.join(os.path.dirname(__file__), ".."))
+    return json.loads(output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default="10000,100000", help="comma separated graph sizes")
+    parser.add_argument('--child', nargs=2, metavar=("MODE", "SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure(args.child[0], int(args.child[1]))))
+        return
+
+    print("%10s %8s %10s %16s %12s" % ("nodes", "mode", "time", "peak RSS growth", "file size"))
+    for size in [int(size) for size in args.sizes.split(",")]:
+        for mode in MODES:
+            result = run_child(mode, size)
+            print("%10d %8s %9.3fs %13.1f MB %9.1f MB" % (
+                size, mode, result['time'], result['rss'] / 2**20, result['size'] / 2**20))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of deleting and clearing big graphs.
+
+Compares the old ``list`` based storage of ``Scene.nodes`` / ``Scene.edges`` with
+:class:`~nodeeditor.node_ordered_set.OrderedSet` using the same access patterns
+``Scene.removeNode`` and ``Scene.clear`` use. With ``--scene`` it also measures real headless
+:class:`~nodeeditor.node_scene.Scene` instances, add ``--graphics`` to measure them with the Qt graphics
+layer (that needs ``QApplication`` and is limited by destroying Qt widgets, so use smaller sizes).
+
+Run from the repository root::
+
+    python -m benchmarks.bench_scene_remove --sizes 10000,100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from nodeeditor.node_ordered_set import OrderedSet
+
+
+class Item:
+    """Stand-in for a `Node` - only identity matters for the containers"""
+    __slots__ = ()
+
+
+def bench_delete(container_class, size:int, to_delete:int) -> float:
+    items = [Item() for i in range(size)]
+    container = container_class(items)
+    victims = random.sample(items, to_delete)
+
+    start = time.perf_counter()
+    for item in victims:
+        if item in container: container.remove(item)
+    return time.perf_counter() - start
+
+
+def bench_clear_list(size:int) -> float:
+    # old Scene.clear: `while len(self.nodes) > 0: self.nodes[0].remove()`
+    container = [Item() for i in range(size)]
+    start = time.perf_counter()
+    while len(container) > 0:
+        item = container[0]
+        if item in container: container.remove(item)
+    return time.perf_counter() - start
+
+
+def bench_clear_ordered_set(size:int) -> float:
+    # new Scene.clear: iterate over a snapshot and remove each item
+    container = OrderedSet(Item() for i in range(size))
+    start = time.perf_counter()
+    for item in list(container):
+        if item in container: container.remove(item)
+    return time.perf_counter() - start
+
+
+def bench_scene(size:int, headless:bool=True):
+    from nodeeditor.node_scene import Scene
+    from nodeeditor.node_node import Node
+    from nodeeditor.node_edge import Edge
+
+    if not headless:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PySide6.QtWidgets import QApplication
+        app = QApplication.instance() or QApplication([])
+
+    scene = Scene(headless=headless)
+    prev = None
+    for i in range(size):
+        node = Node(scene, "Node %d" % i, inputs=[1], outputs=[1])
+        if prev is not None: Edge(scene, prev.outputs[0], node.inputs[0])
+        prev = node
+
+    victims = random.sample(list(scene.nodes), size // 10)
+    start = time.perf_counter()
+    for node in victims: node.remove()
+    delete_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scene.clear()
+    clear_time = time.perf_counter() - start
+    return delete_time, clear_time
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default="10000,100000", help="comma separated graph sizes")
+    parser.add_argument('--scene', action='store_true', help="benchmark real Scene instances as well")
+    parser.add_argument('--graphics', action='store_true', help="create the Scenes with Qt graphics layer")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    print("%10s %12s %16s %12s %16s" % ("nodes", "list delete", "OrderedSet delete", "list clear", "OrderedSet clear"))
+    for size in sizes:
+        to_delete = size // 10
+        print("%10d %11.3fs %16.3fs %11.3fs %16.3fs" % (
+            size,
+            bench_delete(list, size, to_delete), bench_delete(OrderedSet, size, to_delete),
+            bench_clear_list(size), bench_clear_ordered_set(size),
+        ))
+
+    if args.scene:
+        print()
+        print("%10s %16s %12s" % ("nodes", "Scene delete 10%", "Scene clear"))
+        for size in sizes:
+            delete_time, clear_time = bench_scene(size, headless=not args.graphics)
+            print("%10d %15.3fs %11.3fs" % (size, delete_time, clear_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,6 @@
+from nodeeditor.node_node import Node
+
+
 LISTBOX_MIMETYPE = "application/x-item"
 
 OP_NODE_INPUT = 1
@@ -32,6 +35,11 @@ def get_class_from_opcode(op_code):
     if op_code not in CALC_NODES: raise OpCodeNotRegistered("OpCode '%d' is not registered" % op_code)
     return CALC_NODES[op_code]
 
+def get_class_from_data(data):
+    """Node class selector for `Scene.setNodeClassSelector`, i.e. ``nodeeditor.batch --node-class-selector``"""
+    if 'op_code' not in data: return Node
+    return get_class_from_opcode(data['op_code'])
+
 
 # import all nodes and register them
 from examples.example_calculator.nodes import *
\ No newline at end of file
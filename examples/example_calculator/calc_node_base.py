@@ -1,8 +1,11 @@
+import inspect
+
 from PySide6.QtCore import QRectF
 from PySide6.QtGui import QImage
 from PySide6.QtWidgets import QLabel
 
-from nodeeditor.node_node import Node
+from nodeeditor.node_cancellation import EvaluationCancelled
+from nodeeditor.node_node import Node, NodeGeometry
 from nodeeditor.node_content_widget import QDMNodeContentWidget
 from nodeeditor.node_graphics_node import QDMGraphicsNode
 from nodeeditor.node_socket import LEFT_CENTER, RIGHT_CENTER
@@ -37,6 +40,18 @@ class CalcGraphicsNode(QDMGraphicsNode):
         )
 
 
+class CalcNodeGeometry(NodeGeometry):
+    """Sizes of :class:`CalcGraphicsNode` used when the `Scene` is headless"""
+    def initSizes(self):
+        super().initSizes()
+        self.width = 160
+        self.height = 74
+        self.edge_roundness = 6.0
+        self.edge_padding = 0.0
+        self.title_horizontal_padding = 4.0
+        self.title_vertical_padding = 10
+
+
 class CalcContent(QDMNodeContentWidget):
     def initUI(self):
         lbl = QLabel(self.node.content_label, self)
@@ -49,9 +64,14 @@ class CalcNode(Node):
     op_title = "Undefined"
     content_label = ""
     content_label_objname = "calc_node_bg"
+    memoize = True
+
+    # does evalImplementation of the class accept the cancellation token? See callEvalImplementation
+    _takes_token = {}
 
     GraphicsNode_class = CalcGraphicsNode
     NodeContent_class = CalcContent
+    NodeGeometry_class = CalcNodeGeometry
 
     def __init__(self, scene, inputs=[2,2], outputs=[1]):
         super().__init__(scene, self.__class__.op_title, inputs, outputs)
@@ -69,47 +89,166 @@ class CalcNode(Node):
     def evalOperation(self, input1, input2):
         return 123
 
-    def evalImplementation(self):
+    def getMemoKey(self, input_values):
+        return (self.id, self.__class__.op_code, input_values, tuple(type(value) for value in input_values))
+
+    def evalOperationBatch(self, input1, input2):
+        """Vectorized `evalOperation`, inputs are NumPy (masked) arrays"""
+        return self.evalOperation(input1, input2)
+
+    def compileOperation(self, input1, input2):
+        """Python expression of `evalOperation` for the scene compiler, inputs are variable names. ``None`` when
+        the operation can't be compiled"""
+        return None
+
+    def compileExpression(self, input_names, argument=None):
+        # async nodes can't be compiled
+        if self.isAsync(): return None
+        return self.compileOperation(*input_names[:2])
+
+    def setCompiledResult(self, value):
+        self.value = value
+        super().setCompiledResult(value)
+        self.setToolTip("")
+
+    def supportsBatch(self):
+        return True
+
+    def evalBatch(self, input_values, fed_value, size):
+        if len(input_values) < 2 or input_values[0] is None or input_values[1] is None: return None
+        return self.evalOperationBatch(input_values[0], input_values[1])
+
+    def evalImplementation(self, token=None):
+        """Compute the value. Implementations which accept `token` get the node's `CancellationToken` (``None``
+        outside of an evaluation pass) and should call ``token.check()`` while they work"""
         i1 = self.getInput(0)
         i2 = self.getInput(1)
 
         if i1 is None or i2 is None:
             self.markInvalid()
             self.markDescendantsDirty()
-            self.grNode.setToolTip("Connect all inputs")
+            self.setToolTip("Connect all inputs")
             return None
         else:
-            val = self.evalOperation(i1.eval(), i2.eval())
+            input1, input2 = i1.eval(), i2.eval()
+            if token is not None: token.check()
+            val = self.evalMemoized(self.evalOperation, input1, input2)
             self.value = val
             self.markDirty(False)
             self.markInvalid(False)
-            self.grNode.setToolTip("")
+            self.setToolTip("")
 
             self.markDescendantsDirty()
             self.evalChildren()
 
             return val
 
+    def callEvalImplementation(self):
+        """Call `evalImplementation`, with the cancellation token if it accepts one"""
+        cls = self.__class__
+        takes_token = CalcNode._takes_token.get(cls)
+        if takes_token is None:
+            takes_token = CalcNode._takes_token[cls] = len(inspect.signature(self.evalImplementation).parameters) > 0
+        if takes_token: return self.evalImplementation(self.scene.evaluator.getToken())
+        return self.evalImplementation()
+
+    def isAsync(self):
+        """Is `evalImplementation` of this node a coroutine (``async def``)?"""
+        return inspect.iscoroutinefunction(self.evalImplementation)
+
     def eval(self):
         if not self.isDirty() and not self.isInvalid():
             print(" _> returning cached value: %s %s" % (self.__class__.__name__, self.value))
+            if self.scene.evaluation_stats.enabled: self.scene.evaluation_stats.recordCacheHit(self)
+            return self.value
+        if self.isAsync():
+            # we cannot await here, the async evaluator does it and we return the last known value
+            try:
+                self.scene.async_evaluator.requestEvaluation([self])
+            except RuntimeError as e:
+                self.onEvalException(e)
             return self.value
         try:
-            val = self.evalImplementation()
+            val = self.callEvalImplementation()
             return val
-        except ValueError as e:
-            self.markInvalid()
-            self.grNode.setToolTip(str(e))
-            self.markDescendantsDirty()
         except Exception as e:
-            self.markInvalid()
-            self.grNode.setToolTip(str(e))
+            self.onEvalException(e)
+
+    async def evalAsync(self):
+        if not self.isAsync(): return self.eval()
+        if not self.isDirty() and not self.isInvalid(): return self.value
+        try:
+            val = await self.callEvalImplementation()
+            return val
+        except Exception as e:
+            self.onEvalException(e)
+
+    def onEvalException(self, e):
+        self.markInvalid()
+        self.setToolTip(str(e))
+        if isinstance(e, (ValueError, EvaluationCancelled)):
+            self.markDescendantsDirty()
+        else:
             print("%s ERROR: %s" % (e.__class__.__name__, e))
 
     def onInputChanged(self, socket=None):
         print("%s::__onInputChanged" % self.__class__.__name__)
         self.markDirty()
-        self.eval()
+        if self.scene.evaluation_queue.isEnabled():
+            # evaluated later together with other changes, see SceneEvaluationQueue
+            self.scene.evaluation_queue.request(self)
+        else:
+            CalcNode.evalChanged(self.scene, [self])
+
+    @staticmethod
+    def evalChanged(scene, nodes):
+        """Evaluate changed `nodes` and their descendants. By the compiled graph if possible, in background
+        if the scene has background evaluator or right now. In pull mode only the demanded outputs"""
+        if scene.evaluator.pull_mode:
+            # only what somebody looks at, the rest stays dirty until it is demanded
+            for node in nodes: node.markDescendantsDirty()
+            CalcNode.evalDemanded(scene)
+            return
+        if CalcNode.evalProfiledOrCompiled(scene, nodes): return
+        if scene.background_evaluator is not None:
+            for node in nodes: node.markDescendantsDirty()
+            scene.background_evaluator.requestEvaluation()
+        else:
+            scene.evaluator.evaluate(nodes)
+
+    @staticmethod
+    def evalDemanded(scene):
+        """Evaluate dirty demanded outputs of the pull mode, in background if the scene has background evaluator
+        or right now. The compiled graph is not used, it would evaluate also the outputs nobody demands"""
+        outputs = [node for node in scene.evaluator.getDemandedOutputs() if node.isDirty() or node.isInvalid()]
+        if not outputs: return
+        if CalcNode.evalProfiledOrCompiled(scene, outputs): return
+        if scene.background_evaluator is not None:
+            scene.background_evaluator.requestEvaluation(outputs)
+        else:
+            scene.evaluator.evaluate(outputs)
+
+    @staticmethod
+    def evalProfiledOrCompiled(scene, nodes):
+        """Evaluate `nodes` right now when evaluation statistics are enabled, or the whole graph by the compiled
+        function when the compiler is enabled and the scene is not in pull mode. Returns ``True`` when it was
+        evaluated"""
+        if scene.evaluation_stats.enabled:
+            # per node statistics need the nodes to be evaluated one by one, here
+            scene.evaluator.evaluate(nodes)
+            return True
+        # whole graph evaluated by the compiled function, in pull mode only the demanded part may be evaluated
+        if scene.evaluator.pull_mode: return False
+        return scene.compiler.isEnabled() and scene.compiler.evaluate() is not None
+
+    def getEvaluationState(self):
+        state = super().getEvaluationState()
+        state['value'] = self.value
+        return state
+
+    def setEvaluationState(self, state):
+        super().setEvaluationState(state)
+        self.value = state['value']
 
     def serialize(self):
         res = super().serialize()
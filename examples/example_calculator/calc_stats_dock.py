@@ -0,0 +1,107 @@
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QCheckBox, QPushButton, QTableWidget, \
+    QTableWidgetItem, QHeaderView, QAbstractItemView
+
+from nodeeditor.utils import dumpException
+
+
+class CalcStatsWidget(QWidget):
+    """Table of per node evaluation statistics of the active scene, the most expensive nodes first"""
+    COLUMNS = ["Node", "Total ms", "Calls", "Avg ms", "Max ms", "Cache hits", "Invalidations"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.scene = None
+        self.initUI()
+
+        # the statistics are collected during evaluation, we just look at them from time to time
+        self.timer = QTimer(self)
+        self.timer.setInterval(500)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start()
+
+    def initUI(self):
+        self.layout = QVBoxLayout(self)
+        self.layout.setContentsMargins(0, 0, 0, 0)
+
+        buttons = QHBoxLayout()
+        self.chkProfile = QCheckBox("Profile")
+        self.chkProfile.toggled.connect(self.onProfileToggled)
+        self.chkHeatMap = QCheckBox("Heat map")
+        self.chkHeatMap.toggled.connect(self.onHeatMapToggled)
+        self.btnReset = QPushButton("Reset")
+        self.btnReset.clicked.connect(self.onReset)
+        buttons.addWidget(self.chkProfile)
+        buttons.addWidget(self.chkHeatMap)
+        buttons.addStretch()
+        buttons.addWidget(self.btnReset)
+        self.layout.addLayout(buttons)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.itemDoubleClicked.connect(self.onItemDoubleClicked)
+        self.layout.addWidget(self.table)
+
+        self.setScene(None)
+
+    def setScene(self, scene):
+        """Show statistics of the `scene` (``None`` when there is no active sub window)"""
+        self.scene = scene
+        stats = scene.evaluation_stats if scene is not None else None
+        for checkbox, value in ((self.chkProfile, stats is not None and stats.enabled),
+                                (self.chkHeatMap, stats is not None and stats.heat_map)):
+            checkbox.blockSignals(True)
+            checkbox.setChecked(value)
+            checkbox.setEnabled(stats is not None)
+            checkbox.blockSignals(False)
+        self.btnReset.setEnabled(stats is not None)
+        self.refresh()
+
+    def onProfileToggled(self, checked):
+        if self.scene is not None: self.scene.evaluation_stats.setEnabled(checked)
+
+    def onHeatMapToggled(self, checked):
+        if self.scene is not None: self.scene.evaluation_stats.setHeatMap(checked)
+
+    def onReset(self):
+        if self.scene is None: return
+        self.scene.evaluation_stats.reset()
+        self.scene.notifier.requestUpdate()
+        self.refresh()
+
+    def onItemDoubleClicked(self, item):
+        # select the node in the scene
+        if self.scene is None: return
+        node = self.scene.getNodeByID(self.table.item(item.row(), 0).data(Qt.UserRole))
+        if node is None or node.grNode is None: return
+        self.scene.doDeselectItems()
+        node.doSelect()
+
+    def refresh(self):
+        if not self.isVisible(): return
+        try:
+            stats = self.scene.evaluation_stats.getStats() if self.scene is not None else []
+            self.table.setRowCount(len(stats))
+            for row, item in enumerate(stats):
+                node = self.scene.getNodeByID(item.node_id)
+                values = [
+                    node.title if node is not None else str(item.node_id),
+                    "%.3f" % (item.total_time * 1000),
+                    "%d" % item.calls,
+                    "%.3f" % (item.average_time * 1000),
+                    "%.3f" % (item.max_time * 1000),
+                    "%d" % item.cache_hits,
+                    "%d" % item.invalidations,
+                ]
+                for column, value in enumerate(values):
+                    cell = QTableWidgetItem(value)
+                    if column > 0: cell.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                    if column == 0: cell.setData(Qt.UserRole, item.node_id)
+                    self.table.setItem(row, column, cell)
+
+            if self.scene is not None and self.scene.evaluation_stats.heat_map: self.scene.notifier.requestUpdate()
+        except Exception as e: dumpException(e)
@@ -2,6 +2,7 @@ from PySide6.QtCore import *
 from PySide6.QtGui import QPixmap, QAction, QIcon
 from PySide6.QtWidgets import QGraphicsProxyWidget, QMenu
 
+from nodeeditor.node_background_evaluator import BackgroundEvaluator
 from nodeeditor.node_edge import EDGE_TYPE_BEZIER, EDGE_TYPE_DIRECT
 from nodeeditor.node_editor_widget import NodeEditorWidget
 from examples.example_calculator.calc_conf import *
@@ -26,18 +27,55 @@ class CalculatorSubWindow(NodeEditorWidget):
         self.scene.addDropListener(self.onDrop)
         self.scene.setNodeClassSelector(self.getNodeClassFromData)
 
+        # evaluate edits by the compiled graph when pull mode is off. Otherwise (and for graphs which can't be
+        # compiled) the needed nodes are evaluated in background, so slow nodes don't block the UI
+        self.scene.compiler.setEnabled(True)
+        self.scene.background_evaluator = BackgroundEvaluator(self.scene, self)
+        # typing into the inputs triggers one evaluation per event loop iteration, not one per keystroke
+        self.scene.evaluation_queue.setFlushCallback(lambda nodes: CalcNode.evalChanged(self.scene, nodes))
+        self.scene.evaluation_queue.setEnabled(True)
+
+        # edits evaluate only the outputs in the viewport (and what they need), the others when they are
+        # scrolled into view
+        self.scene.evaluator.setDemandCallback(self.getVisibleOutputs)
+        self.scene.evaluator.setPullMode(True)
+        self.viewport_timer = QTimer(self)
+        self.viewport_timer.setSingleShot(True)
+        self.viewport_timer.setInterval(50)
+        self.viewport_timer.timeout.connect(lambda: CalcNode.evalDemanded(self.scene))
+        self.view.horizontalScrollBar().valueChanged.connect(self.onViewportChanged)
+        self.view.verticalScrollBar().valueChanged.connect(self.onViewportChanged)
+
         self._close_event_listeners = []
 
 
     def getNodeClassFromData(self, data):
-        if 'op_code' not in data: return Node
-        return get_class_from_opcode(data['op_code'])
+        return get_class_from_data(data)
+
+    def getVisibleOutputs(self):
+        rect = self.view.mapToScene(self.view.viewport().rect()).boundingRect()
+        nodes = self.scene.spatial_index.nodesInRect((rect.left(), rect.top(), rect.right(), rect.bottom()))
+        return [node for node in nodes if node.__class__.__name__ == "CalcNode_Output"]
+
+    def onViewportChanged(self, *args):
+        # outputs scrolled into view may be dirty
+        self.viewport_timer.start()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.onViewportChanged()
 
     def doEvalOutputs(self):
-        # eval all outputs nodes
-        for node in self.scene.nodes:
-            if node.__class__.__name__ == "CalcNode_Output":
-                node.eval()
+        if self.scene.evaluator.pull_mode:
+            CalcNode.evalDemanded(self.scene)
+            return
+        # eval all outputs nodes (with their dirty ancestors in topological order)
+        outputs = [node for node in self.scene.nodes if node.__class__.__name__ == "CalcNode_Output"]
+        if CalcNode.evalProfiledOrCompiled(self.scene, outputs): return
+        if self.scene.background_evaluator is not None:
+            self.scene.background_evaluator.requestEvaluation(outputs)
+        else:
+            self.scene.evaluator.evaluate(outputs)
 
     def onHistoryRestored(self):
         self.doEvalOutputs()
@@ -74,6 +112,10 @@ class CalculatorSubWindow(NodeEditorWidget):
 
     def closeEvent(self, event):
         for callback in self._close_event_listeners: callback(self, event)
+        if event.isAccepted():
+            self.scene.evaluation_queue.cancel()
+            self.viewport_timer.stop()
+            if self.scene.background_evaluator is not None: self.scene.background_evaluator.shutdown()
 
     def onDragEnter(self, event):
         if event.mimeData().hasFormat(LISTBOX_MIMETYPE):
@@ -159,7 +201,7 @@ class CalculatorSubWindow(NodeEditorWidget):
 
 
         if selected and action == evalAct:
-            val = selected.eval()
+            val = self.scene.evaluator.evaluate([selected])[0]
             if DEBUG_CONTEXT: print("EVALUATED:", val)
 
     def handleEdgeContextMenu(self, event):
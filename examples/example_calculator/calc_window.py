@@ -6,6 +6,7 @@ from PySide6.QtWidgets import QMainWindow, QMdiArea, QWidget, QListWidget, QDock
     QFileDialog
 
 from examples.example_calculator.calc_drag_listbox import QDMDragListbox
+from examples.example_calculator.calc_stats_dock import CalcStatsWidget
 from nodeeditor.node_editor_window import NodeEditorWindow
 from nodeeditor.utils import dumpException, loadStylesheets, pp
 from examples.example_calculator.calc_sub_window import CalculatorSubWindow
@@ -43,6 +44,7 @@ class CalculatorWindow(NodeEditorWindow):
         self.windowMapper.mappedObject.connect(self.setActiveSubWindow)
 
         self.createNodesDock()
+        self.createStatsDock()
 
         self.createActions()
         self.createMenus()
@@ -150,6 +152,8 @@ class CalculatorWindow(NodeEditorWindow):
         self.actPrevious.setEnabled(hasMdiChild)
         self.actSeparator.setVisible(hasMdiChild)
 
+        self.statsWidget.setScene(active.scene if hasMdiChild else None)
+
         self.updateEditMenu()
 
     def updateEditMenu(self):
@@ -177,6 +181,12 @@ class CalculatorWindow(NodeEditorWindow):
         toolbar_nodes.setChecked(self.nodesDock.isVisible())
         self.windowMenu.addAction(toolbar_nodes)
 
+        panel_stats = QAction("&Evaluation Statistics", self)
+        panel_stats.setCheckable(True)
+        panel_stats.triggered.connect(self.onWindowStatsPanel)
+        panel_stats.setChecked(self.statsDock.isVisible())
+        self.windowMenu.addAction(panel_stats)
+
         self.windowMenu.addSeparator()
 
         self.windowMenu.addAction(self.actClose)
@@ -215,6 +225,12 @@ class CalculatorWindow(NodeEditorWindow):
         else:
             self.nodesDock.show()
 
+    def onWindowStatsPanel(self, checked):
+        if self.statsDock.isVisible():
+            self.statsDock.hide()
+        else:
+            self.statsDock.show()
+
     def createToolBars(self):
         pass
 
@@ -227,6 +243,16 @@ class CalculatorWindow(NodeEditorWindow):
 
         self.addDockWidget(Qt.RightDockWidgetArea, self.nodesDock)
 
+    def createStatsDock(self):
+        self.statsWidget = CalcStatsWidget()
+
+        self.statsDock = QDockWidget("Evaluation Statistics")
+        self.statsDock.setWidget(self.statsWidget)
+        self.statsDock.setFloating(False)
+
+        self.addDockWidget(Qt.RightDockWidgetArea, self.statsDock)
+        self.statsDock.hide()
+
     def createStatusBar(self):
         self.statusBar().showMessage("Ready")
 
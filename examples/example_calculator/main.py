@@ -2,6 +2,13 @@ import os
 import sys
 from PySide6.QtWidgets import *
 
+try:
+    # asyncio loop running inside of Qt event loop, used for evaluating async nodes
+    from PySide6 import QtAsyncio
+except ImportError:
+    # PySide6 built without QtAsyncio, async nodes can't be evaluated and are marked invalid
+    QtAsyncio = None
+
 sys.path.insert(0, os.path.join( os.path.dirname(__file__), "..", ".." ))
 
 from examples.example_calculator.calc_window import CalculatorWindow
@@ -15,4 +22,7 @@ if __name__ == '__main__':
     wnd = CalculatorWindow()
     wnd.show()
 
-    sys.exit(app.exec())
\ No newline at end of file
+    if QtAsyncio is not None:
+        QtAsyncio.run(handle_sigint=True)
+        sys.exit()
+    sys.exit(app.exec())
@@ -1,6 +1,12 @@
 from PySide6.QtCore import *
 from PySide6.QtWidgets import *
 
+try:
+    import numpy
+except ImportError:
+    # needed only for batch evaluation
+    numpy = None
+
 from examples.example_calculator.calc_conf import *
 from examples.example_calculator.calc_node_base import *
 
@@ -30,6 +36,7 @@ class CalcNode_Input(CalcNode):
     op_code = OP_NODE_INPUT
     op_title = "Input"
     content_label_objname = "calc_node_input"
+    compile_argument = True
 
     def __init__(self, scene):
         super().__init__(scene, inputs=[], outputs=[3])
@@ -38,10 +45,60 @@ class CalcNode_Input(CalcNode):
     def initInnerClasses(self):
         self.content = CalcInputContent(self)
         self.grNode = CalcGraphicsNode(self)
-        self.content.edit.textChanged.connect(self.onInputChanged)
+        self.content.edit.textChanged.connect(self.onContentChanged)
+
+    def getInputText(self) -> str:
+        """Text of this input. Read from the edit widget, or from `content_state` in headless mode"""
+        if self.content is not None: return self.content.edit.text()
+        return self.content_state.get('value', "1")
+
+    def setInputText(self, text:str):
+        """Set text of this input and trigger the evaluation"""
+        if self.content is not None:
+            self.content.edit.setText(text)     # textChanged triggers onContentChanged
+        else:
+            self.content_state['value'] = text
+            self.onContentChanged()
+
+    def deserialize(self, data, hashmap={}, restore_id=True):
+        old_text = self.getInputText()
+        res = super().deserialize(data, hashmap, restore_id)
+        # the edit widget notifies about changed text by itself, in headless mode we have to do it here
+        if self.content is None and self.getInputText() != old_text: self.onContentChanged()
+        return res
+
+    def compileExpression(self, input_names, argument=None):
+        return "int(%s)" % argument
+
+    def getCompileArgumentValue(self):
+        return self.getInputText()
+
+    def supportsArgumentValue(self):
+        return True
+
+    def setArgumentValue(self, value):
+        text = str(value)
+        if text == self.getInputText(): return
+        if self.content is not None:
+            # no textChanged, the caller evaluates after setting all arguments
+            self.content.edit.blockSignals(True)
+            self.content.edit.setText(text)
+            self.content.edit.blockSignals(False)
+        else:
+            self.content_state['value'] = text
+        self.markDirty()
+        self.markDescendantsDirty()
+
+    def evalBatch(self, input_values, fed_value, size):
+        if fed_value is not None: return numpy.ma.asarray(fed_value)
+        # not fed, use the typed value for the whole batch
+        try:
+            return numpy.ma.asarray(numpy.full(size, int(self.getInputText())))
+        except ValueError:
+            return None
 
     def evalImplementation(self):
-        u_value = self.content.edit.text()
+        u_value = self.getInputText()
         s_value = int(u_value)
         self.value = s_value
         self.markDirty(False)
@@ -50,7 +107,7 @@ class CalcNode_Input(CalcNode):
         self.markDescendantsInvalid(False)
         self.markDescendantsDirty()
 
-        self.grNode.setToolTip("")
+        self.setToolTip("")
 
         self.evalChildren()
 
@@ -1,6 +1,12 @@
 from PySide6.QtCore import *
 from PySide6.QtWidgets import *
 
+try:
+    import numpy
+except ImportError:
+    # needed only for batch evaluation
+    numpy = None
+
 from examples.example_calculator.calc_conf import *
 from examples.example_calculator.calc_node_base import *
 
@@ -17,6 +23,9 @@ class CalcNode_Add(CalcNode):
     def evalOperation(self, input1, input2):
         return input1 + input2
 
+    def compileOperation(self, input1, input2):
+        return "(%s + %s)" % (input1, input2)
+
 
 
 @register_node(OP_NODE_SUB)
@@ -30,6 +39,9 @@ class CalcNode_Sub(CalcNode):
     def evalOperation(self, input1, input2):
         return input1 - input2
 
+    def compileOperation(self, input1, input2):
+        return "(%s - %s)" % (input1, input2)
+
 
 
 @register_node(OP_NODE_MUL)
@@ -43,6 +55,9 @@ class CalcNode_Mul(CalcNode):
     def evalOperation(self, input1, input2):
         return input1 * input2
 
+    def compileOperation(self, input1, input2):
+        return "(%s * %s)" % (input1, input2)
+
 @register_node(OP_NODE_DIV)
 class CalcNode_Div(CalcNode):
     icon = "icons/divide.png"
@@ -54,6 +69,13 @@ class CalcNode_Div(CalcNode):
     def evalOperation(self, input1, input2):
         return input1 / input2
 
+    def compileOperation(self, input1, input2):
+        return "(%s / %s)" % (input1, input2)
+
+    def evalOperationBatch(self, input1, input2):
+        # division by zero masks just the affected items
+        return numpy.ma.divide(input1, input2)
+
 
 
 
@@ -27,21 +27,35 @@ class CalcNode_Output(CalcNode):
     def evalImplementation(self):
         input_node = self.getInput(0)
         if not input_node:
-            self.grNode.setToolTip("Input is not connected")
+            self.setToolTip("Input is not connected")
             self.markInvalid()
             return
 
         val = input_node.eval()
 
         if val is None:
-            self.grNode.setToolTip("Input is NaN")
+            self.setToolTip("Input is NaN")
             self.markInvalid()
             return
 
-        self.content.lbl.setText("%d" % val)
+        self.value = val
+        if self.content is not None: self.content.lbl.setText("%d" % val)
         self.markInvalid(False)
         self.markDirty(False)
-        self.grNode.setToolTip("")
+        self.setToolTip("")
 
         return val
 
+    def compileExpression(self, input_names, argument=None):
+        return input_names[0]
+
+    def setCompiledResult(self, value):
+        super().setCompiledResult(value)
+        if self.content is not None: self.content.lbl.setText("%d" % value)
+
+    def evalBatch(self, input_values, fed_value, size):
+        return input_values[0]
+
+    def setEvaluationState(self, state):
+        super().setEvaluationState(state)
+        if self.content is not None and self.value is not None: self.content.lbl.setText("%d" % self.value)
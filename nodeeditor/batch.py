@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""
+Headless batch evaluation of a saved `Scene` for many parameter sets.
+
+Every row of the parameter file (JSONL or CSV) sets values of the argument `Nodes` (`Nodes` with
+``compile_argument = True``, e.g. inputs), matched by their id or title. Values of the `Nodes` without outputs are
+written row by row as JSONL or CSV, so the memory needed doesn't grow with the number of rows::
+
+    python -m nodeeditor.batch graph.json --inputs params.jsonl --output results.csv \\
+        --node-class-selector examples.example_calculator.calc_conf:get_class_from_data
+"""
+import argparse
+import contextlib
+import csv
+import importlib
+import json
+import multiprocessing
+import sys
+import time
+from collections import deque
+
+from nodeeditor.node_json_backend import BACKENDS, getJsonBackend, setJsonBackend
+from nodeeditor.node_scene import Scene, InvalidFile
+
+
+class BatchError(Exception):
+    """Raised when the graph or the parameter file can't be used for batch evaluation"""
+    pass
+
+
+def importObject(spec:str) -> object:
+    """
+    Returns object described by ``"package.module:name"``
+
+    :param spec: module and name of the object separated by colon
+    :type spec: ``str``
+    :raises: :class:`BatchError` when the object can't be imported
+    """
+    module_name, _, name = spec.partition(':')
+    try:
+        return getattr(importlib.import_module(module_name), name)
+    except (ImportError, AttributeError, ValueError) as e:
+        raise BatchError("Cannot import %r: %s" % (spec, e))
+
+
+def getFileFormat(filename:str, file_format:str=None) -> str:
+    """Returns ``'csv'`` or ``'jsonl'``, given explicitly or by the extension of `filename`"""
+    if file_format is not None: return file_format
+    return 'csv' if filename is not None and filename.lower().endswith('.csv') else 'jsonl'
+
+
+def iterRows(file:'file', file_format:str) -> 'Iterator[dict]':
+    """
+    Yields parameter sets read from `file` one by one
+
+    :param file: opened text file
+    :param file_format: ``'csv'`` (first line is the header) or ``'jsonl'`` (one JSON object per line)
+    :type file_format: ``str``
+    :raises: :class:`BatchError` for a JSONL line which is not a JSON object
+    """
+    if file_format == 'csv':
+        for row in csv.DictReader(file):
+            # empty cell keeps the value saved in the graph
+            yield {column: value for column, value in row.items() if value not in (None, "")}
+        return
+
+    loads = getJsonBackend().loads
+    for line_number, line in enumerate(file, 1):
+        line = line.strip()
+        if not line: continue
+        try:
+            row = loads(line)
+        except json.JSONDecodeError as e:
+            raise BatchError("Line %d is not valid JSON: %s" % (line_number, e))
+        if not isinstance(row, dict): raise BatchError("Line %d is not a JSON object" % line_number)
+        yield row
+
+
+class RowWriter():
+    """Writes result rows to a text file as JSONL or CSV"""
+    def __init__(self, file:'file', file_format:str, columns:list):
+        """
+        :param file: opened text file
+        :param file_format: ``'csv'`` or ``'jsonl'``
+        :type file_format: ``str``
+        :param columns: keys of the result rows, the CSV header
+        :type columns: ``list``
+        """
+        self.file = file
+        self.file_format = file_format
+        self.backend = getJsonBackend()
+        self.csv_writer = None
+        if file_format == 'csv':
+            self.csv_writer = csv.DictWriter(file, fieldnames=columns)
+            self.csv_writer.writeheader()
+
+    def write(self, row:dict):
+        if self.csv_writer is not None:
+            self.csv_writer.writerow(row)
+        else:
+            self.file.write(self.backend.dumps(row))
+            self.file.write("\n")
+
+
+class SceneBatch():
+    """
+    Class evaluating a `Scene` loaded from a file for rows of argument values.
+
+    When the graph can be compiled by :class:`~nodeeditor.node_scene_compiler.SceneCompiler`, each row is just one
+    call of the compiled function. Otherwise the values are set by
+    :py:meth:`~nodeeditor.node_node.Node.setArgumentValue` and the outputs are evaluated by the
+    :class:`~nodeeditor.node_scene_evaluator.SceneEvaluator`.
+    """
+    def __init__(self, filename:str, node_class_selector:'function'=None, output_keys:str='id'):
+        """
+        :param filename: saved `Scene`
+        :type filename: ``str``
+        :param node_class_selector: see :py:meth:`~nodeeditor.node_scene.Scene.setNodeClassSelector`
+        :type node_class_selector: ``function``
+        :param output_keys: ``'id'`` or ``'title'`` of the output `Nodes` used as keys of result rows
+        :type output_keys: ``str``
+
+        :Instance Attributes:
+
+        - **scene** - headless :class:`~nodeeditor.node_scene.Scene` loaded from `filename`
+        - **argument_nodes** - `Nodes` whose values are set from the rows
+        - **output_nodes** - `Nodes` without outputs, their values are the results
+        - **output_columns** - keys of the result rows, one per output `Node`
+        - **compiled** - :class:`~nodeeditor.node_scene_compiler.CompiledScene` or ``None``
+        - **saved_values** - ``{Node: value}`` of the argument `Nodes` as saved in the file, used for the
+          arguments missing in a row
+        """
+        self.scene = Scene(headless=True)
+        if node_class_selector is not None: self.scene.setNodeClassSelector(node_class_selector)
+        self.scene.loadFromFile(filename)
+
+        self.argument_nodes = [node for node in self.scene.nodes if node.compile_argument]
+        self.output_nodes = [node for node in self.scene.nodes if not node.outputs]
+        self.output_columns = self._getKeys(self.output_nodes, output_keys)
+        self.saved_values = {node: node.getCompileArgumentValue() for node in self.argument_nodes}
+        self.compiled = self.scene.compiler.getCompiled()
+        if self.compiled is None:
+            unsupported = [node for node in self.argument_nodes if not node.supportsArgumentValue()]
+            if unsupported: raise BatchError("The graph can't be compiled and %s doesn't support setting values" % (
+                ", ".join(str(node) for node in unsupported)))
+
+        # column names -> node for each combination of columns seen in the rows
+        self._mappings = {}
+
+    def _getKeys(self, nodes:list, by:str) -> list:
+        if by == 'id': return [str(node.id) for node in nodes]
+        keys = [node.title for node in nodes]
+        duplicates = sorted(set(key for key in keys if keys.count(key) > 1))
+        if duplicates: raise BatchError("Output titles are not unique: %s" % ", ".join(duplicates))
+        return keys
+
+    def mapColumns(self, columns:'Iterable[str]') -> dict:
+        """
+        Returns ``{column: argument Node}``. Columns are matched to node ids first, then to unique titles
+
+        :param columns: column names of a row
+        :type columns: Iterable[``str``]
+        :rtype: ``dict``
+        :raises: :class:`BatchError` when a column doesn't match exactly one argument `Node`
+        """
+        columns = tuple(columns)
+        mapping = self._mappings.get(columns)
+        if mapping is not None: return mapping
+
+        by_id = {str(node.id): node for node in self.argument_nodes}
+        by_title = {}
+        for node in self.argument_nodes: by_title.setdefault(node.title, []).append(node)
+
+        mapping = {}
+        for column in columns:
+            node = by_id.get(str(column))
+            if node is None:
+                candidates = by_title.get(column, [])
+                if len(candidates) > 1: raise BatchError("Column %r matches %d nodes by title, use node id" % (
+                    column, len(candidates)))
+                if not candidates: raise BatchError("Column %r doesn't match any input node" % column)
+                node = candidates[0]
+            mapping[column] = node
+
+        self._mappings[columns] = mapping
+        return mapping
+
+    def evaluateRow(self, row:dict) -> dict:
+        """
+        Evaluate the graph with argument values from `row`
+
+        :param row: ``{column: value}``
+        :type row: ``dict``
+        :return: ``{output column: value}``, ``None`` for invalid outputs
+        :rtype: ``dict``
+        """
+        mapping = self.mapColumns(row.keys())
+        # arguments missing in the row keep the saved value, not the one of the previous row
+        values = dict(self.saved_values)
+        for column, value in row.items(): values[mapping[column]] = value
+        if self.compiled is not None:
+            arguments = [values[node] for node in self.compiled.argument_nodes]
+            results = dict(zip(self.compiled.nodes, self.compiled(*arguments)))
+        else:
+            # the values are set without evaluation, the outputs are evaluated by one pass
+            for node, value in values.items(): node.setArgumentValue(value)
+            results = dict(zip(self.output_nodes, self.scene.evaluator.evaluate(self.output_nodes)))
+            for node in self.output_nodes:
+                if node.isInvalid(): results[node] = None
+        return {column: results.get(node) for column, node in zip(self.output_columns, self.output_nodes)}
+
+
+# the SceneBatch of a worker process
+_worker_batch = None
+
+
+def _initWorker(filename:str, selector_spec:str, output_keys:str, json_backend:str):
+    global _worker_batch
+    setJsonBackend(json_backend)
+    with contextlib.redirect_stdout(sys.stderr):
+        selector = importObject(selector_spec) if selector_spec else None
+        _worker_batch = SceneBatch(filename, selector, output_keys)
+
+
+def _evaluateChunk(rows:list) -> list:
+    with contextlib.redirect_stdout(sys.stderr):
+        return [_worker_batch.evaluateRow(row) for row in rows]
+
+
+def iterChunks(rows:'Iterator[dict]', size:int) -> 'Iterator[list]':
+    """Yields lists of at most `size` rows"""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk: yield chunk
+
+
+def evaluateRows(batch:SceneBatch, rows:'Iterator[dict]', args:'argparse.Namespace') -> 'Iterator[dict]':
+    """
+    Yields results of `rows` in the same order. With ``args.processes`` bigger than ``1`` chunks of rows are
+    evaluated in worker processes, at most ``2 * processes`` chunks are in flight so memory stays bounded
+    """
+    if args.processes <= 1:
+        for row in rows: yield batch.evaluateRow(row)
+        return
+
+    initargs = (args.graph, args.node_class_selector, args.output_keys, args.json_backend)
+    with multiprocessing.Pool(args.processes, initializer=_initWorker, initargs=initargs) as pool:
+        in_flight = deque()
+        for chunk in iterChunks(rows, args.chunk_size):
+            in_flight.append(pool.apply_async(_evaluateChunk, (chunk,)))
+            if len(in_flight) >= 2 * args.processes: yield from in_flight.popleft().get()
+        while in_flight: yield from in_flight.popleft().get()
+
+
+def parseArguments(argv:list=None) -> 'argparse.Namespace':
+    parser = argparse.ArgumentParser(prog="python -m nodeeditor.batch", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('graph', help="saved scene (.json)")
+    parser.add_argument('--inputs', required=True, help="parameter sets, JSONL or CSV. '-' for stdin")
+    parser.add_argument('--output', default='-', help="where to write results, JSONL or CSV. '-' for stdout")
+    parser.add_argument('--input-format', choices=('jsonl', 'csv'), help="default by the file extension")
+    parser.add_argument('--output-format', choices=('jsonl', 'csv'), help="default by the file extension")
+    parser.add_argument('--output-keys', choices=('id', 'title'), default='id',
+                        help="name result columns by node id or title (default: id)")
+    parser.add_argument('--node-class-selector', metavar="MODULE:FUNCTION",
+                        help="function returning Node class for serialized node data")
+    parser.add_argument('--processes', type=int, default=1, help="number of worker processes (default: 1)")
+    parser.add_argument('--chunk-size', type=int, default=256, help="rows sent to a worker at once (default: 256)")
+    parser.add_argument('--json-backend', choices=('auto',) + tuple(BACKENDS), default='auto',
+                        help="JSON library for the JSONL files (default: auto - the fastest installed)")
+    return parser.parse_args(argv)
+
+
+def main(argv:list=None) -> int:
+    """Entry point of ``python -m nodeeditor.batch``. Returns exit code"""
+    args = parseArguments(argv)
+    stdout = sys.stdout
+    output_format = getFileFormat(None if args.output == '-' else args.output, args.output_format)
+
+    # nodes print debugging messages, keep them out of the results
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            setJsonBackend(args.json_backend)
+            selector = importObject(args.node_class_selector) if args.node_class_selector else None
+            batch = SceneBatch(args.graph, selector, args.output_keys)
+
+            input_file = sys.stdin if args.inputs == '-' else open(args.inputs, 'r', encoding='utf-8', newline='')
+            output_file = stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8', newline='')
+            count = invalid = 0
+            start = time.perf_counter()
+            try:
+                writer = RowWriter(output_file, output_format, batch.output_columns)
+                rows = iterRows(input_file, getFileFormat(args.inputs, args.input_format))
+                for result in evaluateRows(batch, rows, args):
+                    writer.write(result)
+                    count += 1
+                    if any(value is None for value in result.values()): invalid += 1
+            finally:
+                if input_file is not sys.stdin: input_file.close()
+                if output_file is not stdout: output_file.close()
+                else: output_file.flush()
+        except (BatchError, InvalidFile, OSError, ImportError) as e:
+            print("error:", e, file=sys.stderr)
+            return 1
+
+    elapsed = time.perf_counter() - start
+    print("Evaluated %d rows in %.3f s (%.0f rows/s), %d rows with invalid outputs, %d process(es), %s" % (
+        count, elapsed, count / elapsed if elapsed > 0 else 0.0, invalid, max(1, args.processes),
+        "compiled" if batch.compiled is not None else "evaluator"), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
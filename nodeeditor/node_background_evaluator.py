@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the Background Evaluator which evaluates a snapshot of the `Scene` outside of the GUI thread
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QObject, Signal
+
+from nodeeditor.utils import dumpException
+
+DEBUG = False
+
+
+class BackgroundEvaluator(QObject):
+    """
+    Class evaluating `Nodes` on a worker thread, so slow `Nodes` don't freeze the GUI.
+
+    The worker thread keeps a headless copy of the requested `Nodes` and their ancestors, the snapshot
+    :class:`~nodeeditor.node_scene.Scene`. It is serialized in the GUI thread and rebuilt only when `Nodes` or
+    `Edges` are added or removed, or content of a `Node` which is not an argument value changes (see
+    :py:meth:`invalidateSnapshot`). Otherwise :py:meth:`requestEvaluation` sends just the argument values
+    (:py:meth:`~nodeeditor.node_node.Node.getCompileArgumentValue` of `Nodes` supporting
+    :py:meth:`~nodeeditor.node_node.Node.setArgumentValue`) and evaluation states of the `Dirty` or `Invalid`
+    `Nodes`. The resulting evaluation states come back by a queued Qt signal and are applied to the real `Nodes` by
+    :py:meth:`~nodeeditor.node_node.Node.setEvaluationState`. A newer request cancels the older one, results of the
+    cancelled evaluations are thrown away. Requested `Nodes` are marked `Busy` until their results arrive.
+
+    Set it as ``scene.background_evaluator`` to make `Nodes` use it instead of evaluating in the GUI thread.
+    """
+
+    #: emitted from the worker thread with ``(request number, {node id: evaluation state})``
+    evaluated = Signal(int, object)
+
+    def __init__(self, scene:'Scene', parent:QObject=None):
+        """
+        :param scene: Reference to the :class:`~nodeeditor.node_scene.Scene`
+        :type scene: :class:`~nodeeditor.node_scene.Scene`
+        :param parent: parent ``QObject``
+
+        :Instance Attributes:
+
+        - **scene** - reference to the :class:`~nodeeditor.node_scene.Scene`
+        """
+        super().__init__(parent)
+        self.scene = scene
+
+        self._request_number = 0
+        self._busy_nodes = []
+        # the snapshot Scene being evaluated in the worker thread, so it can be cancelled
+        self._lock = threading.Lock()
+        self._running = None
+
+        # GUI thread: bumped by invalidateSnapshot, what the last sent structure was made of and cached ancestors
+        self._content_version = 0
+        self._sent_key = None
+        self._sent_members = set()
+        self._members_cache = None
+        # worker thread: the snapshot Scene kept between requests and the structure it is built from
+        self._snapshot_scene = None
+        self._structure = None
+
+        # one worker, older requests are cancelled anyway
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="BackgroundEvaluator")
+
+        self._evaluated_listeners = []
+        self.evaluated.connect(self.onEvaluated)
+
+    def addEvaluatedListener(self, callback:'function'):
+        """Register callback for `Evaluated` event, called in the GUI thread after the results were applied
+
+        :param callback: callback function
+        """
+        self._evaluated_listeners.append(callback)
+
+    def isBusy(self) -> bool:
+        """Is there a request which results have not arrived yet?
+
+        :rtype: ``bool``
+        """
+        return bool(self._busy_nodes)
+
+    def shutdown(self):
+        """Cancel running evaluation and stop the worker thread"""
+        self._request_number += 1
+        self.cancelRunning()
+        self._executor.shutdown(wait=False)
+        self._setBusyNodes([])
+
+    def cancelRunning(self):
+        """Ask the running evaluation to stop. It stops after the currently evaluated `Node`, or right away when the
+        `Node` checks its cancellation token"""
+        with self._lock:
+            if self._running is not None: self._running.evaluator.cancel()
+
+    def invalidateSnapshot(self):
+        """Rebuild the snapshot `Scene` of the worker thread by the next request. Called when content of a `Node`
+        changes in a way the argument values don't carry, see
+        :py:meth:`~nodeeditor.node_node.Node.onContentChanged`"""
+        self._content_version += 1
+
+    def requestEvaluation(self, nodes:'Iterable[Node]'=None):
+        """
+        Evaluate `nodes` on the worker thread. Older request still running is cancelled
+
+        :param nodes: `Nodes` to evaluate. ``None`` means all `Dirty` or `Invalid` `Nodes` of the `Scene`
+        :type nodes: Iterable[:class:`~nodeeditor.node_node.Node`]
+        :return: number of this request
+        :rtype: ``int``
+        """
+        if nodes is None:
+            nodes = [node for node in self.scene.nodes if node.isDirty() or node.isInvalid()]
+        else:
+            nodes = list(nodes)
+
+        self._request_number += 1
+        self.cancelRunning()
+        self._setBusyNodes(nodes)
+
+        snapshot = self.createSnapshot(nodes)
+        self._executor.submit(self._evaluateSnapshot, self._request_number, snapshot, [node.id for node in nodes])
+        return self._request_number
+
+    def getMembers(self, nodes:'List[Node]') -> tuple:
+        """
+        Returns `nodes` with all their ancestors in topological order and those of them whose value is sent as
+        argument value. Cached until the topology changes. Called in the GUI thread
+
+        :param nodes: `Nodes` to be evaluated
+        :type nodes: List[:class:`~nodeeditor.node_node.Node`]
+        :return: ``(members, argument members)``
+        :rtype: ``tuple``
+        """
+        key = (self.scene.evaluator.getTopologyVersion(), tuple(node.id for node in nodes))
+        if self._members_cache is not None and self._members_cache[0] == key: return self._members_cache[1]
+
+        members = set()
+        stack = list(nodes)
+        while stack:
+            node = stack.pop()
+            if node in members: continue
+            members.add(node)
+            for socket in node.inputs:
+                for edge in socket.edges:
+                    other_socket = edge.getOtherSocket(socket)
+                    if other_socket is not None: stack.append(other_socket.node)
+
+        ordered = [node for node in self.scene.evaluator.getTopologicalOrder() if node in members]
+        arguments = [node for node in ordered if node.compile_argument and node.supportsArgumentValue()]
+        self._members_cache = key, (ordered, arguments)
+        return ordered, arguments
+
+    def createSnapshot(self, nodes:'List[Node]') -> OrderedDict:
+        """
+        Collect what the worker thread needs to evaluate `nodes`. Called in the GUI thread
+
+        :param nodes: `Nodes` to be evaluated
+        :type nodes: List[:class:`~nodeeditor.node_node.Node`]
+        :return: ``'structure'`` - the serialized sub-scene when the snapshot `Scene` has to be rebuilt, otherwise
+            ``None``. ``'values'`` - ``{node id: argument value}``, ``'states'`` - ``{node id: evaluation state}``
+            of `Dirty` or `Invalid` `Nodes`
+        :rtype: ``OrderedDict``
+        """
+        members, arguments = self.getMembers(nodes)
+        key = (self.scene.evaluator.getTopologyVersion(), self._content_version)
+        structure = None
+        if key != self._sent_key or not self._sent_members.issuperset(members):
+            structure = self.serializeMembers(members)
+            self._sent_key, self._sent_members = key, set(members)
+
+        return OrderedDict([
+            ('structure', structure),
+            ('values', {node.id: node.getCompileArgumentValue() for node in arguments}),
+            ('states', {node.id: node.getEvaluationState() for node in members if node.isDirty() or node.isInvalid()}),
+        ])
+
+    def serializeMembers(self, members:'List[Node]') -> OrderedDict:
+        """
+        Serialize `members` and the `Edges` between them. Called in the GUI thread
+
+        :param members: `Nodes` in topological order
+        :type members: List[:class:`~nodeeditor.node_node.Node`]
+        :return: serialized sub-scene, with ``'states'`` containing evaluation state of each `Node`
+        :rtype: ``OrderedDict``
+        """
+        edges = []
+        for node in members:
+            for socket in node.inputs:
+                for edge in socket.edges:
+                    if edge.start_socket is not None and edge.end_socket is not None: edges.append(edge.serialize())
+
+        return OrderedDict([
+            ('id', self.scene.id),
+            ('nodes', [node.serialize() for node in members]),
+            ('edges', edges),
+            ('states', {node.id: node.getEvaluationState() for node in members}),
+        ])
+
+    def createSnapshotScene(self) -> 'Scene':
+        """Returns headless `Scene` used for evaluating the snapshot. Called in the worker thread"""
+        snapshot_scene = self.scene.__class__(headless=True)
+        snapshot_scene.setNodeClassSelector(self.scene.node_class_selector)
+        return snapshot_scene
+
+    def _buildSnapshotScene(self) -> 'Scene':
+        # runs in the worker thread
+        snapshot_scene = self.createSnapshotScene()
+        # connection notifications would evaluate the Nodes while loading, the states come from the snapshot
+        snapshot_scene.notifier.collect()
+        snapshot_scene.deserialize(self._structure)
+        snapshot_scene.notifier.clear()
+        snapshot_scene.notifier.dispatch()
+        for node_id, state in self._structure['states'].items():
+            node = snapshot_scene.getNodeByID(node_id)
+            if node is not None: node.setEvaluationState(state)
+        return snapshot_scene
+
+    def _evaluateSnapshot(self, request_number:int, snapshot:dict, node_ids:list):
+        # runs in the worker thread, requests come in order, so a newer structure replaces the older one
+        if snapshot['structure'] is not None:
+            self._structure = snapshot['structure']
+            self._snapshot_scene = None
+        if request_number != self._request_number: return
+
+        try:
+            if self._snapshot_scene is None: self._snapshot_scene = self._buildSnapshotScene()
+            snapshot_scene = self._snapshot_scene
+            with self._lock:
+                if request_number != self._request_number: return
+                self._running = snapshot_scene
+                # cancel() of an older request which arrived after its pass ended
+                snapshot_scene.evaluator.clearCancel()
+            snapshot_scene.evaluator.setTimeout(self.scene.evaluator.timeout)
+            snapshot_scene.evaluator.setNodeTimeout(self.scene.evaluator.node_timeout)
+
+            for node_id, value in snapshot['values'].items():
+                node = snapshot_scene.getNodeByID(node_id)
+                if node is not None: node.setArgumentValue(value)
+            for node_id, state in snapshot['states'].items():
+                node = snapshot_scene.getNodeByID(node_id)
+                if node is not None: node.setEvaluationState(state)
+            before = {node.id: node.getEvaluationState() for node in snapshot_scene.nodes}
+
+            targets = [snapshot_scene.getNodeByID(node_id) for node_id in node_ids]
+            snapshot_scene.evaluator.evaluate(node for node in targets if node is not None)
+            if request_number != self._request_number: return
+
+            results = {}
+            for node in snapshot_scene.nodes:
+                state = node.getEvaluationState()
+                if state != before.get(node.id) or node.id in node_ids: results[node.id] = state
+
+            if DEBUG: print("BackgroundEvaluator: request", request_number, "evaluated", len(results), "nodes")
+            self.evaluated.emit(request_number, results)
+
+        except Exception as e:
+            dumpException(e)
+            # the snapshot Scene may be half updated, build it again next time
+            self._snapshot_scene = None
+        finally:
+            with self._lock: self._running = None
+
+    def onEvaluated(self, request_number:int, results:dict):
+        """
+        Slot receiving results from the worker thread, called in the GUI thread. Results of older requests are
+        ignored
+
+        :param request_number: number of the request
+        :type request_number: ``int``
+        :param results: ``{node id: evaluation state}``
+        :type results: ``dict``
+        """
+        if request_number != self._request_number: return
+
+        for node_id, state in results.items():
+            node = self.scene.getNodeByID(node_id)
+            if node is None: continue
+            try:
+                node.setEvaluationState(state)
+            except Exception as e: dumpException(e)
+
+        self._setBusyNodes([])
+        for callback in self._evaluated_listeners: callback()
+
+    def _setBusyNodes(self, nodes:'List[Node]'):
+        for node in self._busy_nodes: node.markBusy(False)
+        self._busy_nodes = list(nodes)
+        for node in self._busy_nodes: node.markBusy()
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the binary `Scene` file format with fixed-width columnar tables.
+
+The file starts with :data:`MAGIC`, ``uint32`` version and ``uint32`` length of a JSON header, followed by the
+header padded to 8 bytes and the columns. Every column is a little-endian array aligned to 8 bytes, so it can be
+used straight from ``mmap`` by ``memoryview.cast`` or ``numpy.frombuffer`` without copying. The header holds the
+`Scene` id and size and ``[offset, count]`` of each column, offsets are counted from the end of the header.
+
+Tables and their columns (see :data:`COLUMNS`):
+
+- **nodes** - ``id``, ``pos_x``, ``pos_y``, ``title`` and ``data`` indices to the string pool. ``data`` is JSON of
+  the rest of the serialized `Node` (``content`` and keys added by `Node` subclasses)
+- **sockets** - rows of the `Sockets` of each `Node` in order, inputs before outputs. ``node`` is the row of the
+  `Node`, ``flags`` has :data:`SOCKET_OUTPUT` and :data:`SOCKET_MULTI_EDGES` bits
+- **edges** - ``start`` and ``end`` are rows of the `Sockets`, ``-1`` for no `Socket`
+- **strings** - pool of unique UTF-8 strings, string ``i`` is ``blob[offsets[i]:offsets[i + 1]]``
+"""
+import json
+import struct
+import sys
+from array import array
+from collections import OrderedDict
+
+try:
+    import numpy
+except ImportError:
+    # needed only for numpy views of the columns
+    numpy = None
+
+from nodeeditor.node_json_backend import getJsonBackend
+
+MAGIC = b"NESCENE\0"
+VERSION = 1
+BINARY_SCENE_EXTENSION = ".nsb"
+
+SOCKET_OUTPUT = 1
+SOCKET_MULTI_EDGES = 2
+
+#: table -> ((column, array typecode), ...)
+COLUMNS = OrderedDict([
+    ('nodes', (('id', 'q'), ('pos_x', 'd'), ('pos_y', 'd'), ('title', 'I'), ('data', 'I'))),
+    ('sockets', (('id', 'q'), ('node', 'I'), ('index', 'i'), ('position', 'i'), ('socket_type', 'i'),
+                 ('flags', 'B'))),
+    ('edges', (('id', 'q'), ('edge_type', 'i'), ('start', 'q'), ('end', 'q'))),
+    ('strings', (('offsets', 'Q'), ('blob', 'B'))),
+])
+
+NODE_KEYS = ('id', 'title', 'pos_x', 'pos_y', 'inputs', 'outputs')
+
+_PREFIX = struct.Struct('<8sII')
+_ALIGNMENT = 8
+
+
+class InvalidBinaryFile(Exception):
+    """Raised when the data is not a binary `Scene` file of a supported version"""
+    pass
+
+
+def isBinarySceneFilename(filename:str) -> bool:
+    """Returns ``True`` if `filename` has the extension of the binary format"""
+    return filename.lower().endswith(BINARY_SCENE_EXTENSION)
+
+
+class _StringPool():
+    """Unique strings stored once in the blob"""
+    def __init__(self):
+        self.indices = {}
+        self.offsets = array('Q', [0])
+        self.blob = bytearray()
+
+    def add(self, text:str) -> int:
+        index = self.indices.get(text)
+        if index is None:
+            index = self.indices[text] = len(self.indices)
+            self.blob += text.encode('utf-8')
+            self.offsets.append(len(self.blob))
+        return index
+
+
+def writeBinaryScene(data:dict, file:'file'):
+    """
+    Write serialized `Scene` to the binary `file`. `Nodes` and `Edges` are consumed one by one, only the columns
+    are held in memory
+
+    :param data: serialized `Scene`, see :py:meth:`~nodeeditor.node_scene.Scene.serialize`
+    :type data: ``dict``
+    :param file: file opened in binary mode
+    """
+    columns = {(table, name): array(code) for table, spec in COLUMNS.items() for name, code in spec}
+    backend = getJsonBackend()
+    strings = _StringPool()
+    socket_rows = {}
+
+    def column(table, name):
+        return columns[(table, name)]
+
+    for row, node_data in enumerate(data['nodes']):
+        column('nodes', 'id').append(node_data['id'])
+        column('nodes', 'pos_x').append(node_data['pos_x'])
+        column('nodes', 'pos_y').append(node_data['pos_y'])
+        column('nodes', 'title').append(strings.add(node_data['title']))
+        rest = OrderedDict((key, value) for key, value in node_data.items() if key not in NODE_KEYS)
+        column('nodes', 'data').append(strings.add(backend.dumps(rest, compact=True)))
+
+        for flags, sockets_data in ((0, node_data['inputs']), (SOCKET_OUTPUT, node_data['outputs'])):
+            for socket_data in sockets_data:
+                socket_rows[socket_data['id']] = len(socket_rows)
+                column('sockets', 'id').append(socket_data['id'])
+                column('sockets', 'node').append(row)
+                column('sockets', 'index').append(socket_data['index'])
+                column('sockets', 'position').append(socket_data['position'])
+                column('sockets', 'socket_type').append(socket_data['socket_type'])
+                column('sockets', 'flags').append(flags | (SOCKET_MULTI_EDGES if socket_data['multi_edges'] else 0))
+
+    for edge_data in data['edges']:
+        column('edges', 'id').append(edge_data['id'])
+        column('edges', 'edge_type').append(edge_data['edge_type'])
+        for end in ('start', 'end'):
+            socket_id = edge_data[end]
+            column('edges', end).append(-1 if socket_id is None else socket_rows[socket_id])
+
+    columns[('strings', 'offsets')] = strings.offsets
+    columns[('strings', 'blob')] = array('B', strings.blob)
+
+    directory, position = OrderedDict(), 0
+    for (table, name), values in columns.items():
+        position += -position % _ALIGNMENT
+        directory["%s.%s" % (table, name)] = [position, len(values)]
+        position += len(values) * values.itemsize
+
+    header = OrderedDict([
+        ('id', data['id']),
+        ('scene_width', data['scene_width']),
+        ('scene_height', data['scene_height']),
+        ('columns', directory),
+    ])
+    header_bytes = json.dumps(header).encode('utf-8')
+    header_bytes += b" " * (-(_PREFIX.size + len(header_bytes)) % _ALIGNMENT)
+    file.write(_PREFIX.pack(MAGIC, VERSION, len(header_bytes)))
+    file.write(header_bytes)
+
+    position = 0
+    for (table, name), values in columns.items():
+        offset = directory["%s.%s" % (table, name)][0]
+        file.write(b"\0" * (offset - position))
+        if sys.byteorder != 'little': values.byteswap()
+        file.write(values.tobytes())
+        position = offset + len(values) * values.itemsize
+
+
+class BinarySceneReader():
+    """
+    Class reading the binary `Scene` format from a buffer, e.g. ``mmap.mmap`` of the file, without copying
+    the columns. Use it as a context manager or call :py:meth:`close` to release the views of the buffer,
+    ``mmap`` can't be closed before
+    """
+    def __init__(self, buffer:'buffer'):
+        """
+        :param buffer: object supporting the buffer protocol - ``bytes``, ``mmap.mmap``, ``memoryview``...
+        :raises: :class:`InvalidBinaryFile` if the buffer doesn't contain the binary `Scene` format
+
+        :Instance Attributes:
+
+        - **header** - ``dict`` with `Scene` ``id``, ``scene_width``, ``scene_height`` and the ``columns``
+          directory
+        """
+        self.view = memoryview(buffer).cast('B')
+        self._views = [self.view]
+        try:
+            magic, version, header_length = _PREFIX.unpack_from(self.view)
+            if magic != MAGIC: raise InvalidBinaryFile("Not a binary scene file")
+            if version != VERSION: raise InvalidBinaryFile("Unsupported binary scene version %d" % version)
+            self.header = json.loads(bytes(self.view[_PREFIX.size:_PREFIX.size + header_length]))
+            self._data_offset = _PREFIX.size + header_length
+        except InvalidBinaryFile:
+            self.close()
+            raise
+        except (struct.error, ValueError) as e:
+            self.close()
+            raise InvalidBinaryFile("Not a binary scene file: %s" % e)
+        self._strings = {}
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Release all views of the buffer"""
+        while self._views: self._views.pop().release()
+
+    def getCount(self, table:str) -> int:
+        """Returns number of rows of the `table`"""
+        return self.header['columns']["%s.id" % table][1]
+
+    def _getColumnSpec(self, table:str, name:str) -> tuple:
+        code = dict(COLUMNS[table])[name]
+        offset, count = self.header['columns']["%s.%s" % (table, name)]
+        offset += self._data_offset
+        size = struct.calcsize(code)
+        if offset < 0 or offset + count * size > len(self.view):
+            raise InvalidBinaryFile("Column %s.%s is out of the file" % (table, name))
+        return code, offset, count, size
+
+    def column(self, table:str, name:str) -> memoryview:
+        """
+        Returns `name` column of the `table` as ``memoryview`` of the buffer
+
+        :param table: ``'nodes'``, ``'sockets'``, ``'edges'`` or ``'strings'``
+        :type table: ``str``
+        :param name: column name, see :data:`COLUMNS`
+        :type name: ``str``
+        :rtype: ``memoryview``
+        """
+        code, offset, count, size = self._getColumnSpec(table, name)
+        if sys.byteorder != 'little':
+            values = array(code, self.view[offset:offset + count * size])
+            values.byteswap()
+            return memoryview(values)
+        view = self.view[offset:offset + count * size].cast(code)
+        self._views.append(view)
+        return view
+
+    def numpyColumn(self, table:str, name:str) -> 'numpy.ndarray':
+        """
+        Returns `name` column of the `table` as read only ``numpy`` array sharing memory with the buffer
+
+        :raises: ``ImportError`` if numpy is not installed
+        """
+        if numpy is None: raise ImportError("numpy is required for numpy columns")
+        code, offset, count, size = self._getColumnSpec(table, name)
+        return numpy.frombuffer(self.view, dtype=numpy.dtype(code).newbyteorder('<'), count=count, offset=offset)
+
+    def getString(self, index:int) -> str:
+        """Returns string `index` of the string pool"""
+        text = self._strings.get(index)
+        if text is None:
+            if self._pool is None: self._pool = self.column('strings', 'offsets'), self.column('strings', 'blob')
+            offsets, blob = self._pool
+            text = self._strings[index] = str(blob[offsets[index]:offsets[index + 1]], 'utf-8')
+        return text
+
+    def iterNodes(self) -> 'Iterator[OrderedDict]':
+        """Yields serialized `Nodes` in the same form :py:meth:`~nodeeditor.node_node.Node.serialize` returns"""
+        ids, pos_x, pos_y = self.column('nodes', 'id'), self.column('nodes', 'pos_x'), self.column('nodes', 'pos_y')
+        titles, data = self.column('nodes', 'title'), self.column('nodes', 'data')
+        socket_columns = [self.column('sockets', name) for name, code in COLUMNS['sockets']]
+        socket_ids, socket_nodes, indices, positions, socket_types, flags = socket_columns
+        socket_count, row = len(socket_ids), 0
+        backend = getJsonBackend()
+
+        for i in range(len(ids)):
+            inputs, outputs = [], []
+            while row < socket_count and socket_nodes[row] == i:
+                socket_flags = flags[row]
+                (outputs if socket_flags & SOCKET_OUTPUT else inputs).append(OrderedDict([
+                    ('id', socket_ids[row]),
+                    ('index', indices[row]),
+                    ('multi_edges', bool(socket_flags & SOCKET_MULTI_EDGES)),
+                    ('position', positions[row]),
+                    ('socket_type', socket_types[row]),
+                ]))
+                row += 1
+            node_data = OrderedDict([
+                ('id', ids[i]),
+                ('title', self.getString(titles[i])),
+                ('pos_x', pos_x[i]),
+                ('pos_y', pos_y[i]),
+                ('inputs', inputs),
+                ('outputs', outputs),
+            ])
+            node_data.update(backend.loads(self.getString(data[i])))
+            yield node_data
+
+    def iterEdges(self) -> 'Iterator[OrderedDict]':
+        """Yields serialized `Edges` in the same form :py:meth:`~nodeeditor.node_edge.Edge.serialize` returns"""
+        socket_ids = self.column('sockets', 'id')
+        ids, edge_types = self.column('edges', 'id'), self.column('edges', 'edge_type')
+        starts, ends = self.column('edges', 'start'), self.column('edges', 'end')
+        for i in range(len(ids)):
+            yield OrderedDict([
+                ('id', ids[i]),
+                ('edge_type', edge_types[i]),
+                ('start', socket_ids[starts[i]] if starts[i] >= 0 else None),
+                ('end', socket_ids[ends[i]] if ends[i] >= 0 else None),
+            ])
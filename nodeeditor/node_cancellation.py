@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the Cancellation Token used for time budgets and cooperative cancellation of evaluation
+"""
+import time
+
+
+class EvaluationCancelled(Exception):
+    """Raised by :py:meth:`CancellationToken.check` when the evaluation was cancelled"""
+    pass
+
+
+class EvaluationTimeout(EvaluationCancelled):
+    """Raised by :py:meth:`CancellationToken.check` when the time budget of the evaluation ran out"""
+    pass
+
+
+class CancellationToken():
+    """
+    Class telling long running `Nodes` they should stop.
+
+    :class:`~nodeeditor.node_scene_evaluator.SceneEvaluator` creates one token per evaluation pass with the
+    per-evaluation time budget and for every evaluated `Node` a child token with the `Node`'s ``eval_timeout``.
+    `Nodes` call :py:meth:`check` from time to time while they work, which raises
+    :class:`EvaluationTimeout` or :class:`EvaluationCancelled` when they should stop.
+    """
+    def __init__(self, timeout:float=None, parent:'CancellationToken'=None):
+        """
+        :param timeout: time budget in seconds or ``None`` for no limit
+        :type timeout: ``float``
+        :param parent: token whose cancellation and deadline apply to this token too
+        :type parent: :class:`CancellationToken`
+
+        :Instance Attributes:
+
+        - **timeout** - time budget in seconds or ``None``
+        - **deadline** - ``time.monotonic()`` when the budget runs out or ``None``
+        - **parent** - parent token or ``None``
+        - **timed_out** - time budget reported by :class:`EvaluationTimeout` raised from :py:meth:`check`, ``None``
+          when it didn't raise
+        """
+        self.timeout = timeout
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+        self.parent = parent
+        self.timed_out = None
+        self._cancelled = False
+
+    def createChild(self, timeout:float=None) -> 'CancellationToken':
+        """
+        Returns token with its own `timeout`, which is also cancelled or expired together with this one
+
+        :param timeout: time budget of the child in seconds or ``None``
+        :type timeout: ``float``
+        :rtype: :class:`CancellationToken`
+        """
+        return self.__class__(timeout, parent=self)
+
+    def cancel(self):
+        """Ask everybody using this token (or its children) to stop. Can be called from any thread"""
+        self._cancelled = True
+
+    def isCancelled(self) -> bool:
+        """Was this token or one of its parents cancelled?
+
+        :rtype: ``bool``
+        """
+        token = self
+        while token is not None:
+            if token._cancelled: return True
+            token = token.parent
+        return False
+
+    def getExpiredTimeout(self, inherited:bool=True) -> 'float or None':
+        """Returns the time budget which ran out, this token's or a parent's, or ``None`` if none did
+
+        :param inherited: ``False`` checks only the budget of this token, not of the parents
+        :type inherited: ``bool``
+        :rtype: ``float`` or ``None``
+        """
+        now = time.monotonic()
+        token = self
+        while token is not None:
+            if token.deadline is not None and now >= token.deadline: return token.timeout
+            token = token.parent if inherited else None
+        return None
+
+    def isExpired(self) -> bool:
+        """Did the time budget of this token or one of its parents run out?
+
+        :rtype: ``bool``
+        """
+        return self.getExpiredTimeout() is not None
+
+    def remaining(self) -> 'float or None':
+        """Returns seconds left until the nearest deadline or ``None`` for no limit
+
+        :rtype: ``float`` or ``None``
+        """
+        deadlines = []
+        token = self
+        while token is not None:
+            if token.deadline is not None: deadlines.append(token.deadline)
+            token = token.parent
+        if not deadlines: return None
+        return max(0.0, min(deadlines) - time.monotonic())
+
+    def check(self):
+        """
+        Raise when the evaluation should stop
+
+        :raises: :class:`EvaluationCancelled` when cancelled, :class:`EvaluationTimeout` when the time budget ran out
+        """
+        if self.isCancelled(): raise EvaluationCancelled("Evaluation was cancelled")
+        timeout = self.getExpiredTimeout()
+        if timeout is not None:
+            self.timed_out = timeout
+            raise EvaluationTimeout("Evaluation timed out after %gs" % timeout)
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing helpers for compressed `Scene` files (``.json.gz``, ``.json.xz``).
+
+Compression of saved files is chosen by the extension, loaded files are recognized by their magic bytes whatever
+their name is. Files are compressed and decompressed as streams, the whole payload is never held in memory.
+"""
+import gzip
+import lzma
+from collections import OrderedDict
+
+
+#: name -> (magic bytes, extension, function opening the file like ``gzip.open``)
+COMPRESSIONS = OrderedDict([
+    ('gzip', (b"\x1f\x8b", ".gz", gzip.open)),
+    ('xz', (b"\xfd7zXZ\x00", ".xz", lzma.open)),
+])
+
+MAGIC_LENGTH = max(len(magic) for magic, extension, opener in COMPRESSIONS.values())
+
+#: exceptions raised while reading corrupted or truncated compressed files
+DECOMPRESSION_ERRORS = (EOFError, gzip.BadGzipFile, lzma.LZMAError)
+
+
+def getCompressionFromFilename(filename:str) -> str:
+    """
+    Returns name of the compression by the extension of `filename`
+
+    :param filename: file name or path
+    :type filename: ``str``
+    :return: key of :data:`COMPRESSIONS` or ``None`` for uncompressed file
+    :rtype: ``str``
+    """
+    filename = filename.lower()
+    for name, (magic, extension, opener) in COMPRESSIONS.items():
+        if filename.endswith(extension): return name
+    return None
+
+
+def detectCompression(header:bytes) -> str:
+    """
+    Returns name of the compression by magic bytes at the start of a file
+
+    :param header: at least :data:`MAGIC_LENGTH` first bytes of the file
+    :type header: ``bytes``
+    :return: key of :data:`COMPRESSIONS` or ``None`` for uncompressed file
+    :rtype: ``str``
+    """
+    for name, (magic, extension, opener) in COMPRESSIONS.items():
+        if header.startswith(magic): return name
+    return None
+
+
+def openCompressed(file:'file', compression:str, mode:str='rb', **kwargs) -> 'file':
+    """
+    Returns file object (de)compressing the data of `file` while it's read or written
+
+    :param file: file name or file object opened in binary mode
+    :param compression: key of :data:`COMPRESSIONS`
+    :type compression: ``str``
+    :param mode: mode of the returned file, e.g. ``'rb'`` or ``'wt'``
+    :type mode: ``str``
+    :param kwargs: passed to the opening function, e.g. ``encoding`` for text modes
+    """
+    magic, extension, opener = COMPRESSIONS[compression]
+    return opener(file, mode, **kwargs)
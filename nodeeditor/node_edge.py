@@ -5,6 +5,7 @@ A module containing NodeEditor's class for representing Edge and Edge Type Const
 from collections import OrderedDict
 from nodeeditor.node_serializable import Serializable
 from nodeeditor.node_graphics_edge import *
+from nodeeditor.node_graphics_edge_path import EDGE_CP_ROUNDNESS
 from nodeeditor.utils import dumpException
 
 EDGE_TYPE_DIRECT = 1
@@ -30,7 +31,7 @@ class Edge(Serializable):
         :Instance Attributes:
 
             - **scene** - reference to the :class:`~nodeeditor.node_scene.Scene`
-            - **grEdge** - Instance of :class:`~nodeeditor.node_graphics_edge.QDMGraphicsEdge` subclass handling graphical representation in the ``QGraphicsScene``.
+            - **grEdge** - Instance of :class:`~nodeeditor.node_graphics_edge.QDMGraphicsEdge` subclass handling graphical representation in the ``QGraphicsScene``. ``None`` in headless `Scene`
         """
         super().__init__()
         self.scene = scene
@@ -38,13 +39,14 @@ class Edge(Serializable):
         # default init
         self._start_socket = None
         self._end_socket = None
+        self._edge_type = edge_type
 
         self.start_socket = start_socket
         self.end_socket = end_socket
-        self._edge_type = edge_type
 
         # create Graphics Edge instance
-        self.grEdge = self.createEdgeClassInstance()
+        self.grEdge = None
+        if not self.scene.isGraphicsDeferred(): self.createEdgeClassInstance()
 
         self.scene.addEdge(self)
 
@@ -76,6 +78,7 @@ class Edge(Serializable):
         # addEdge to the Socket class
         if self.start_socket is not None:
             self.start_socket.addEdge(self)
+        self.scene.spatial_index.updateEdge(self)
 
     @property
     def end_socket(self):
@@ -99,6 +102,7 @@ class Edge(Serializable):
         # addEdge to the Socket class
         if self.end_socket is not None:
             self.end_socket.addEdge(self)
+        self.scene.spatial_index.updateEdge(self)
 
     @property
     def edge_type(self):
@@ -116,12 +120,14 @@ class Edge(Serializable):
     def edge_type(self, value):
         # assign new value
         self._edge_type = value
+        self.scene.spatial_index.updateEdge(self)
 
         # update the grEdge pathCalculator
-        self.grEdge.createEdgePathCalculator()
+        if self.grEdge is not None:
+            self.grEdge.createEdgePathCalculator()
 
-        if self.start_socket is not None:
-            self.updatePositions()
+            if self.start_socket is not None:
+                self.updatePositions()
 
     def getGraphicsEdgeClass(self):
         """Returns the class representing Graphics Edge"""
@@ -139,6 +145,10 @@ class Edge(Serializable):
             self.updatePositions()
         return self.grEdge
 
+    def attachGraphics(self):
+        """Create the `Graphics Edge` for ``Edge`` created in a headless :class:`~nodeeditor.node_scene.Scene`"""
+        if self.grEdge is None: self.createEdgeClassInstance()
+
     def getOtherSocket(self, known_socket:'Socket'):
         """
         Returns the oposite socket on this ``Edge``
@@ -158,27 +168,52 @@ class Edge(Serializable):
         :param new_state: ``True`` if you want to select the ``Edge``, ``False`` if you want to deselect the ``Edge``
         :type new_state: ``bool``
         """
-        self.grEdge.doSelect(new_state)
+        if self.grEdge is not None: self.grEdge.doSelect(new_state)
 
     def updatePositions(self):
         """
         Updates the internal `Graphics Edge` positions according to the start and end :class:`~nodeeditor.node_socket.Socket`.
         This should be called if you update ``Edge`` positions.
         """
+        self.scene.spatial_index.updateEdge(self)
+        if self.grEdge is None: return
+
         source_pos = self.start_socket.getSocketPosition()
-        source_pos[0] += self.start_socket.node.grNode.pos().x()
-        source_pos[1] += self.start_socket.node.grNode.pos().y()
+        source_node_pos = self.start_socket.node.pos
+        source_pos[0] += source_node_pos.x()
+        source_pos[1] += source_node_pos.y()
         self.grEdge.setSource(*source_pos)
         if self.end_socket is not None:
             end_pos = self.end_socket.getSocketPosition()
-            end_pos[0] += self.end_socket.node.grNode.pos().x()
-            end_pos[1] += self.end_socket.node.grNode.pos().y()
+            end_node_pos = self.end_socket.node.pos
+            end_pos[0] += end_node_pos.x()
+            end_pos[1] += end_node_pos.y()
             self.grEdge.setDestination(*end_pos)
         else:
             self.grEdge.setDestination(*source_pos)
         self.grEdge.update()
 
 
+    def getBoundingRect(self) -> tuple:
+        """
+        Get bounding box of this ``Edge`` in the `Scene` computed from the connected `Sockets`, so it works
+        without `Graphics Edge`. For curved edges it is the bounding box of the control points, which always
+        contains the whole curve
+
+        :return: ``(x1, y1, x2, y2)`` rectangle or ``None`` if the ``Edge`` is not connected on both sides
+        :rtype: ``tuple`` or ``None``
+        """
+        if self.start_socket is None or self.end_socket is None: return None
+
+        sx, sy = self.start_socket.node.getSocketScenePosition(self.start_socket)
+        dx, dy = self.end_socket.node.getSocketScenePosition(self.end_socket)
+        x1, x2 = min(sx, dx), max(sx, dx)
+        y1, y2 = min(sy, dy), max(sy, dy)
+        if self.edge_type != EDGE_TYPE_DIRECT:
+            padx = (x2 - x1) * 0.5
+            x1, x2, y1, y2 = x1 - padx, x2 + padx, y1 - EDGE_CP_ROUNDNESS, y2 + EDGE_CP_ROUNDNESS
+        return (x1, y1, x2, y2)
+
     def remove_from_sockets(self):
         """
         Helper function which sets start and end :class:`~nodeeditor.node_socket.Socket` to ``None``
@@ -208,16 +243,17 @@ class Edge(Serializable):
         """
         old_sockets = [self.start_socket, self.end_socket]
 
-        # ugly hack, since I noticed that even when you remove grEdge from scene,
-        # sometimes it stays there! How dare you Qt!
-        if DEBUG: print(" - hide grEdge")
-        self.grEdge.hide()
+        if self.grEdge is not None:
+            # ugly hack, since I noticed that even when you remove grEdge from scene,
+            # sometimes it stays there! How dare you Qt!
+            if DEBUG: print(" - hide grEdge")
+            self.grEdge.hide()
 
-        if DEBUG: print(" - remove grEdge", self.grEdge)
-        self.scene.grScene.removeItem(self.grEdge)
-        if DEBUG: print("   grEdge:", self.grEdge)
+            if DEBUG: print(" - remove grEdge", self.grEdge)
+            self.scene.grScene.removeItem(self.grEdge)
+            if DEBUG: print("   grEdge:", self.grEdge)
 
-        self.scene.grScene.update()
+            self.scene.notifier.requestUpdate()
 
         if DEBUG: print("# Removing Edge", self)
         if DEBUG: print(" - remove edge from all sockets")
@@ -240,8 +276,7 @@ class Edge(Serializable):
                         continue
 
                     # notify Socket's Node
-                    socket.node.onEdgeConnectionChanged(self)
-                    if socket.is_input: socket.node.onInputChanged(socket)
+                    self.scene.notifier.notifyConnectionChanged(socket, self)
 
         except Exception as e: dumpException(e)
 
@@ -255,7 +290,7 @@ class Edge(Serializable):
         ])
 
     def deserialize(self, data:dict, hashmap:dict={}, restore_id:bool=True) -> bool:
-        if restore_id: self.id = data['id']
+        if restore_id: self.scene.changeEdgeID(self, data['id'])
         self.start_socket = hashmap[data['start']]
         self.end_socket = hashmap[data['end']]
         self.edge_type = data['edge_type']
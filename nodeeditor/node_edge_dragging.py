@@ -63,28 +63,33 @@ class EdgeDragging:
             if isinstance(item, QDMGraphicsSocket):
                 if item.socket != self.drag_start_socket:
                     # if we released dragging on a socket (other then the beginning socket)
+                    scene = item.socket.node.scene
 
-                    ## First remove old edges / send notifications
-                    for socket in (item.socket, self.drag_start_socket):
-                        if not socket.is_multi_edges:
-                            if socket.is_input:
-                                # print("removing SILENTLY edges from input socket (is_input and !is_multi_edges) [DragStart]:", item.socket.edges)
-                                socket.removeAllEdges(silent=True)
-                            else:
-                                socket.removeAllEdges(silent=False)
+                    # evaluation of a cycle would never end, don't connect such sockets
+                    if scene.topology.wouldCreateCycle(self.drag_start_socket, item.socket):
+                        if DEBUG: print('View::edgeDragEnd ~  edge would create a cycle, cancelled')
+                        return False
 
+                    # notifications are collected and each touched node is notified once at the end
+                    with scene.batch("Created new edge by dragging"):
+                        ## First remove old edges / send notifications
+                        for socket in (item.socket, self.drag_start_socket):
+                            if not socket.is_multi_edges:
+                                if socket.is_input:
+                                    # print("removing SILENTLY edges from input socket (is_input and !is_multi_edges) [DragStart]:", item.socket.edges)
+                                    socket.removeAllEdges(silent=True)
+                                else:
+                                    socket.removeAllEdges(silent=False)
 
-                    ## Create new Edge
-                    new_edge = self.getEdgeClass()(item.socket.node.scene, self.drag_start_socket, item.socket, edge_type=EDGE_TYPE_BEZIER)
-                    if DEBUG: print("View::edgeDragEnd ~  created new edge:", new_edge, "connecting", new_edge.start_socket, "<-->", new_edge.end_socket)
 
-                    ## Send notifications for the new edge
-                    for socket in [self.drag_start_socket, item.socket]:
-                        # @TODO: Add possibility (ie when an input edge was replaced) to be silent and don't trigger change
-                        socket.node.onEdgeConnectionChanged(new_edge)
-                        if socket.is_input: socket.node.onInputChanged(socket)
+                        ## Create new Edge
+                        new_edge = self.getEdgeClass()(scene, self.drag_start_socket, item.socket, edge_type=EDGE_TYPE_BEZIER)
+                        if DEBUG: print("View::edgeDragEnd ~  created new edge:", new_edge, "connecting", new_edge.start_socket, "<-->", new_edge.end_socket)
+
+                        ## Send notifications for the new edge
+                        for socket in [self.drag_start_socket, item.socket]:
+                            scene.notifier.notifyConnectionChanged(socket, new_edge)
 
-                    self.grView.grScene.scene.history.storeHistory("Created new edge by dragging", setModified=True)
                     return True
         except Exception as e: dumpException(e)
 
@@ -110,7 +110,7 @@ class NodeEditorWidget(QWidget):
         self.scene.history.storeInitialHistoryStamp()
 
     def fileLoad(self, filename:str):
-        """Load serialized graph from JSON file
+        """Load serialized graph from JSON file. Files compressed by gzip or xz are recognized by their content
 
         :param filename: file to load
         :type filename: ``str``
@@ -132,7 +132,8 @@ class NodeEditorWidget(QWidget):
 
 
     def fileSave(self, filename:str=None):
-        """Save serialized graph to JSON file. When called with empty parameter, we won't store/remember the filename
+        """Save serialized graph to JSON file. When called with empty parameter, we won't store/remember the filename.
+        Filenames ending with ``.json.gz`` or ``.json.xz`` are saved compressed
 
         :param filename: file to store the graph
         :type filename: ``str``
@@ -3,11 +3,11 @@
 A module containing Main Window class
 """
 import os
-import json
 from PySide6.QtCore import QSettings, QPoint, QSize
 from PySide6.QtGui import QAction
 from PySide6.QtWidgets import QMainWindow, QMessageBox, QFileDialog, QLabel, QApplication
 from nodeeditor.node_editor_widget import NodeEditorWidget
+from nodeeditor.node_json_backend import getJsonBackend
 
 
 
@@ -192,7 +192,7 @@ class NodeEditorWindow(QMainWindow):
 
     def getFileDialogFilter(self):
         """Returns ``str`` standard file open/save filter for ``QFileDialog``"""
-        return 'Graph (*.json);;All files (*)'
+        return 'Graph (*.json *.json.gz *.json.xz);;Binary graph (*.nsb);;All files (*)'
 
     def onFileNew(self):
         """Hande File New operation"""
@@ -271,7 +271,7 @@ class NodeEditorWindow(QMainWindow):
         """Handle Edit Cut to clipboard operation"""
         if self.getCurrentNodeEditorWidget():
             data = self.getCurrentNodeEditorWidget().scene.clipboard.serializeSelected(delete=True)
-            str_data = json.dumps(data, indent=4)
+            str_data = getJsonBackend().dumps(data, indent=4)
             QApplication.clipboard().setText(str_data)
             self.statusBar().showMessage("Cut", 2000)
 
@@ -279,7 +279,7 @@ class NodeEditorWindow(QMainWindow):
         """Handle Edit Copy to clipboard operation"""
         if self.getCurrentNodeEditorWidget():
             data = self.getCurrentNodeEditorWidget().scene.clipboard.serializeSelected(delete=False)
-            str_data = json.dumps(data, indent=4)
+            str_data = getJsonBackend().dumps(data, indent=4)
             QApplication.clipboard().setText(str_data)
             self.statusBar().showMessage("Copy", 2000)
 
@@ -288,7 +288,7 @@ class NodeEditorWindow(QMainWindow):
         if self.getCurrentNodeEditorWidget():
             raw_data = QApplication.instance().clipboard().text()
             try:
-                data = json.loads(raw_data)
+                data = getJsonBackend().loads(raw_data)
             except ValueError as e:
                 print("Pasting of non-valid JSON data has been denied.", e)
                 return
@@ -88,6 +88,11 @@ class QDMGraphicsNode(QGraphicsItem):
         self._pen_selected.setWidthF(2.0)
         self._pen_hovered = QPen(self._color_hovered)
         self._pen_hovered.setWidthF(3.0)
+        self._color_busy = QColor("#FF8AE234")
+        self._pen_busy = QPen(self._color_busy)
+        self._pen_busy.setWidthF(2.0)
+        self._pen_busy.setStyle(Qt.DashLine)
+        self._color_heat = QColor("#FFFF4500")
 
         self._brush_title = QBrush(QColor("#FF313131"))
         self._brush_background = QBrush(QColor("#FF212121"))
@@ -208,6 +213,15 @@ class QDMGraphicsNode(QGraphicsItem):
         painter.setBrush(self._brush_background)
         painter.drawPath(path_content.simplified())
 
+        # evaluation cost heat map
+        stats = self.node.scene.evaluation_stats
+        if stats.heat_map:
+            heat = stats.getHeat(self.node)
+            if heat > 0.0:
+                self._color_heat.setAlphaF(0.7 * heat)
+                painter.setBrush(QBrush(self._color_heat))
+                painter.drawPath(path_content.simplified())
+
 
         # outline
         path_outline = QPainterPath()
@@ -220,4 +234,9 @@ class QDMGraphicsNode(QGraphicsItem):
             painter.drawPath(path_outline.simplified())
         else:
             painter.setPen(self._pen_default if not self.isSelected() else self._pen_selected)
+            painter.drawPath(path_outline.simplified())
+
+        if self.node.isBusy():
+            # still being evaluated in background
+            painter.setPen(self._pen_busy)
             painter.drawPath(path_outline.simplified())
\ No newline at end of file
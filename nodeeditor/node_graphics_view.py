@@ -368,31 +368,29 @@ class QDMGraphicsView(QGraphicsView):
 
     def cutIntersectingEdges(self):
         """Compare which `Edges` intersect with current `Cut line` and delete them safely"""
-        for ix in range(len(self.cutline.line_points) - 1):
-            p1 = self.cutline.line_points[ix]
-            p2 = self.cutline.line_points[ix + 1]
+        # collect all touched nodes and notify each of them once after all edges are removed
+        scene = self.grScene.scene
+        with scene.batch("Delete cutted edges"):
+            for ix in range(len(self.cutline.line_points) - 1):
+                p1 = self.cutline.line_points[ix]
+                p2 = self.cutline.line_points[ix + 1]
 
-            # @TODO: we could collect all touched nodes, and notify them once after all edges removed
-            # we could cut 3 edges leading to a single nodeeditor this will notify it 3x
-            # maybe we could use some Notifier class with methods collect() and dispatch()
-
-            for edge in self.grScene.scene.edges:
-                if edge.grEdge.intersectsWith(p1, p2):
-                    edge.remove()
-
-        self.grScene.scene.history.storeHistory("Delete cutted edges", setModified=True)
+                # only edges whose bounding box is crossed by the segment need the exact path test
+                candidates = scene.spatial_index.edgesNearSegment((p1.x(), p1.y()), (p2.x(), p2.y()))
+                for edge in candidates:
+                    if edge.grEdge is not None and edge.grEdge.intersectsWith(p1, p2):
+                        edge.remove()
 
 
     def deleteSelected(self):
         """Shortcut for safe deleting every object selected in the `Scene`."""
-        for item in self.grScene.selectedItems():
-            if isinstance(item, QDMGraphicsEdge):
-                item.edge.remove()
-
-            elif hasattr(item, 'node'):
-                item.node.remove()
+        with self.grScene.scene.batch("Delete selected"):
+            for item in self.grScene.selectedItems():
+                if isinstance(item, QDMGraphicsEdge):
+                    item.edge.remove()
 
-        self.grScene.scene.history.storeHistory("Delete selected", setModified=True)
+                elif hasattr(item, 'node'):
+                    item.node.remove()
 
     def debug_modifiers(self, event):
         """Helper function get string if we hold Ctrl, Shift or Alt modifier keys"""
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the pluggable JSON backends used for saving `Scenes`, the clipboard and batch files.
+
+The backend is chosen once per process by :func:`setJsonBackend` or by the ``NODEEDITOR_JSON_BACKEND``
+environment variable (``auto``, ``json`` or ``orjson``). ``auto`` uses a faster library when it is importable
+and the standard ``json`` module otherwise. All backends keep the key order of ``dict`` / ``OrderedDict``,
+convert non-string keys the way ``json`` does and raise ``TypeError`` for values ``json`` can't serialize.
+"""
+import json
+import math
+import os
+from collections import OrderedDict
+
+try:
+    import orjson
+except ImportError:
+    # optional, the standard json module is used without it
+    orjson = None
+
+
+class JsonBackend():
+    """Backend using the standard ``json`` module. Other backends must produce data equal to its output"""
+
+    #: name used by :func:`setJsonBackend`
+    name = 'json'
+
+    def isAvailable(self) -> bool:
+        """Returns ``True`` if the library of this backend can be imported"""
+        return True
+
+    def dumps(self, data, indent:int=None, compact:bool=False) -> str:
+        """
+        Serialize `data` to JSON string
+
+        :param data: serializable data
+        :param indent: number of spaces per level or ``None`` for one line
+        :type indent: ``int``
+        :param compact: ``True`` leaves out spaces after separators
+        :type compact: ``bool``
+        :rtype: ``str``
+        :raises: ``TypeError`` if the data is not serializable
+        """
+        return json.dumps(data, indent=indent, separators=(',', ':') if compact else None)
+
+    def loads(self, text:'str|bytes'):
+        """
+        Deserialize JSON document
+
+        :param text: JSON document
+        :type text: ``str`` or ``bytes``
+        :raises: ``json.JSONDecodeError`` if the document is not valid JSON
+        """
+        return json.loads(text)
+
+
+class OrjsonBackend(JsonBackend):
+    """
+    Backend using ``orjson``. It writes non-ASCII characters as UTF-8 instead of escapes and indents by 2 spaces,
+    the data is the same. Data ``orjson`` refuses or can't write the same way (e.g. integers over 64 bits, ``NaN``
+    and infinite floats, which it would write as ``null``, ``NaN`` literals in documents) are handled by the standard
+    ``json`` module, so both accept and produce the same values
+    """
+    name = 'orjson'
+
+    def isAvailable(self) -> bool:
+        return orjson is not None
+
+    def dumps(self, data, indent:int=None, compact:bool=False) -> str:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent is not None: option |= orjson.OPT_INDENT_2
+        try:
+            text = orjson.dumps(data, option=option)
+        except orjson.JSONEncodeError:
+            return super().dumps(data, indent, compact)
+        # NaN and infinity were written as null, only documents with null need to be checked
+        if b"null" in text and _hasNonFiniteFloat(data): return super().dumps(data, indent, compact)
+        return text.decode('utf-8')
+
+    def loads(self, text:'str|bytes'):
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            return super().loads(text)
+
+
+def _hasNonFiniteFloat(data) -> bool:
+    """Returns ``True`` if `data` contains ``NaN`` or infinite float, in values or keys"""
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value): return True
+        elif isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+#: name -> backend, ``auto`` prefers the earlier ones
+BACKENDS = OrderedDict((backend.name, backend) for backend in (OrjsonBackend(), JsonBackend()))
+
+_backend = None
+
+
+def setJsonBackend(name:str='auto') -> JsonBackend:
+    """
+    Set JSON backend of this process
+
+    :param name: ``'auto'`` or name of a backend in :data:`BACKENDS`
+    :type name: ``str``
+    :return: the backend which is used
+    :rtype: :class:`JsonBackend`
+    :raises: ``ValueError`` for unknown backend, ``ImportError`` if its library is not installed
+    """
+    global _backend
+    if name == 'auto':
+        _backend = next(backend for backend in BACKENDS.values() if backend.isAvailable())
+        return _backend
+    if name not in BACKENDS:
+        raise ValueError("Unknown JSON backend %r, use one of: auto, %s" % (name, ", ".join(BACKENDS)))
+    if not BACKENDS[name].isAvailable(): raise ImportError("JSON backend %r is not installed" % name)
+    _backend = BACKENDS[name]
+    return _backend
+
+
+def getJsonBackend() -> JsonBackend:
+    """Returns JSON backend of this process, the first call chooses it by ``NODEEDITOR_JSON_BACKEND``"""
+    if _backend is None: setJsonBackend(os.environ.get('NODEEDITOR_JSON_BACKEND', 'auto'))
+    return _backend
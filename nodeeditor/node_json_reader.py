@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the JSON Stream Reader which parses big JSON documents piece by piece
+"""
+import codecs
+import json
+import re
+
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class JsonStreamReader():
+    """
+    Class reading a JSON object from a binary file without loading the whole document in memory.
+
+    Members of the top level object are yielded one by one by :py:meth:`iterObject`. Arrays of the chosen keys
+    are yielded as iterators parsing the elements one at a time, so e.g. serialized `Nodes` can be turned into
+    real `Nodes` while the rest of the file hasn't been read yet. Everything else is decoded by
+    ``json.JSONDecoder``. Malformed documents raise ``json.JSONDecodeError`` as ``json.loads`` does.
+    """
+    def __init__(self, file:'file', size:int=None, progress_callback:'function'=None, chunk_size:int=1 << 16):
+        """
+        :param file: file opened in binary mode or any object with ``read(size)`` returning UTF-8 ``bytes``,
+            e.g. ``mmap.mmap``
+        :param size: total number of bytes to read, used for progress reporting
+        :type size: ``int``
+        :param progress_callback: called as ``progress_callback(position, size)`` after each chunk is read
+        :type progress_callback: ``function``
+        :param chunk_size: number of bytes read at once
+        :type chunk_size: ``int``
+
+        :Instance Attributes:
+
+        - **file** - file the JSON is read from
+        - **size** - total number of bytes or ``None`` if unknown
+        - **position** - number of bytes read so far
+        """
+        self.file = file
+        self.size = size
+        self.position = 0
+        self.progress_callback = progress_callback
+        self.chunk_size = chunk_size
+
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ""
+        self._index = 0
+        self._eof = False
+
+    def _fill(self, size:int=None):
+        """Read next chunk of the file, dropping the already parsed text from the buffer"""
+        data = self.file.read(size or self.chunk_size)
+        if not data:
+            self._eof = True
+            text = self._text_decoder.decode(b"", final=True)
+        else:
+            self.position += len(data)
+            text = self._text_decoder.decode(data)
+        self._buffer = self._buffer[self._index:] + text
+        self._index = 0
+        if self.progress_callback is not None and data: self.progress_callback(self.position, self.size)
+
+    def _error(self, message:str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._buffer, self._index)
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character or empty string at the end of the file"""
+        while True:
+            self._index = WHITESPACE.match(self._buffer, self._index).end()
+            if self._index < len(self._buffer) or self._eof: break
+            self._fill()
+        return self._buffer[self._index:self._index + 1]
+
+    def _expect(self, char:str):
+        if self._peek() != char: raise self._error("Expecting %r" % char)
+        self._index += 1
+
+    def _decodeValue(self) -> object:
+        self._peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._index)
+            except json.JSONDecodeError as e:
+                if self._eof: raise json.JSONDecodeError(e.msg, self._buffer, e.pos)
+                value, end = None, None
+            # a number at the end of the buffer can continue in the next chunk
+            if end is not None and (end < len(self._buffer) or self._eof):
+                self._index = end
+                return value
+            self._fill(size)
+            # values bigger than the chunk are read in growing steps so they aren't parsed too many times
+            size *= 2
+
+    def iterObject(self, stream_keys:'Iterable[str]'=()) -> 'Iterator[(str, object)]':
+        """
+        Yields ``(key, value)`` of the top level JSON object in the order of the file
+
+        :param stream_keys: keys whose array values are yielded as iterators of the elements. The iterator should
+            be consumed before the next item is requested, elements which weren't are skipped
+        :type stream_keys: Iterable[``str``]
+        :raises: ``json.JSONDecodeError`` if the document is not a valid JSON object
+        """
+        self._expect('{')
+        if self._peek() == '}':
+            self._index += 1
+        else:
+            while True:
+                key = self._decodeValue()
+                if not isinstance(key, str): raise self._error("Expecting property name enclosed in double quotes")
+                self._expect(':')
+                if key in stream_keys and self._peek() == '[':
+                    items = self.iterArray()
+                    yield key, items
+                    for item in items: pass
+                else:
+                    yield key, self._decodeValue()
+
+                char = self._peek()
+                self._index += 1
+                if char == '}': break
+                if char != ',': raise self._error("Expecting ',' delimiter")
+
+        if self._peek() != '': raise self._error("Extra data")
+
+    def iterArray(self) -> 'Iterator[object]':
+        """Yields elements of the JSON array at the current position one by one"""
+        self._expect('[')
+        if self._peek() == ']':
+            self._index += 1
+            return
+        while True:
+            yield self._decodeValue()
+            char = self._peek()
+            self._index += 1
+            if char == ']': break
+            if char != ',': raise self._error("Expecting ',' delimiter")
+
+
+class JsonStreamObject():
+    """
+    Read-only mapping of the top level JSON object of :class:`JsonStreamReader`, parsed as the members are looked
+    up. Arrays of `stream_keys` are returned as iterators parsing the elements one at a time, so the object can be
+    passed e.g. to :py:meth:`~nodeeditor.node_scene.Scene.deserialize` while the file is being read. Members
+    skipped before the looked up one are kept in memory, arrays of `stream_keys` as lists. Missing `stream_keys`
+    are empty arrays
+    """
+    def __init__(self, reader:JsonStreamReader, stream_keys:'Iterable[str]'=()):
+        """
+        :param reader: reader positioned at the start of the document
+        :type reader: :class:`JsonStreamReader`
+        :param stream_keys: keys whose array values are returned as iterators
+        :type stream_keys: Iterable[``str``]
+        """
+        self.stream_keys = tuple(stream_keys)
+        self._items = reader.iterObject(self.stream_keys)
+        self._values = {}
+        self._done = False
+
+    def __getitem__(self, key:str):
+        while key not in self._values and not self._done:
+            try:
+                item_key, value = next(self._items)
+            except StopIteration:
+                self._done = True
+                break
+            # arrays not asked for yet would be skipped by the reader
+            if item_key != key and item_key in self.stream_keys: value = list(value)
+            self._values[item_key] = value
+
+        if key in self._values: return self._values[key]
+        if key in self.stream_keys: return []
+        raise KeyError(key)
+
+    def get(self, key:str, default=None):
+        """Returns value of `key` or `default` when the object doesn't have it"""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def finish(self):
+        """
+        Read the rest of the document
+
+        :raises: ``json.JSONDecodeError`` if the rest is not valid JSON
+        """
+        for item in self._items: pass
+        self._done = True
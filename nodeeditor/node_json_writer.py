@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the JSON Stream Writer which writes big serialized data to a file piece by piece
+"""
+import json
+from collections.abc import Iterator
+
+
+class _LazyValue(Exception):
+    """Raised by :class:`_Encoder` when the encoded data contains an iterator"""
+    pass
+
+
+class _Encoder(json.JSONEncoder):
+    def default(self, value):
+        if isinstance(value, Iterator): raise _LazyValue()
+        return super().default(value)
+
+
+class JsonStreamWriter():
+    """
+    Class writing JSON to a file without building the whole document in memory.
+
+    Iterators (e.g. generators) in the data are written as JSON arrays, element by element, so the serialized
+    `Nodes` and `Edges` of a `Scene` can be produced one at a time while writing. Everything else is encoded by
+    ``json.JSONEncoder``. The output is byte-identical to ``json.dumps(data, indent=indent)`` with the iterators
+    turned into lists, or to ``json.dumps(data, separators=(',', ':'))`` when `indent` is ``None`` (compact).
+    Compact output can be encoded by a faster :class:`~nodeeditor.node_json_backend.JsonBackend`, then it is
+    equal JSON, but not byte-identical.
+    """
+    def __init__(self, file:'file', indent:int=4, backend:'JsonBackend'=None):
+        """
+        :param file: opened text file
+        :param indent: number of spaces per level or ``None`` for compact output on one line
+        :type indent: ``int``
+        :param backend: backend encoding compact output, ``None`` for the standard ``json``
+        :type backend: :class:`~nodeeditor.node_json_backend.JsonBackend`
+
+        :Instance Attributes:
+
+        - **file** - file the JSON is written to
+        - **indent** - number of spaces per level or ``None``
+        - **backend** - backend used for compact output or ``None``
+        """
+        self.file = file
+        self.indent = indent
+        # indented output stays byte-identical to json.dumps, backends don't support every indentation
+        self.backend = backend if indent is None and backend is not None and backend.name != 'json' else None
+        if indent is None:
+            self.encoder = _Encoder(separators=(',', ':'))
+            self.key_separator = ':'
+        else:
+            self.encoder = _Encoder(indent=indent)
+            self.key_separator = ': '
+
+    def write(self, data):
+        """
+        Write `data` as JSON document
+
+        :param data: serializable data, iterators are written as arrays
+        """
+        self._write(data, 0)
+
+    def _newline(self, level:int) -> str:
+        if self.indent is None: return ""
+        return "\n" + " " * (self.indent * level)
+
+    def _encode(self, value) -> str:
+        if self.backend is not None:
+            try:
+                return self.backend.dumps(value, compact=True)
+            except TypeError:
+                # iterators are found by the encoder below
+                pass
+        return self.encoder.encode(value)
+
+    def _write(self, value, level:int):
+        if not isinstance(value, Iterator):
+            # plain data is encoded at once, only containers holding iterators are walked
+            try:
+                text = self._encode(value)
+            except _LazyValue:
+                text = None
+            if text is not None:
+                # strings in JSON can't contain new lines, so every new line is indentation
+                if self.indent is not None and level: text = text.replace("\n", self._newline(level))
+                self.file.write(text)
+                return
+
+        write = self.file.write
+        if isinstance(value, dict):
+            first = True
+            for key, item in value.items():
+                # json converts keys which are not strings the same way as the values
+                if not isinstance(key, str): key = json.dumps(key)
+                write("{" if first else ",")
+                write(self._newline(level + 1))
+                write(self.encoder.encode(key) + self.key_separator)
+                self._write(item, level + 1)
+                first = False
+            write(self._newline(level) + "}")
+        else:
+            first = True
+            for item in value:
+                write("[" if first else ",")
+                write(self._newline(level + 1))
+                self._write(item, level + 1)
+                first = False
+            write("[]" if first else self._newline(level) + "]")
+
+
+def dumpJson(data, file:'file', indent:int=4, backend:'JsonBackend'=None):
+    """
+    Write `data` to the `file` by :class:`JsonStreamWriter`
+
+    :param data: serializable data, iterators are written as arrays
+    :param file: opened text file
+    :param indent: number of spaces per level or ``None`` for compact output
+    :type indent: ``int``
+    :param backend: backend encoding compact output, ``None`` for the standard ``json``
+    :type backend: :class:`~nodeeditor.node_json_backend.JsonBackend`
+    """
+    JsonStreamWriter(file, indent, backend).write(data)
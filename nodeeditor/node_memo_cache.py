@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the Memo Cache which remembers results of `Node` computations for recurring input values
+"""
+import sys
+import threading
+from collections import OrderedDict
+
+DEBUG = False
+
+
+class MemoCache():
+    """
+    Least recently used cache of `Node` results keyed by the `Node` and its input values.
+
+    It is opt-in: set it to the `Scene` by :py:meth:`~nodeeditor.node_scene.Scene.setMemoCache` and it is used by
+    `Nodes` with ``memoize = True`` (see :py:meth:`~nodeeditor.node_node.Node.evalMemoized`). The cache is bounded
+    by `max_bytes` (estimated by ``sys.getsizeof`` of the keys and values) and `max_entries`. Entries of a `Node`
+    are dropped by :py:meth:`invalidateNode` when the `Node` is removed or deserialized, or when its content changes
+    (see :py:meth:`~nodeeditor.node_node.Node.onContentChanged`).
+    """
+    def __init__(self, max_bytes:int=64 * 1024 * 1024, max_entries:int=None):
+        """
+        :param max_bytes: memory budget in bytes
+        :type max_bytes: ``int``
+        :param max_entries: maximum number of entries or ``None`` for no limit
+        :type max_entries: ``int``
+
+        :Instance Attributes:
+
+        - **max_bytes** - memory budget in bytes
+        - **max_entries** - maximum number of entries or ``None``
+        - **hits** - number of lookups which found the value
+        - **misses** - number of lookups which didn't find the value
+        - **evictions** - number of entries dropped to stay in the budget
+        """
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._reset()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Remove all entries and reset the counters"""
+        with self._lock: self._reset()
+
+    def _reset(self):
+        # key -> (value, size in bytes, node id)
+        self._entries = OrderedDict()
+        # node id -> set of its keys
+        self._keys_by_node = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def getStats(self) -> dict:
+        """Returns ``dict`` with `entries`, `bytes`, `hits`, `misses`, `evictions` and `hit_ratio`
+
+        :rtype: ``dict``
+        """
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+        }
+
+    def lookup(self, key:tuple) -> tuple:
+        """
+        Find value stored for `key` and mark it as recently used
+
+        :param key: cache key, see :py:meth:`~nodeeditor.node_node.Node.getMemoKey`
+        :type key: ``tuple``
+        :return: ``(True, value)`` when found, ``(False, None)`` otherwise
+        :rtype: ``tuple``
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def store(self, key:tuple, value, node_id:int):
+        """
+        Store `value` for `key`, evicting the least recently used entries to stay in the budget
+
+        :param key: cache key, see :py:meth:`~nodeeditor.node_node.Node.getMemoKey`
+        :type key: ``tuple``
+        :param value: value to remember
+        :param node_id: id of the `Node` owning the entry, for :py:meth:`invalidateNode`
+        :type node_id: ``int``
+        """
+        size = sys.getsizeof(key) + sys.getsizeof(value)
+        if size > self.max_bytes: return
+
+        with self._lock:
+            if key in self._entries: self._remove(key)
+            self._entries[key] = (value, size, node_id)
+            self._keys_by_node.setdefault(node_id, set()).add(key)
+            self.bytes += size
+
+            while self.bytes > self.max_bytes or (self.max_entries is not None and len(self._entries) > self.max_entries):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidateNode(self, node_id:int):
+        """
+        Drop all entries of the `Node` with `node_id`
+
+        :param node_id: id of the `Node`
+        :type node_id: ``int``
+        """
+        with self._lock:
+            for key in self._keys_by_node.pop(node_id, ()):
+                value, size, owner = self._entries.pop(key)
+                self.bytes -= size
+
+    def _remove(self, key:tuple):
+        value, size, node_id = self._entries.pop(key)
+        self.bytes -= size
+        keys = self._keys_by_node.get(node_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys: del self._keys_by_node[node_id]
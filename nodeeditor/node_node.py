@@ -2,6 +2,8 @@
 """
 A module containing NodeEditor's class for representing `Node`.
 """
+from collections import deque
+from PySide6.QtCore import QPointF
 from nodeeditor.node_graphics_node import QDMGraphicsNode
 from nodeeditor.node_content_widget import QDMNodeContentWidget
 from nodeeditor.node_socket import *
@@ -10,14 +12,51 @@ from nodeeditor.utils import dumpException, pp
 DEBUG = False
 
 
+class NodeGeometry:
+    """
+    Plain-Python sizes of a `Node`. Used instead of :class:`~nodeeditor.node_graphics_node.QDMGraphicsNode` for
+    computing socket positions when the `Node` lives in a headless :class:`~nodeeditor.node_scene.Scene`.
+    Keep it in sync with :py:meth:`~nodeeditor.node_graphics_node.QDMGraphicsNode.initSizes` of the graphics class
+    """
+    def __init__(self):
+        self.initSizes()
+
+    def initSizes(self):
+        self.width = 180
+        self.height = 240
+        self.edge_roundness = 10.0
+        self.edge_padding = 10.0
+        self.title_height = 24.0
+        self.title_horizontal_padding = 4.0
+        self.title_vertical_padding = 4.0
+
+
 class Node(Serializable):
     """
     Class representing `Node` in the `Scene`.
     """
     GraphicsNode_class = QDMGraphicsNode
     NodeContent_class = QDMNodeContentWidget
+    NodeGeometry_class = NodeGeometry
     Socket_class = Socket
 
+    #: Can :py:meth:`eval` of this class run in a worker thread of parallel
+    #: :class:`~nodeeditor.node_scene_evaluator.SceneEvaluator`? Such `eval` should only read values of input
+    #: `Nodes` and must not touch Qt widgets. Marks, tooltip and ``evalChildren`` are replayed in the GUI thread
+    eval_thread_safe = False
+
+    #: Is value of this `Node` an argument of the function generated by
+    #: :class:`~nodeeditor.node_scene_compiler.SceneCompiler`? See :py:meth:`getCompileArgumentValue`
+    compile_argument = False
+
+    #: Should :py:meth:`evalMemoized` remember results in the `Scene`'s
+    #: :class:`~nodeeditor.node_memo_cache.MemoCache`? Can be set per class or per instance
+    memoize = False
+
+    #: Time budget of one evaluation of this `Node` in seconds, ``None`` uses the evaluator's ``node_timeout``.
+    #: See :class:`~nodeeditor.node_cancellation.CancellationToken`. Can be set per class or per instance
+    eval_timeout = None
+
     def __init__(self, scene:'Scene', title:str="Undefined Node", inputs:list=[], outputs:list=[]):
         """
 
@@ -35,6 +74,8 @@ class Node(Serializable):
             - **content** - Instance of :class:`~nodeeditor.node_graphics_content.QDMGraphicsContent` which is child of ``QWidget`` representing container for all inner widgets inside of the Node. Automatically created in constructor
             - **inputs** - list containin Input :class:`~nodeeditor.node_socket.Socket` instances
             - **outputs** - list containin Output :class:`~nodeeditor.node_socket.Socket` instances
+            - **content_state** - ``dict`` with serialized content data. Used instead of `content` when the `Node`
+              lives in a headless :class:`~nodeeditor.node_scene.Scene`
 
         """
         super().__init__()
@@ -45,13 +86,20 @@ class Node(Serializable):
         self.content = None
         self.grNode = None
 
-        self.initInnerClasses()
+        # plain data used when there are no graphics (headless Scene)
+        self.content_state = OrderedDict()
+        self._pos_x = 0.0
+        self._pos_y = 0.0
+        self._tooltip = ""
+        self._geometry = None
+
+        if not self.scene.isGraphicsDeferred(): self.initInnerClasses()
         self.initSettings()
 
         self.title = title
 
         self.scene.addNode(self)
-        self.scene.grScene.addItem(self.grNode)
+        if self.grNode is not None: self.scene.grScene.addItem(self.grNode)
 
         # create socket for inputs and outputs
         self.inputs = []
@@ -61,6 +109,9 @@ class Node(Serializable):
         # dirty and evaluation
         self._is_dirty = False
         self._is_invalid = False
+        self._is_busy = False
+        # (kind, value) -> generation in which the mark was propagated to this node. See _collectDescendants
+        self._mark_stamps = {}
 
     def __str__(self):
         return "<%s:%s %s..%s>" % (self.title, self.__class__.__name__,hex(id(self))[2:5], hex(id(self))[-3:])
@@ -79,7 +130,7 @@ class Node(Serializable):
     @title.setter
     def title(self, value):
         self._title = value
-        self.grNode.title = self._title
+        if self.grNode is not None: self.grNode.title = self._title
 
     @property
     def pos(self):
@@ -89,7 +140,8 @@ class Node(Serializable):
         :return: Node position
         :rtype: ``QPointF``
         """
-        return self.grNode.pos()        # QPointF
+        if self.grNode is not None: return self.grNode.pos()        # QPointF
+        return QPointF(self._pos_x, self._pos_y)
 
     def setPos(self, x:float, y:float):
         """
@@ -98,8 +150,56 @@ class Node(Serializable):
         :param x: X `Scene` position
         :param y: Y `Scene` position
         """
-        self.grNode.setPos(x, y)
+        self._pos_x, self._pos_y = float(x), float(y)
+        if self.grNode is not None: self.grNode.setPos(x, y)
+        self.scene.spatial_index.updateNode(self)
+
+    def getToolTip(self) -> str:
+        """Returns tooltip text of this `Node`"""
+        return self._tooltip
+
+    def setToolTip(self, text:str):
+        """
+        Sets tooltip text of this `Node`. The text is stored on the `Node` so it survives headless mode
+
+        :param text: new tooltip text
+        :type text: ``str``
+        """
+        if self.scene.evaluator.deferFromWorker(self.setToolTip, text): return
+        self._tooltip = text
+        if self.grNode is not None: self.grNode.setToolTip(text)
 
+    def getGeometry(self) -> 'QDMGraphicsNode or NodeGeometry':
+        """
+        Returns object holding sizes of this `Node` (`width`, `height`, `title_height`, ...). That is the Graphics
+        Node if there is one, otherwise an instance of `NodeGeometry_class`
+
+        :rtype: :class:`~nodeeditor.node_graphics_node.QDMGraphicsNode` or :class:`NodeGeometry`
+        """
+        if self.grNode is not None: return self.grNode
+        if self._geometry is None: self._geometry = self.__class__.NodeGeometry_class()
+        return self._geometry
+
+    def attachGraphics(self):
+        """
+        Create Graphics Node, Content Widget and Graphics Sockets for `Node` created in a headless
+        :class:`~nodeeditor.node_scene.Scene`. Stored position, tooltip and `content_state` are handed over
+        to them. Called from :py:meth:`~nodeeditor.node_scene.Scene.attachGraphics`
+        """
+        if self.grNode is not None: return
+
+        self.initInnerClasses()
+        if self.grNode is None: return
+
+        self.grNode.setPos(self._pos_x, self._pos_y)
+        self.grNode.setToolTip(self._tooltip)
+        self.scene.grScene.addItem(self.grNode)
+
+        if isinstance(self.content, Serializable) and self.content_state:
+            self.content.deserialize(self.content_state, {})
+
+        for socket in (self.inputs + self.outputs):
+            socket.attachGraphics()
 
     def initInnerClasses(self):
         """Sets up graphics Node (PyQt) and Content Widget"""
@@ -150,7 +250,8 @@ class Node(Serializable):
             if hasattr(self, 'inputs') and hasattr(self, 'outputs'):
                 # remove grSockets from scene
                 for socket in (self.inputs+self.outputs):
-                    self.scene.grScene.removeItem(socket.grSocket)
+                    if socket.grSocket is not None: self.scene.grScene.removeItem(socket.grSocket)
+                    self.scene.removeSocket(socket)
                 self.inputs = []
                 self.outputs = []
 
@@ -175,6 +276,9 @@ class Node(Serializable):
             counter += 1
             self.outputs.append(socket)
 
+        # sockets are part of the node's rectangle
+        self.scene.spatial_index.updateNode(self)
+
 
     def onEdgeConnectionChanged(self, new_edge:'Edge'):
         """
@@ -195,6 +299,19 @@ class Node(Serializable):
         self.markDirty()
         self.markDescendantsDirty()
 
+    def onContentChanged(self):
+        """Event handling that content of this `Node` has changed (e.g. a value typed into it). Memoized results of
+        this `Node` are dropped, the compiled graph too when the content is part of :py:meth:`compileExpression`
+        (``compile_argument`` is ``False``) and so is the snapshot of the
+        :class:`~nodeeditor.node_background_evaluator.BackgroundEvaluator` when the content is not sent as argument
+        value. Then it is handled as a changed input by :py:meth:`onInputChanged`"""
+        if self.scene.memo_cache is not None: self.scene.memo_cache.invalidateNode(self.id)
+        if not self.compile_argument: self.scene.compiler.invalidate()
+        if self.scene.background_evaluator is not None and not (self.compile_argument and self.supportsArgumentValue()):
+            # the worker thread gets only argument values, other content needs new snapshot
+            self.scene.background_evaluator.invalidateSnapshot()
+        self.onInputChanged(None)
+
     def onDeserialized(self, data: dict):
         """Event manually called when this node was deserialized. Currently called when node is deserialized from scene
         Passing `data` containing the data which have been deserialized """
@@ -210,11 +327,11 @@ class Node(Serializable):
         :param new_state: ``True`` if you want to select the `Node`. ``False`` if you want to deselect the `Node`
         :type new_state: ``bool``
         """
-        self.grNode.doSelect(new_state)
+        if self.grNode is not None: self.grNode.doSelect(new_state)
 
     def isSelected(self):
         """Returns ``True`` if current `Node` is selected"""
-        return self.grNode.isSelected()
+        return self.grNode is not None and self.grNode.isSelected()
 
     def getSocketPosition(self, index:int, position:int, num_out_of:int=1) -> '(x, y)':
         """
@@ -230,15 +347,16 @@ class Node(Serializable):
         :return: Position of described Socket on the `Node`
         :rtype: ``x, y``
         """
-        x = self.socket_offsets[position] if (position in (LEFT_TOP, LEFT_CENTER, LEFT_BOTTOM)) else self.grNode.width + self.socket_offsets[position]
+        geometry = self.getGeometry()
+        x = self.socket_offsets[position] if (position in (LEFT_TOP, LEFT_CENTER, LEFT_BOTTOM)) else geometry.width + self.socket_offsets[position]
 
         if position in (LEFT_BOTTOM, RIGHT_BOTTOM):
             # start from bottom
-            y = self.grNode.height - self.grNode.edge_roundness - self.grNode.title_vertical_padding - index * self.socket_spacing
+            y = geometry.height - geometry.edge_roundness - geometry.title_vertical_padding - index * self.socket_spacing
         elif position in (LEFT_CENTER, RIGHT_CENTER):
             num_sockets = num_out_of
-            node_height = self.grNode.height
-            top_offset = self.grNode.title_height + 2 * self.grNode.title_vertical_padding + self.grNode.edge_padding
+            node_height = geometry.height
+            top_offset = geometry.title_height + 2 * geometry.title_vertical_padding + geometry.edge_padding
             available_height = node_height - top_offset
 
             total_height_of_all_sockets = num_sockets * self.socket_spacing
@@ -251,7 +369,7 @@ class Node(Serializable):
 
         elif position in (LEFT_TOP, RIGHT_TOP):
             # start from top
-            y = self.grNode.title_height + self.grNode.title_vertical_padding + self.grNode.edge_roundness + index * self.socket_spacing
+            y = geometry.title_height + geometry.title_vertical_padding + geometry.edge_roundness + index * self.socket_spacing
         else:
             # this should never happen
             y = 0
@@ -265,12 +383,33 @@ class Node(Serializable):
         :param socket: `Socket` which position we want to know
         :return: (x, y) Socket's scene position
         """
-        nodepos = self.grNode.pos()
+        nodepos = self.pos
         socketpos = self.getSocketPosition(socket.index, socket.position, socket.count_on_this_node_side)
         return (nodepos.x() + socketpos[0], nodepos.y() + socketpos[1])
 
+    def getBoundingRect(self) -> tuple:
+        """
+        Get rectangle of this `Node` including its `Sockets` in the `Scene`. It is computed from the model, so it
+        works without `Graphics Node` as well
+
+        :return: ``(x1, y1, x2, y2)`` rectangle
+        :rtype: ``tuple``
+        """
+        geometry = self.getGeometry()
+        x1, y1, x2, y2 = 0.0, 0.0, float(geometry.width), float(geometry.height)
+        for socket in self.inputs + self.outputs:
+            x, y = self.getSocketPosition(socket.index, socket.position, socket.count_on_this_node_side)
+            if x < x1: x1 = x
+            if x > x2: x2 = x
+            if y < y1: y1 = y
+            if y > y2: y2 = y
+
+        pos = self.pos
+        return (pos.x() + x1, pos.y() + y1, pos.x() + x2, pos.y() + y2)
+
     def updateConnectedEdges(self):
         """Recalculate (Refresh) positions of all connected `Edges`. Used for updating Graphics Edges"""
+        self.scene.spatial_index.updateNode(self, with_edges=False)
         for socket in self.inputs + self.outputs:
             # if socket.hasEdge():
             for edge in socket.edges:
@@ -284,11 +423,14 @@ class Node(Serializable):
         if DEBUG: print(" - remove all edges from sockets")
         for socket in (self.inputs+self.outputs):
             # if socket.hasEdge():
-            for edge in socket.edges:
+            for edge in socket.edges.copy():
                 if DEBUG: print("    - removing from socket:", socket, "edge:", edge)
                 edge.remove()
+        if DEBUG: print(" - remove sockets from the scene")
+        for socket in (self.inputs+self.outputs):
+            self.scene.removeSocket(socket)
         if DEBUG: print(" - remove grNode")
-        self.scene.grScene.removeItem(self.grNode)
+        if self.grNode is not None: self.scene.grScene.removeItem(self.grNode)
         self.grNode = None
         if DEBUG: print(" - remove node from the scene")
         self.scene.removeNode(self)
@@ -311,6 +453,7 @@ class Node(Serializable):
         :param new_value: ``True`` if this `Node` should be `Dirty`. ``False`` if you want to un-dirty this `Node`
         :type new_value: ``bool``
         """
+        if self.scene.evaluator.deferFromWorker(self.markDirty, new_value): return
         self._is_dirty = new_value
         if self._is_dirty: self.onMarkedDirty()
 
@@ -333,9 +476,9 @@ class Node(Serializable):
         :param new_value: ``True`` if children and descendants should be `Dirty`. ``False`` if you want to un-dirty children and descendants
         :type new_value: ``bool``
         """
-        for other_node in self.getChildrenNodes():
+        if self.scene.evaluator.deferFromWorker(self.markDescendantsDirty, new_value): return
+        for other_node in self._collectDescendants('dirty', new_value):
             other_node.markDirty(new_value)
-            other_node.markChildrenDirty(new_value)
 
     def isInvalid(self) -> bool:
         """Is this node marked as `Invalid`?
@@ -351,8 +494,11 @@ class Node(Serializable):
         :param new_value: ``True`` if this `Node` should be `Invalid`. ``False`` if you want to make this `Node` valid
         :type new_value: ``bool``
         """
+        if self.scene.evaluator.deferFromWorker(self.markInvalid, new_value): return
         self._is_invalid = new_value
-        if self._is_invalid: self.onMarkedInvalid()
+        if self._is_invalid:
+            if self.scene.evaluation_stats.enabled: self.scene.evaluation_stats.recordInvalidation(self)
+            self.onMarkedInvalid()
 
     def onMarkedInvalid(self):
         """Called when this `Node` has been marked as `Invalid`. This method is supposed to be overriden"""
@@ -373,9 +519,76 @@ class Node(Serializable):
         :param new_value: ``True`` if children and descendants should be `Invalid`. ``False`` if you want to make children and descendants valid
         :type new_value: ``bool``
         """
-        for other_node in self.getChildrenNodes():
+        if self.scene.evaluator.deferFromWorker(self.markDescendantsInvalid, new_value): return
+        for other_node in self._collectDescendants('invalid', new_value):
             other_node.markInvalid(new_value)
-            other_node.markChildrenInvalid(new_value)
+
+    def _collectDescendants(self, kind:str, new_value:bool) -> 'List[Node]':
+        """
+        Breadth-first search of descendants which should get the mark `kind` with `new_value`. Every reached
+        `Node` is stamped with the current mark generation and skipped when it is reached again. The generation is
+        shared by the whole evaluation pass, so when a descendant got the same mark earlier in the pass, its
+        subgraph is not walked again. This keeps the propagation linear in the size of the affected subgraph
+
+        :param kind: ``'dirty'`` or ``'invalid'``
+        :type kind: ``str``
+        :param new_value: value of the mark to propagate
+        :type new_value: ``bool``
+        :return: descendants to be marked, each one only once
+        :rtype: List[:class:`~nodeeditor.node_node.Node`]
+        """
+        generation = self.scene.evaluator.getMarkGeneration()
+        stamp = (kind, new_value)
+        found = []
+        queue = deque(self.getChildrenNodes())
+        while queue:
+            node = queue.popleft()
+            if node is self or node._mark_stamps.get(stamp) == generation: continue
+            node._mark_stamps[stamp] = generation
+            found.append(node)
+            queue.extend(node.getChildrenNodes())
+        return found
+
+    def isBusy(self) -> bool:
+        """Is this `Node` waiting for results of evaluation running in background?
+
+        :return: ``True`` if `Node` is marked as `Busy`
+        :rtype: ``bool``
+        """
+        return self._is_busy
+
+    def markBusy(self, new_value:bool=True):
+        """Mark this `Node` as `Busy`. Set by :class:`~nodeeditor.node_background_evaluator.BackgroundEvaluator`
+        while the `Node` is being evaluated in the worker thread
+
+        :param new_value: ``True`` if this `Node` should be `Busy`
+        :type new_value: ``bool``
+        """
+        self._is_busy = new_value
+        if self.grNode is not None: self.grNode.update()
+
+    def getEvaluationState(self) -> dict:
+        """
+        Returns the state produced by evaluation of this `Node`. Used for moving results between the `Scene` and
+        its snapshot evaluated by :class:`~nodeeditor.node_background_evaluator.BackgroundEvaluator`. Override it
+        together with :py:meth:`setEvaluationState` when your `Node` keeps computed values
+
+        :return: ``dict`` with ``'dirty'``, ``'invalid'`` and ``'tooltip'``
+        :rtype: ``dict``
+        """
+        return {'dirty': self._is_dirty, 'invalid': self._is_invalid, 'tooltip': self._tooltip}
+
+    def setEvaluationState(self, state:dict):
+        """
+        Restore state returned by :py:meth:`getEvaluationState`
+
+        :param state: evaluation state
+        :type state: ``dict``
+        """
+        self._is_dirty = state['dirty']
+        self._is_invalid = state['invalid']
+        self.setToolTip(state['tooltip'])
+        if self.grNode is not None: self.grNode.update()
 
     def eval(self, index=0):
         """Evaluate this `Node`. This is supposed to be overriden. See :ref:`evaluation` for more"""
@@ -383,10 +596,129 @@ class Node(Serializable):
         self.markInvalid(False)
         return 0
 
+    async def evalAsync(self):
+        """Evaluate this `Node` in :class:`~nodeeditor.node_scene_async_evaluator.SceneAsyncEvaluator`. Override it
+        for `Nodes` which await something. The default implementation just calls :py:meth:`eval`"""
+        return self.eval()
+
+    def supportsBatch(self) -> bool:
+        """Can this `Node` be evaluated by :py:meth:`evalBatch`? Override it together with :py:meth:`evalBatch`
+
+        :rtype: ``bool``
+        """
+        return False
+
+    def evalBatch(self, input_values:list, fed_value, size:int):
+        """
+        Evaluate this `Node` for a whole batch of values at once, e.g. with NumPy arrays. Used by
+        :py:meth:`~nodeeditor.node_scene.Scene.evaluateBatch` for `Nodes` whose :py:meth:`supportsBatch` returns
+        ``True``. This is supposed to be overriden
+
+        :param input_values: batch value of the `Node` connected to each input `Socket`, ``None`` when not connected
+            or invalid
+        :type input_values: ``list``
+        :param fed_value: batch value fed into this `Node` or ``None``
+        :param size: number of items in the batch
+        :type size: ``int``
+        :return: batch value of this `Node` or ``None`` when it is invalid
+        """
+        return None
+
+    def compileExpression(self, input_names:list, argument:str=None) -> str:
+        """
+        Returns Python expression computing value of this `Node` for
+        :class:`~nodeeditor.node_scene_compiler.SceneCompiler`. This is supposed to be overriden
+
+        :param input_names: names of variables holding values of the `Nodes` connected to the inputs. ``None`` for
+            inputs which are not connected
+        :type input_names: ``list``
+        :param argument: name of the function argument holding :py:meth:`getCompileArgumentValue` when
+            ``compile_argument`` is ``True``
+        :type argument: ``str``
+        :return: the expression or ``None`` when this `Node` can't be compiled
+        :rtype: ``str``
+        """
+        return None
+
+    def getCompileArgumentValue(self):
+        """Returns value passed into the compiled function for `Nodes` with ``compile_argument = True``"""
+        return None
+
+    def supportsArgumentValue(self) -> bool:
+        """Can the value of this `Node` be set by :py:meth:`setArgumentValue`? Override it together with
+        :py:meth:`setArgumentValue`
+
+        :rtype: ``bool``
+        """
+        return False
+
+    def setArgumentValue(self, value):
+        """
+        Set value of `Nodes` with ``compile_argument = True`` (e.g. inputs) from outside, used by
+        :mod:`nodeeditor.batch` when the graph can't be compiled. Called only when :py:meth:`supportsArgumentValue`
+        returns ``True``. This is supposed to be overriden. It must not evaluate anything, the caller evaluates
+        after all values are set. When the value changes, this `Node` and its descendants are marked `Dirty`
+
+        :param value: new value, as read from the parameter file
+        """
+        pass
+
+    def setCompiledResult(self, value):
+        """
+        Called with the value computed for this `Node` by the compiled function. Override it to store the value
+
+        :param value: computed value
+        """
+        self.markDirty(False)
+        self.markInvalid(False)
+
+    def getMemoKey(self, input_values:tuple) -> tuple:
+        """
+        Returns key identifying the computation of this `Node` with `input_values` in the
+        :class:`~nodeeditor.node_memo_cache.MemoCache`. Types of the values are part of the key, so e.g. ``1`` and
+        ``1.0`` don't share the result
+
+        :param input_values: values the result is computed from
+        :type input_values: ``tuple``
+        :rtype: ``tuple``
+        """
+        return (self.id, self.__class__.__name__, input_values, tuple(type(value) for value in input_values))
+
+    def evalMemoized(self, function:'function', *input_values):
+        """
+        Returns ``function(*input_values)``. When this `Node` has ``memoize`` set and the `Scene` has a
+        :class:`~nodeeditor.node_memo_cache.MemoCache`, the result is looked up in the cache first and stored there
+        after computing. Unhashable input values are not cached
+
+        :param function: the computation, e.g. expensive kernel of this `Node`
+        :type function: ``function``
+        :param input_values: values passed to the `function`
+        :return: result of the `function`
+        """
+        cache = self.scene.memo_cache
+        if cache is None or not self.memoize: return function(*input_values)
+
+        key = self.getMemoKey(input_values)
+        try:
+            hash(key)
+        except TypeError:
+            return function(*input_values)
+
+        found, value = cache.lookup(key)
+        if found: return value
+        value = function(*input_values)
+        cache.store(key, value, self.id)
+        return value
+
     def evalChildren(self):
-        """Evaluate all children of this `Node`"""
-        for node in self.getChildrenNodes():
-            node.eval()
+        """Evaluate all children of this `Node`. They are evaluated by the `Scene`'s
+        :class:`~nodeeditor.node_scene_evaluator.SceneEvaluator` in topological order, so each descendant is
+        evaluated only once, even when it is reachable by more paths"""
+        if self.scene.evaluator.deferFromWorker(self.evalChildren): return
+        if self.scene.async_evaluator.isEvaluating() and not self.scene.evaluator.isEvaluating():
+            self.scene.async_evaluator.evalChildren(self)
+            return
+        self.scene.evaluator.evalChildren(self)
 
 
     # traversing nodes functions
@@ -504,12 +836,13 @@ class Node(Serializable):
         inputs, outputs = [], []
         for socket in self.inputs: inputs.append(socket.serialize())
         for socket in self.outputs: outputs.append(socket.serialize())
-        ser_content = self.content.serialize() if isinstance(self.content, Serializable) else {}
+        ser_content = self.content.serialize() if isinstance(self.content, Serializable) else OrderedDict(self.content_state)
+        pos = self.grNode.scenePos() if self.grNode is not None else self.pos
         return OrderedDict([
             ('id', self.id),
             ('title', self.title),
-            ('pos_x', self.grNode.scenePos().x()),
-            ('pos_y', self.grNode.scenePos().y()),
+            ('pos_x', pos.x()),
+            ('pos_y', pos.y()),
             ('inputs', inputs),
             ('outputs', outputs),
             ('content', ser_content),
@@ -517,7 +850,7 @@ class Node(Serializable):
 
     def deserialize(self, data:dict, hashmap:dict={}, restore_id:bool=True) -> bool:
         try:
-            if restore_id: self.id = data['id']
+            if restore_id: self.scene.changeNodeID(self, data['id'])
             hashmap[data['id']] = self
 
             self.setPos(data['pos_x'], data['pos_y'])
@@ -576,7 +909,12 @@ class Node(Serializable):
 
         # also deseralize the content of the node
         # so far the rest was ok, now as last step the content...
-        if isinstance(self.content, Serializable):
+        if self.scene.memo_cache is not None: self.scene.memo_cache.invalidateNode(self.id)
+        if self.scene.background_evaluator is not None: self.scene.background_evaluator.invalidateSnapshot()
+        if self.content is None:
+            # no content widget (headless), keep the content as plain data
+            self.content_state = OrderedDict(data['content'])
+        elif isinstance(self.content, Serializable):
             res = self.content.deserialize(data['content'], hashmap)
             return res
 
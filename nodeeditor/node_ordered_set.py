@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the insertion-ordered set used for storing `Nodes` and `Edges` in the `Scene`
+"""
+from itertools import islice
+
+
+class OrderedSet:
+    """
+    Insertion-ordered container with O(1) membership test, append and removal.
+
+    It iterates in the order in which the items were added and behaves like a ``list`` for the usual
+    read operations (``len``, ``in``, indexing, slicing, ``copy``, comparison with a ``list``), so the code
+    written against ``Scene.nodes`` and ``Scene.edges`` being lists keeps working. Each item can be
+    contained only once. Indexing other than the first or the last item is O(n).
+    """
+    __slots__ = ('_items',)
+
+    def __init__(self, iterable:'Iterable'=()):
+        """
+        :param iterable: initial items
+        :type iterable: ``Iterable``
+        """
+        self._items = dict.fromkeys(iterable)
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return bool(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __reversed__(self):
+        return reversed(self._items)
+
+    def __contains__(self, item):
+        return item in self._items
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._items)[index]
+
+        length = len(self._items)
+        if index < 0: index += length
+        if index < 0 or index >= length:
+            raise IndexError("%s index out of range" % self.__class__.__name__)
+
+        if index == length - 1: return next(reversed(self._items))
+        return next(islice(self._items, index, None))
+
+    def __eq__(self, other):
+        if isinstance(other, OrderedSet): return list(self._items) == list(other._items)
+        if isinstance(other, list): return list(self._items) == other
+        return NotImplemented
+
+    def __add__(self, other):
+        return list(self._items) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self._items)
+
+    def append(self, item):
+        """Add `item` at the end. Adding an item which is already contained keeps its original position
+
+        :param item: item to be added
+        """
+        self._items[item] = None
+
+    add = append
+
+    def extend(self, iterable:'Iterable'):
+        """Add all items from `iterable` at the end
+
+        :param iterable: items to be added
+        :type iterable: ``Iterable``
+        """
+        for item in iterable: self._items[item] = None
+
+    def remove(self, item):
+        """Remove `item`
+
+        :param item: item to be removed
+        :raises: ``ValueError`` if the `item` is not contained, same as ``list.remove``
+        """
+        try:
+            del self._items[item]
+        except KeyError:
+            raise ValueError("%s.remove(x): x not in %s" % (self.__class__.__name__, self.__class__.__name__))
+
+    def discard(self, item):
+        """Remove `item` if it is contained
+
+        :param item: item to be removed
+        """
+        self._items.pop(item, None)
+
+    def pop(self, index:int=-1):
+        """Remove and return item at `index` (default last)
+
+        :param index: index of the item
+        :type index: ``int``
+        :return: removed item
+        """
+        if not self._items: raise IndexError("pop from empty %s" % self.__class__.__name__)
+        if index == -1: return self._items.popitem()[0]
+        item = self[index]
+        del self._items[item]
+        return item
+
+    def index(self, item) -> int:
+        """Return position of `item`. This is O(n)
+
+        :param item: item to look for
+        :return: position of the `item`
+        :rtype: ``int``
+        :raises: ``ValueError`` if the `item` is not contained
+        """
+        if item in self._items:
+            for ix, other in enumerate(self._items):
+                if other is item or other == item: return ix
+        raise ValueError("%r is not in %s" % (item, self.__class__.__name__))
+
+    def count(self, item) -> int:
+        """Return number of occurrences of `item` (``0`` or ``1``)"""
+        return 1 if item in self._items else 0
+
+    def clear(self):
+        """Remove all items"""
+        self._items.clear()
+
+    def copy(self) -> 'OrderedSet':
+        """Return shallow copy of this container"""
+        return self.__class__(self._items)
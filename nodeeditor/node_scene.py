@@ -4,13 +4,32 @@ A module containing the representation of Scene
 """
 import os
 import json
+import mmap
 from collections import OrderedDict
-from nodeeditor.node_edge import Edge
+from contextlib import contextmanager
+from PySide6.QtWidgets import QGraphicsScene
+from nodeeditor.node_edge import Edge, EDGE_TYPE_DIRECT
 from nodeeditor.node_node import Node
+from nodeeditor.node_ordered_set import OrderedSet
+from nodeeditor.node_scene_async_evaluator import SceneAsyncEvaluator
 from nodeeditor.node_scene_clipboard import SceneClipboard
+from nodeeditor.node_scene_compiler import SceneCompiler
+from nodeeditor.node_scene_evaluation_queue import SceneEvaluationQueue
+from nodeeditor.node_scene_evaluation_stats import SceneEvaluationStats
+from nodeeditor.node_scene_evaluator import SceneEvaluator
+from nodeeditor.node_scene_topology import SceneTopology
 from nodeeditor.node_serializable import Serializable
 from nodeeditor.node_graphics_scene import QDMGraphicsScene
+from nodeeditor.node_binary_format import BinarySceneReader, InvalidBinaryFile, isBinarySceneFilename, \
+    writeBinaryScene
+from nodeeditor.node_compression import DECOMPRESSION_ERRORS, MAGIC_LENGTH, detectCompression, \
+    getCompressionFromFilename, openCompressed
+from nodeeditor.node_json_backend import getJsonBackend
+from nodeeditor.node_json_reader import JsonStreamReader, JsonStreamObject
+from nodeeditor.node_json_writer import dumpJson
 from nodeeditor.node_scene_history import SceneHistory
+from nodeeditor.node_scene_notifier import SceneNotifier
+from nodeeditor.node_scene_spatial_index import SceneSpatialIndex
 from nodeeditor.utils import dumpException
 from nodeeditor.utils import pp
 
@@ -21,21 +40,40 @@ class InvalidFile(Exception): pass
 
 class Scene(Serializable):
     """Class representing NodeEditor's `Scene`"""
-    def __init__(self):
+    def __init__(self, headless:bool=False):
         """
+                :param headless: if ``True`` the `Scene` is created without ``QGraphicsScene`` and all `Nodes`, `Sockets`
+                    and `Edges` in it are pure data objects. See :py:meth:`attachGraphics`
+                :type headless: ``bool``
+
                 :Instance Attributes:
 
-                    - **nodes** - list of `Nodes` in this `Scene`
-                    - **edges** - list of `Edges` in this `Scene`
+                    - **nodes** - :class:`~nodeeditor.node_ordered_set.OrderedSet` of `Nodes` in this `Scene`
+                    - **edges** - :class:`~nodeeditor.node_ordered_set.OrderedSet` of `Edges` in this `Scene`
                     - **history** - Instance of :class:`~nodeeditor.node_scene_history.SceneHistory`
                     - **clipboard** - Instance of :class:`~nodeeditor.node_scene_clipboard.SceneClipboard`
+                    - **grScene** - Instance of :class:`~nodeeditor.node_graphics_scene.QDMGraphicsScene` or ``None`` if headless
+                    - **topology** - Instance of :class:`~nodeeditor.node_scene_topology.SceneTopology`
+                    - **async_evaluator** - Instance of :class:`~nodeeditor.node_scene_async_evaluator.SceneAsyncEvaluator`
+                    - **compiler** - Instance of :class:`~nodeeditor.node_scene_compiler.SceneCompiler`
+                    - **evaluation_queue** - Instance of :class:`~nodeeditor.node_scene_evaluation_queue.SceneEvaluationQueue`
+                    - **evaluation_stats** - Instance of :class:`~nodeeditor.node_scene_evaluation_stats.SceneEvaluationStats`
+                    - **memo_cache** - :class:`~nodeeditor.node_memo_cache.MemoCache` of `Node` results or ``None``.
+                      See :py:meth:`setMemoCache`
+                    - **background_evaluator** - :class:`~nodeeditor.node_background_evaluator.BackgroundEvaluator`
+                      used by `Nodes` which support evaluation in background or ``None``
                     - **scene_width** - width of this `Scene` in pixels
                     - **scene_height** - height of this `Scene` in pixels
                 """
 
         super().__init__()
-        self.nodes = []
-        self.edges = []
+        self.nodes = OrderedSet()
+        self.edges = OrderedSet()
+
+        # id -> object indexes, kept in sync by add*/remove* methods and by deserialization
+        self._nodes_by_id = {}
+        self._edges_by_id = {}
+        self._sockets_by_id = {}
 
         self.scene_width = 64000
         self.scene_height = 64000
@@ -43,6 +81,9 @@ class Scene(Serializable):
         # custom flag used to suppress triggering onItemSelected which does a bunch of stuff
         self._silent_selection_events = False
 
+        # when > 0, new Nodes and Edges don't create their graphics items. See addNodesBulk
+        self._graphics_deferred = 0
+
         self._has_been_modified = False
         self._last_selected_items = None
 
@@ -54,13 +95,21 @@ class Scene(Serializable):
         # here we can store a callback for retrieving the class for Nodes
         self.node_class_selector = None
 
-        self.initUI()
+        self.notifier = SceneNotifier(self)
+        self.spatial_index = SceneSpatialIndex(self)
+        self.topology = SceneTopology(self)
+        self.evaluator = SceneEvaluator(self)
+        self.async_evaluator = SceneAsyncEvaluator(self)
+        self.compiler = SceneCompiler(self)
+        self.evaluation_queue = SceneEvaluationQueue(self)
+        self.evaluation_stats = SceneEvaluationStats(self)
+        self.memo_cache = None
+        self.background_evaluator = None
+        self.grScene = None
+        if not headless: self.initUI()
         self.history = SceneHistory(self)
         self.clipboard = SceneClipboard(self)
 
-        self.grScene.itemSelected.connect(self.onItemSelected)
-        self.grScene.itemsDeselected.connect(self.onItemsDeselected)
-
     @property
     def has_been_modified(self):
         """
@@ -78,8 +127,8 @@ class Scene(Serializable):
             # set it now, because we will be reading it soon
             self._has_been_modified = value
 
-            # call all registered listeners
-            for callback in self._has_been_modified_listeners: callback()
+            # call all registered listeners (postponed till the end of a batch)
+            self.notifier.notifyHasBeenModified()
 
         self._has_been_modified = value
 
@@ -88,6 +137,108 @@ class Scene(Serializable):
         self.grScene = QDMGraphicsScene(self)
         self.grScene.setGrScene(self.scene_width, self.scene_height)
 
+        self.grScene.itemSelected.connect(self.onItemSelected)
+        self.grScene.itemsDeselected.connect(self.onItemsDeselected)
+
+    def isHeadless(self) -> bool:
+        """Is this `Scene` running without graphics layer (no ``QGraphicsScene``, no ``QWidgets``)?
+
+        :return: ``True`` if there is no graphics layer attached
+        :rtype: ``bool``
+        """
+        return self.grScene is None
+
+    def attachGraphics(self):
+        """
+        Attach graphics layer to a headless `Scene`. Creates ``QGraphicsScene`` and graphics representations for all
+        `Nodes`, `Sockets` and `Edges` already present in the `Scene`. Requires running ``QApplication``
+        """
+        if not self.isHeadless(): return
+
+        self.initUI()
+        self.attachGraphicsBulk(self.nodes, self.edges)
+
+    def isGraphicsDeferred(self) -> bool:
+        """Should newly created `Nodes`, `Sockets` and `Edges` skip creating their graphics items? This is
+        ``True`` for headless `Scene` and during bulk construction. See :py:meth:`addNodesBulk`
+
+        :rtype: ``bool``
+        """
+        return self.grScene is None or self._graphics_deferred > 0
+
+    @contextmanager
+    def deferredGraphics(self):
+        """Context manager: `Nodes` and `Edges` created inside are pure data objects until their graphics is
+        attached by :py:meth:`attachGraphicsBulk`"""
+        self._graphics_deferred += 1
+        try:
+            yield self
+        finally:
+            self._graphics_deferred -= 1
+
+    def attachGraphicsBulk(self, nodes:'Iterable[Node]', edges:'Iterable[Edge]'):
+        """
+        Create graphics items for `nodes` (with their `Sockets`) and `edges` in one pass. The ``QGraphicsScene``
+        BSP index is switched off while the items are inserted and rebuilt once at the end
+
+        :param nodes: `Nodes` created while the graphics was deferred
+        :param edges: `Edges` created while the graphics was deferred
+        """
+        if self.isHeadless(): return
+
+        index_method = self.grScene.itemIndexMethod()
+        self.grScene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
+        try:
+            for node in nodes: node.attachGraphics()
+            for edge in edges: edge.attachGraphics()
+        finally:
+            self.grScene.setItemIndexMethod(index_method)
+
+    def addNodesBulk(self, specs:'Iterable[dict]') -> 'List[Node]':
+        """
+        Create many `Nodes` at once. Graphics items, socket positioning and BSP index insertion are deferred and
+        done in one final batched pass
+
+        :param specs: one ``dict`` per `Node`. Key ``'node_class'`` is the class to instantiate (default
+            :class:`~nodeeditor.node_node.Node`), optional ``'pos'`` is ``(x, y)`` position and all other keys
+            (i.e. ``'title'``, ``'inputs'``, ``'outputs'``) are passed to the constructor as keyword arguments
+        :type specs: ``Iterable[dict]``
+        :return: created `Nodes` in the order of `specs`
+        :rtype: List[:class:`~nodeeditor.node_node.Node`]
+        """
+        nodes = []
+        with self.deferredGraphics():
+            for spec in specs:
+                kwargs = dict(spec)
+                node_class = kwargs.pop('node_class', Node)
+                pos = kwargs.pop('pos', None)
+                node = node_class(self, **kwargs)
+                if pos is not None: node.setPos(*pos)
+                nodes.append(node)
+
+        if not self.isGraphicsDeferred(): self.attachGraphicsBulk(nodes, [])
+        return nodes
+
+    def addEdgesBulk(self, socket_pairs:'Iterable[tuple]', edge_type:int=EDGE_TYPE_DIRECT) -> 'List[Edge]':
+        """
+        Create many `Edges` at once. Graphics items and BSP index insertion are deferred and done in one final
+        batched pass. Like the `Edge` constructor this doesn't notify connected `Nodes`
+
+        :param socket_pairs: ``(start_socket, end_socket)`` pairs to connect
+        :type socket_pairs: ``Iterable[tuple]``
+        :param edge_type: edge type of all created `Edges`. See :ref:`edge-type-constants`
+        :return: created `Edges` in the order of `socket_pairs`
+        :rtype: List[:class:`~nodeeditor.node_edge.Edge`]
+        """
+        edge_class = self.getEdgeClass()
+        edges = []
+        with self.deferredGraphics():
+            for start_socket, end_socket in socket_pairs:
+                edges.append(edge_class(self, start_socket, end_socket, edge_type=edge_type))
+
+        if not self.isGraphicsDeferred(): self.attachGraphicsBulk([], edges)
+        return edges
+
     def getNodeByID(self, node_id: int):
         """
         Find node in the scene according to provided `node_id`
@@ -96,10 +247,60 @@ class Scene(Serializable):
         :type node_id: ``int``
         :return: Found ``Node`` or ``None``
         """
-        for node in self.nodes:
-            if node.id == node_id:
-                return node
-        return None
+        return self._nodes_by_id.get(node_id)
+
+    def getEdgeByID(self, edge_id: int):
+        """
+        Find edge in the scene according to provided `edge_id`
+
+        :param edge_id: ID of the edge we are looking for
+        :type edge_id: ``int``
+        :return: Found ``Edge`` or ``None``
+        """
+        return self._edges_by_id.get(edge_id)
+
+    def getSocketByID(self, socket_id: int):
+        """
+        Find socket in the scene according to provided `socket_id`
+
+        :param socket_id: ID of the socket we are looking for
+        :type socket_id: ``int``
+        :return: Found ``Socket`` or ``None``
+        """
+        return self._sockets_by_id.get(socket_id)
+
+    @contextmanager
+    def batch(self, desc:str=None, setModified:bool=True):
+        """
+        Context manager grouping many changes into one transaction. Inside the block no History Stamps are stored,
+        `Has Been Modified` listeners are postponed, `Nodes` are not notified about connection changes and
+        ``QGraphicsScene`` is not repainted. When the outermost block exits, each affected `Node` gets one
+        deduplicated notification and one History Stamp is stored.
+
+        .. code-block:: python
+
+            with scene.batch("Reconnect inputs"):
+                for edge in edges: edge.remove()
+
+        :param desc: Description of the History Stamp stored at the end. ``None`` stores no stamp.
+            Ignored for nested batches
+        :type desc: ``str``
+        :param setModified: if ``True`` the stored History Stamp marks the `Scene` with `has_been_modified`
+        :type setModified: ``bool``
+        """
+        self.notifier.collect()
+        try:
+            yield self
+        finally:
+            if self.notifier.dispatch() and desc is not None:
+                self.history.storeHistory(desc, setModified=setModified)
+
+    def isInBatch(self) -> bool:
+        """Are we inside of :py:meth:`batch`?
+
+        :rtype: ``bool``
+        """
+        return self.notifier.isCollecting()
 
     def setSilentSelectionEvents(self, value: bool = True):
         """Calling this can suppress onItemSelected events to be triggered. This is usefull when working with clipboard"""
@@ -163,6 +364,7 @@ class Scene(Serializable):
         :return: list of ``QGraphicsItems``
         :rtype: list[QGraphicsItem]
         """
+        if self.grScene is None: return []
         return self.grScene.selectedItems()
 
     def doDeselectItems(self, silent:bool=False) -> None:
@@ -223,17 +425,18 @@ class Scene(Serializable):
     def resetLastSelectedStates(self):
         """Resets internal `selected flags` in all `Nodes` and `Edges` in the `Scene`"""
         for node in self.nodes:
-            node.grNode._last_selected_state = False
+            if node.grNode is not None: node.grNode._last_selected_state = False
         for edge in self.edges:
-            edge.grEdge._last_selected_state = False
+            if edge.grEdge is not None: edge.grEdge._last_selected_state = False
 
 
     def getView(self) -> 'QGraphicsView':
         """Shortcut for returning `Scene` ``QGraphicsView``
 
-        :return: ``QGraphicsView`` attached to the `Scene`
+        :return: ``QGraphicsView`` attached to the `Scene` or ``None`` for headless `Scene`
         :rtype: ``QGraphicsView``
         """
+        if self.grScene is None: return None
         return self.grScene.views()[0]
 
     def getItemAt(self, pos:'QPointF'):
@@ -244,6 +447,7 @@ class Scene(Serializable):
         :return: Qt Graphics Item at scene position
         :rtype: ``QGraphicsItem``
         """
+        if self.grScene is None: return None
         return self.getView().itemAt(pos)
 
     def addNode(self, node:Node):
@@ -253,6 +457,8 @@ class Scene(Serializable):
         :type node: :class:`~nodeeditor.node_node.Node`
         """
         self.nodes.append(node)
+        self._nodes_by_id[node.id] = node
+        self.topology.nodeAdded(node)
 
     def addEdge(self, edge:Edge):
         """Add :class:`~nodeeditor.node_edge.Edge` to this `Scene`
@@ -261,6 +467,66 @@ class Scene(Serializable):
         :return: :class:`~nodeeditor.node_edge.Edge`
         """
         self.edges.append(edge)
+        self._edges_by_id[edge.id] = edge
+
+    def addSocket(self, socket:'Socket'):
+        """Register :class:`~nodeeditor.node_socket.Socket` in the id index of this `Scene`
+
+        :param socket: :class:`~nodeeditor.node_socket.Socket` to be registered
+        :type socket: :class:`~nodeeditor.node_socket.Socket`
+        """
+        self._sockets_by_id[socket.id] = socket
+
+    def removeSocket(self, socket:'Socket'):
+        """Unregister :class:`~nodeeditor.node_socket.Socket` from the id index of this `Scene`
+
+        :param socket: :class:`~nodeeditor.node_socket.Socket` to be unregistered
+        :type socket: :class:`~nodeeditor.node_socket.Socket`
+        """
+        self._unindex(self._sockets_by_id, socket)
+
+    def changeNodeID(self, node:Node, new_id:int):
+        """Assign new `id` to the :class:`~nodeeditor.node_node.Node` and keep the id index up to date
+
+        :param node: :class:`~nodeeditor.node_node.Node` which gets the new `id`
+        :type node: :class:`~nodeeditor.node_node.Node`
+        :param new_id: new `id` of the `Node`
+        :type new_id: ``int``
+        """
+        # memoized results are stored under the old id, nothing would find them anymore
+        if self.memo_cache is not None and node.id != new_id: self.memo_cache.invalidateNode(node.id)
+        self._reindex(self._nodes_by_id, node, new_id)
+
+    def changeEdgeID(self, edge:Edge, new_id:int):
+        """Assign new `id` to the :class:`~nodeeditor.node_edge.Edge` and keep the id index up to date
+
+        :param edge: :class:`~nodeeditor.node_edge.Edge` which gets the new `id`
+        :type edge: :class:`~nodeeditor.node_edge.Edge`
+        :param new_id: new `id` of the `Edge`
+        :type new_id: ``int``
+        """
+        self._reindex(self._edges_by_id, edge, new_id)
+
+    def changeSocketID(self, socket:'Socket', new_id:int):
+        """Assign new `id` to the :class:`~nodeeditor.node_socket.Socket` and keep the id index up to date
+
+        :param socket: :class:`~nodeeditor.node_socket.Socket` which gets the new `id`
+        :type socket: :class:`~nodeeditor.node_socket.Socket`
+        :param new_id: new `id` of the `Socket`
+        :type new_id: ``int``
+        """
+        self._reindex(self._sockets_by_id, socket, new_id)
+
+    def _unindex(self, index:dict, obj:'Serializable'):
+        """Remove `obj` from the id `index`, but only if the `index` still points to this very object"""
+        if index.get(obj.id) is obj: del index[obj.id]
+
+    def _reindex(self, index:dict, obj:'Serializable', new_id:int):
+        """Change `id` of the `obj` and move it to the new key in the id `index`"""
+        was_indexed = index.get(obj.id) is obj
+        if was_indexed: del index[obj.id]
+        obj.id = new_id
+        if was_indexed: index[new_id] = obj
 
     def removeNode(self, node:Node):
         """Remove :class:`~nodeeditor.node_node.Node` from this `Scene`
@@ -268,6 +534,10 @@ class Scene(Serializable):
         :param node: :class:`~nodeeditor.node_node.Node` to be removed from this `Scene`
         :type node: :class:`~nodeeditor.node_node.Node`
         """
+        self._unindex(self._nodes_by_id, node)
+        self.spatial_index.removeNode(node)
+        self.topology.nodeRemoved(node)
+        if self.memo_cache is not None: self.memo_cache.invalidateNode(node.id)
         if node in self.nodes: self.nodes.remove(node)
         else:
             if DEBUG_REMOVE_WARNINGS: print("!W:", "Scene::removeNode", "wanna remove nodeeditor", node,
@@ -279,58 +549,157 @@ class Scene(Serializable):
         :param edge: :class:`~nodeeditor.node_edge.Edge` to be remove from this `Scene`
         :return: :class:`~nodeeditor.node_edge.Edge`
         """
+        self._unindex(self._edges_by_id, edge)
+        self.spatial_index.removeEdge(edge)
         if edge in self.edges: self.edges.remove(edge)
         else:
             if DEBUG_REMOVE_WARNINGS: print("!W:", "Scene::removeEdge", "wanna remove edge", edge,
                                             "from self.edges but it's not in the list!")
 
+    def evaluateBatch(self, inputs:dict) -> dict:
+        """
+        Evaluate the graph for a whole batch of input values at once.
+        See :py:meth:`~nodeeditor.node_scene_evaluator.SceneEvaluator.evaluateBatch`
+
+        :param inputs: ``{node id: batch value}`` fed into the input `Nodes`
+        :type inputs: ``dict``
+        :return: ``{node id: batch value}`` of all `Nodes` without outputs
+        :rtype: ``dict``
+        """
+        return self.evaluator.evaluateBatch(inputs)
+
     def clear(self):
         """Remove all `Nodes` from this `Scene`. This causes also to remove all `Edges`"""
-        while len(self.nodes) > 0:
-            self.nodes[0].remove()
+        # remove edges first without notifications - every node they would notify is going away too
+        for edge in list(self.edges):
+            edge.remove(silent=True)
+        for node in list(self.nodes):
+            node.remove()
 
         self.has_been_modified = False
 
-    def saveToFile(self, filename:str):
+    def saveToFile(self, filename:str, compact:bool=False):
         """
-        Save this `Scene` to the file on disk.
+        Save this `Scene` to the file on disk. `Nodes` and `Edges` are serialized one by one while writing, so the
+        whole JSON document is never held in memory. Files with the ``.nsb`` extension are saved in the binary
+        format, see :mod:`~nodeeditor.node_binary_format`. JSON files ending with ``.gz`` or ``.xz`` are compressed
+        while writing, see :mod:`~nodeeditor.node_compression`
 
         :param filename: where to save this scene
         :type filename: ``str``
+        :param compact: ``True`` writes JSON without indentation and spaces, encoded by the
+            :py:func:`~nodeeditor.node_json_backend.getJsonBackend` of this process
+        :type compact: ``bool``
         """
-        with open(filename, "w") as file:
-            file.write( json.dumps( self.serialize(), indent=4 ) )
-            print("saving to", filename, "was successfull.")
+        if isBinarySceneFilename(filename):
+            with open(filename, "wb") as file:
+                writeBinaryScene(self.serialize(lazy=True), file)
+        else:
+            compression = getCompressionFromFilename(filename)
+            if compression is not None:
+                file = openCompressed(filename, compression, "wt", encoding="utf-8")
+            else:
+                file = open(filename, "w", encoding="utf-8", buffering=1 << 16)
+            with file:
+                dumpJson(self.serialize(lazy=True), file, indent=None if compact else 4, backend=getJsonBackend())
+        print("saving to", filename, "was successfull.")
 
-            self.has_been_modified = False
+        self.has_been_modified = False
 
 
-    def loadFromFile(self, filename):
+    def loadFromFile(self, filename:str, progress_callback:'function'=None):
         """
-                Load `Scene` from a file on disk
+        Load `Scene` from a file on disk. The file is parsed incrementally and `Nodes` are created while their
+        data is read, `Edges` are connected once all `Nodes` and their `Sockets` exist. Files with the ``.nsb``
+        extension are read in the binary format by :py:meth:`loadFromBinaryFile`. JSON compressed by gzip or xz is
+        recognized by its magic bytes and decompressed while parsing
 
-                :param filename: from what file to load the `Scene`
-                :type filename: ``str``
-                :raises: :class:`~nodeeditor.node_scene.InvalidFile` if there was an error decoding JSON file
-                """
-
-        with open(filename, 'r', encoding='utf-8') as file:
-            raw_data = file.read()
+        :param filename: from what file to load the `Scene`
+        :type filename: ``str``
+        :param progress_callback: called as ``progress_callback(position, size)`` with number of bytes read
+            and size of the file while loading
+        :type progress_callback: ``function``
+        :raises: :class:`~nodeeditor.node_scene.InvalidFile` if there was an error decoding JSON file
+        """
+        if isBinarySceneFilename(filename): return self.loadFromBinaryFile(filename, progress_callback)
+
+        with open(filename, 'rb') as raw_file:
+            compression = detectCompression(raw_file.read(MAGIC_LENGTH))
+            raw_file.seek(0)
+            file = raw_file
+            if compression is not None:
+                file = openCompressed(raw_file, compression)
+                if progress_callback is not None:
+                    # size of the decompressed data is unknown, report position in the compressed file
+                    callback = progress_callback
+                    progress_callback = lambda position, size: callback(raw_file.tell(), size)
             try:
-                data = json.loads(raw_data)
+                reader = JsonStreamReader(file, os.path.getsize(filename), progress_callback)
+                data = JsonStreamObject(reader, stream_keys=('nodes', 'edges'))
                 self.deserialize(data)
-
+                data.finish()
                 self.has_been_modified = False
 
-            except json.JSONDecodeError:
+            except (json.JSONDecodeError, UnicodeDecodeError):
                 raise InvalidFile("%s is not a valid JSON file" % os.path.basename(filename))
+            except DECOMPRESSION_ERRORS:
+                raise InvalidFile("%s is not a valid %s file" % (os.path.basename(filename), compression))
             except Exception as e:
                 dumpException(e)
+            finally:
+                if file is not raw_file: file.close()
+
+    def loadFromBinaryFile(self, filename:str, progress_callback:'function'=None):
+        """
+        Load `Scene` from a file in the binary format. The file is memory-mapped, so the columns are read straight
+        from the page cache
+
+        :param filename: from what file to load the `Scene`
+        :type filename: ``str``
+        :param progress_callback: called as ``progress_callback(position, size)`` when the file is loaded
+        :type progress_callback: ``function``
+        :raises: :class:`~nodeeditor.node_scene.InvalidFile` if the file is not in the binary format
+        """
+        invalid_file = InvalidFile("%s is not a valid binary scene file" % os.path.basename(filename))
+        with open(filename, 'rb') as file:
+            try:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # empty file can't be mapped
+                raise invalid_file
+            with buffer:
+                try:
+                    reader = BinarySceneReader(buffer)
+                except InvalidBinaryFile:
+                    raise invalid_file
+
+                try:
+                    with reader:
+                        self.deserialize(OrderedDict([
+                            ('id', reader.header['id']),
+                            ('nodes', reader.iterNodes()),
+                            ('edges', reader.iterEdges()),
+                        ]))
+
+                    self.has_been_modified = False
+                    if progress_callback is not None: progress_callback(len(buffer), len(buffer))
+
+                except Exception as e:
+                    dumpException(e)
 
     def getEdgeClass(self):
         """Return the class representing Edge. Override me if needed"""
         return Edge
 
+    def setMemoCache(self, memo_cache:'MemoCache'):
+        """
+        Set cache of results used by `Nodes` with ``memoize = True``. ``None`` disables memoization
+
+        :param memo_cache: cache to use or ``None``
+        :type memo_cache: :class:`~nodeeditor.node_memo_cache.MemoCache`
+        """
+        self.memo_cache = memo_cache
+
     def setNodeClassSelector(self, class_selecting_function:'functon') -> 'Node class type':
         """
         Set the function which decides what `Node` class to instantiate when deserializating `Scene`.
@@ -356,10 +725,19 @@ class Scene(Serializable):
         return Node if self.node_class_selector is None else self.node_class_selector(data)
 
 
-    def serialize(self):
-        nodes, edges = [], []
-        for node in self.nodes: nodes.append(node.serialize())
-        for edge in self.edges: edges.append(edge.serialize())
+    def serialize(self, lazy:bool=False):
+        """
+        :param lazy: ``True`` returns generators serializing `Nodes` and `Edges` on demand instead of lists,
+            see :class:`~nodeeditor.node_json_writer.JsonStreamWriter`
+        :type lazy: ``bool``
+        """
+        if lazy:
+            nodes = (node.serialize() for node in list(self.nodes))
+            edges = (edge.serialize() for edge in list(self.edges))
+        else:
+            nodes, edges = [], []
+            for node in self.nodes: nodes.append(node.serialize())
+            for edge in self.edges: edges.append(edge.serialize())
         return OrderedDict([
             ('id', self.id),
             ('scene_width', self.scene_width),
@@ -370,26 +748,48 @@ class Scene(Serializable):
 
 
     def deserialize(self, data:dict, hashmap:dict={}, restore_id:bool=True) -> bool:
+        """
+        Deserialize `Scene`. ``data['nodes']`` and ``data['edges']`` can be iterators consumed one by one, e.g.
+        from :class:`~nodeeditor.node_json_reader.JsonStreamObject` while the file is being read. `Nodes` are
+        deserialized before ``data['edges']`` is looked up
+
+        :param data: serialized `Scene` with ``id``, ``nodes`` and ``edges``
+        :param hashmap: not used, the `Scene` creates its own
+        :type hashmap: ``dict``
+        :param restore_id: ``True`` if ids should be restored from the data
+        :type restore_id: ``bool``
+        :return: ``True``
+        :rtype: ``bool``
+        """
         hashmap = {}
 
         if restore_id: self.id = data['id']
 
-        # -- deserialize NODES
+        self.deserializeNodes(data['nodes'], hashmap, restore_id)
+        self.deserializeEdges(data['edges'], hashmap, restore_id)
+        return True
 
+    def deserializeNodes(self, nodes_data:'Iterable[dict]', hashmap:dict, restore_id:bool=True):
+        """
+        Deserialize `Nodes` of this `Scene`, reusing existing `Nodes` with the same id and removing the others
+
+        :param nodes_data: serialized `Nodes`, can be an iterator consumed one by one
+        :type nodes_data: Iterable[``dict``]
+        :param hashmap: mapping of ids to deserialized objects, used by :py:meth:`deserializeEdges`
+        :type hashmap: ``dict``
+        :param restore_id: ``True`` if ids should be restored from the data
+        :type restore_id: ``bool``
+        """
         ## Instead of recreating all the nodes, reuse existing ones...
-        # get list of all current nodes:
-        all_nodes = self.nodes.copy()
+        # get id index of all current nodes:
+        all_nodes = self._nodes_by_id.copy()
 
         # go through deserialized nodes:
-        for node_data in data['nodes']:
+        for node_data in nodes_data:
             # can we find this node in the scene?
-            found = False
-            for node in all_nodes:
-                if node.id == node_data['id']:
-                    found = node
-                    break
+            found = all_nodes.pop(node_data['id'], None)
 
-            if not found:
+            if found is None:
                 new_node = self.getNodeClassFromData(node_data)(self)
                 new_node.deserialize(node_data, hashmap, restore_id)
                 new_node.onDeserialized(node_data)
@@ -397,44 +797,43 @@ class Scene(Serializable):
             else:
                 found.deserialize(node_data, hashmap, restore_id)
                 found.onDeserialized(node_data)
-                all_nodes.remove(found)
                 # print("Reused", node_data['title'])
 
         # remove nodes which are left in the scene and were NOT in the serialized data!
         # that means they were not in the graph before...
-        while all_nodes != []:
-            node = all_nodes.pop()
+        while all_nodes:
+            node_id, node = all_nodes.popitem()
             node.remove()
 
+    def deserializeEdges(self, edges_data:'Iterable[dict]', hashmap:dict, restore_id:bool=True):
+        """
+        Deserialize `Edges` of this `Scene`, reusing existing `Edges` with the same id and removing the others.
+        `Sockets` of the `Edges` have to be in the `hashmap` already
 
-        # -- deserialize EDGES
-
-
+        :param edges_data: serialized `Edges`, can be an iterator consumed one by one
+        :type edges_data: Iterable[``dict``]
+        :param hashmap: mapping of ids to deserialized objects filled by :py:meth:`deserializeNodes`
+        :type hashmap: ``dict``
+        :param restore_id: ``True`` if ids should be restored from the data
+        :type restore_id: ``bool``
+        """
         ## Instead of recreating all the edges, reuse existing ones...
-        # get list of all current edges:
-        all_edges = self.edges.copy()
+        # get id index of all current edges:
+        all_edges = self._edges_by_id.copy()
 
         # go through deserialized edges:
-        for edge_data in data['edges']:
-            # can we find this node in the scene?
-            found = False
-            for edge in all_edges:
-                if edge.id == edge_data['id']:
-                    found = edge
-                    break
+        for edge_data in edges_data:
+            # can we find this edge in the scene?
+            found = all_edges.pop(edge_data['id'], None)
 
-            if not found:
+            if found is None:
                 new_edge = Edge(self).deserialize(edge_data, hashmap, restore_id)
                 # print("New edge for", edge_data)
             else:
                 found.deserialize(edge_data, hashmap, restore_id)
-                all_edges.remove(found)
 
-        # remove nodes which are left in the scene and were NOT in the serialized data!
+        # remove edges which are left in the scene and were NOT in the serialized data!
         # that means they were not in the graph before...
-        while all_edges != []:
-            edge = all_edges.pop()
+        while all_edges:
+            edge_id, edge = all_edges.popitem()
             edge.remove()
-
-
-        return True
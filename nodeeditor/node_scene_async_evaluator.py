@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the Async Evaluator which evaluates `Nodes` of a `Scene` as asyncio tasks
+"""
+import asyncio
+import time
+
+from nodeeditor.utils import dumpException
+
+DEBUG = False
+
+
+class SceneAsyncEvaluator():
+    """
+    Class evaluating `Nodes` of the :class:`~nodeeditor.node_scene.Scene` as asyncio tasks.
+
+    Each `Node` is evaluated by awaiting :py:meth:`~nodeeditor.node_node.Node.evalAsync`, after the tasks of all its
+    `Dirty` or `Invalid` input `Nodes` finished. Independent branches of the graph are awaited concurrently, so
+    `Nodes` waiting for I/O don't block each other nor the UI when the asyncio loop is integrated with the Qt event
+    loop (``PySide6.QtAsyncio``). At most :py:attr:`max_concurrency` `Nodes` of one `Scene` are being evaluated at
+    the same time. :py:meth:`~nodeeditor.node_node.Node.evalChildren` called during the pass adds the children to it
+    as new tasks.
+
+    Time budgets of the :class:`~nodeeditor.node_scene_evaluator.SceneEvaluator` (``timeout``, ``node_timeout``
+    and the `Node`'s ``eval_timeout``) apply here too. Awaiting `Nodes` are really cancelled when they run out of
+    time, they are marked `Invalid` with a tooltip and their descendants are skipped.
+    """
+    def __init__(self, scene:'Scene'):
+        """
+        :param scene: Reference to the :class:`~nodeeditor.node_scene.Scene`
+        :type scene: :class:`~nodeeditor.node_scene.Scene`
+
+        :Instance Attributes:
+
+        - **scene** - reference to the :class:`~nodeeditor.node_scene.Scene`
+        - **max_concurrency** - maximum number of `Nodes` of this `Scene` being evaluated at the same time
+        - **loop** - asyncio event loop used by :py:meth:`requestEvaluation` when called outside of a coroutine
+        """
+        self.scene = scene
+        self.max_concurrency = 16
+        self.loop = None
+
+        # state of the running evaluation pass
+        self._tasks = None
+        self._semaphore = None
+        self._skipped = None
+        self._timeout = None
+
+    def setMaxConcurrency(self, max_concurrency:int):
+        """
+        Set maximum number of `Nodes` of this `Scene` being evaluated at the same time. Applies from the next pass
+
+        :param max_concurrency: number of concurrently evaluated `Nodes`
+        :type max_concurrency: ``int``
+        """
+        self.max_concurrency = max(1, int(max_concurrency))
+
+    def setEventLoop(self, loop:'asyncio.AbstractEventLoop'):
+        """
+        Set asyncio loop used by :py:meth:`requestEvaluation` when it is called outside of a running coroutine,
+        e.g. from a Qt slot
+
+        :param loop: asyncio event loop
+        :type loop: ``asyncio.AbstractEventLoop``
+        """
+        self.loop = loop
+
+    def getEventLoop(self) -> 'asyncio.AbstractEventLoop':
+        """Returns running asyncio loop, or the loop set by :py:meth:`setEventLoop` if it runs, or ``None``"""
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        if self.loop is not None and self.loop.is_running(): return self.loop
+        return None
+
+    def isEvaluating(self) -> bool:
+        """Is there async evaluation pass running?
+
+        :rtype: ``bool``
+        """
+        return self._tasks is not None
+
+    def requestEvaluation(self, nodes:'Iterable[Node]') -> 'asyncio.Task':
+        """
+        Evaluate `nodes` in the asyncio loop without waiting for the result
+
+        :param nodes: `Nodes` to evaluate
+        :type nodes: Iterable[:class:`~nodeeditor.node_node.Node`]
+        :return: ``asyncio.Task`` of :py:meth:`evaluate`
+        :rtype: ``asyncio.Task``
+        :raises: ``RuntimeError`` when there is no running asyncio loop. Running the evaluation to the end right
+            now would block the GUI thread, await :py:meth:`evaluate` instead
+        """
+        nodes = list(nodes)
+        loop = self.getEventLoop()
+        if loop is None:
+            raise RuntimeError("There is no running asyncio loop to evaluate async nodes, see setEventLoop")
+        return loop.create_task(self.evaluate(nodes))
+
+    async def evaluate(self, nodes:'Iterable[Node]', timeout:float=None) -> list:
+        """
+        Evaluate `nodes` together with their `Dirty` or `Invalid` ancestors. Awaits also the descendants added to
+        the pass by :py:meth:`~nodeeditor.node_node.Node.evalChildren`. When a pass is running already, `nodes`
+        join it
+
+        :param nodes: `Nodes` to evaluate
+        :type nodes: Iterable[:class:`~nodeeditor.node_node.Node`]
+        :param timeout: time budget of this pass in seconds, ``timeout`` of the `Scene`'s evaluator when ``None``
+        :type timeout: ``float``
+        :return: values returned by ``evalAsync()`` of the `nodes`. ``None`` for timed out or skipped `Nodes`
+        :rtype: ``list``
+        """
+        nodes = list(nodes)
+        if self.isEvaluating():
+            return list(await asyncio.gather(*(self._getTask(node) for node in nodes)))
+
+        if timeout is None: timeout = self.scene.evaluator.timeout
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+
+        self._tasks = {}
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._skipped = set()
+        self._timeout = None
+        try:
+            targets = [self._getTask(node) for node in nodes]
+            while True:
+                pending = [task for task in self._tasks.values() if not task.done()]
+                if not pending: break
+                remaining = None if deadline is None else max(0.0, deadline - loop.time())
+                done, not_done = await asyncio.wait(pending, timeout=remaining)
+                if not_done and deadline is not None and loop.time() >= deadline:
+                    # the pass ran out of time, the running Nodes are marked by _evalNode
+                    if DEBUG: print("SceneAsyncEvaluator: pass timed out after %gs" % timeout)
+                    self._timeout = timeout
+                    for task in not_done: task.cancel()
+                    await asyncio.gather(*not_done, return_exceptions=True)
+                    break
+            return [None if task.cancelled() else task.result() for task in targets]
+        finally:
+            self._tasks = None
+            self._semaphore = None
+            self._skipped = None
+            self._timeout = None
+
+    def evalChildren(self, node:'Node'):
+        """
+        Add children of the `node` to the running pass. In pull mode of the `Scene`'s evaluator only the demanded
+        ones
+
+        :param node: `Node` whose children should be evaluated
+        :type node: :class:`~nodeeditor.node_node.Node`
+        """
+        for child in node.getChildrenNodes():
+            if self.scene.evaluator.isDemanded(child): self._getTask(child)
+
+    def _getTask(self, node:'Node') -> 'asyncio.Task':
+        task = self._tasks.get(node)
+        if task is None or (task.done() and (node.isDirty() or node.isInvalid())):
+            task = self._tasks[node] = asyncio.ensure_future(self._evalNode(node))
+        return task
+
+    async def _evalNode(self, node:'Node'):
+        # wait for inputs which are being evaluated or need to be. Only the ones earlier in topological
+        # order, so cycles don't wait for each other forever
+        position = self.scene.evaluator.getPosition(node)
+        parents = []
+        for parent in self._getParents(node):
+            if parent not in self._tasks and not parent.isDirty() and not parent.isInvalid(): continue
+            if self.scene.evaluator.getPosition(parent) < position: parents.append(self._getTask(parent))
+        if parents: await asyncio.gather(*parents)
+
+        if node not in self.scene.nodes: return None
+        if any(parent in self._skipped for parent in self._getParents(node)):
+            # descendant of a timed out Node, keeps its Dirty mark
+            self._skipped.add(node)
+            return None
+
+        timeout = node.eval_timeout if node.eval_timeout is not None else self.scene.evaluator.node_timeout
+        async with self._semaphore:
+            if DEBUG: print("SceneAsyncEvaluator: evaluating", node)
+            stats = self.scene.evaluation_stats
+            start = time.perf_counter() if stats.enabled else None
+            try:
+                if timeout is None: return await node.evalAsync()
+                return await asyncio.wait_for(node.evalAsync(), timeout)
+            except asyncio.TimeoutError:
+                self._onTimeout(node, timeout)
+            except asyncio.CancelledError:
+                if self._timeout is not None: self._onTimeout(node, self._timeout)
+                raise
+            except Exception as e: dumpException(e)
+            finally:
+                if start is not None: stats.recordEval(node, time.perf_counter() - start)
+
+    def _getParents(self, node:'Node') -> list:
+        parents = []
+        for socket in node.inputs:
+            for edge in socket.edges:
+                other_socket = edge.getOtherSocket(socket)
+                if other_socket is not None: parents.append(other_socket.node)
+        return parents
+
+    def _onTimeout(self, node:'Node', timeout:float):
+        if DEBUG: print("SceneAsyncEvaluator: timed out", node)
+        self._skipped.add(node)
+        node.markInvalid()
+        node.markDescendantsDirty()
+        node.setToolTip("Evaluation timed out after %gs" % timeout)
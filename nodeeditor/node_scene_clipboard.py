@@ -38,7 +38,7 @@ class SceneClipboard():
         sel_nodes, sel_edges, sel_sockets = [], [], {}
 
         # sort edges and nodes
-        for item in self.scene.grScene.selectedItems():
+        for item in self.scene.getSelectedItems():
             if hasattr(item, 'node'):
                 sel_nodes.append(item.node.serialize())
                 for socket in (item.node.inputs + item.node.outputs):
@@ -77,9 +77,9 @@ class SceneClipboard():
 
         # if CUT: aka delete -- remove items
         if delete:
-            self.scene.getView().deleteSelected()
-            # store our history
-            self.scene.history.storeHistory("Cut our elements from scene", setModified=True)
+            # deleteSelected's own History Stamp is merged into ours
+            with self.scene.batch("Cut our elements from scene"):
+                self.scene.getView().deleteSelected()
 
         return data
 
@@ -95,7 +95,7 @@ class SceneClipboard():
 
         # calculate mouse pointer -- scene position
         view = self.scene.getView()
-        mouse_scene_pos = view.last_scene_mouse_position
+        mouse_scene_pos = view.last_scene_mouse_position if view is not None else None
         if DEBUG: print("view.last_scene_mouse_position", mouse_scene_pos)
 
         # calculate selected objects, bbox and center
@@ -120,47 +120,50 @@ class SceneClipboard():
             print("\tbbox_center:", relbboxcenterx, relbboxcentery)
 
         # calculate the offset of the newly creating nodes
-        mousex, mousey = mouse_scene_pos.x(), mouse_scene_pos.y()
+        # without a view (headless Scene) paste the nodes to their original positions
+        if mouse_scene_pos is not None:
+            mousex, mousey = mouse_scene_pos.x(), mouse_scene_pos.y()
+        else:
+            mousex, mousey = minx, miny
 
         # create each node
         created_nodes = []
 
-        self.scene.setSilentSelectionEvents()
+        # one History Stamp and one notification per node for the whole paste
+        with self.scene.batch("Pasted elements in scene"):
+            self.scene.setSilentSelectionEvents()
 
-        self.scene.doDeselectItems()
+            self.scene.doDeselectItems()
 
-        # create each node
-        for node_data in data['nodes']:
-            new_node = self.scene.getNodeClassFromData(node_data)(self.scene)
-            new_node.deserialize(node_data, hashmap, restore_id=False)
-            created_nodes.append(new_node)
-
-            # readjust the new nodeeditor's position
+            # create each node
+            for node_data in data['nodes']:
+                new_node = self.scene.getNodeClassFromData(node_data)(self.scene)
+                new_node.deserialize(node_data, hashmap, restore_id=False)
+                created_nodes.append(new_node)
 
-            # new node's current position
-            posx, posy = new_node.pos.x(), new_node.pos.y()
-            newx, newy = mousex + posx - minx, mousey + posy - miny
+                # readjust the new nodeeditor's position
 
-            new_node.setPos(newx, newy)
+                # new node's current position
+                posx, posy = new_node.pos.x(), new_node.pos.y()
+                newx, newy = mousex + posx - minx, mousey + posy - miny
 
-            new_node.doSelect()
+                new_node.setPos(newx, newy)
 
-            if DEBUG_PASTING:
-                print("** PASTA SUM:")
-                print("\tMouse pos:", mousex, mousey)
-                print("\tnew node pos:", posx, posy)
-                print("\tFINAL:", newx, newy)
+                new_node.doSelect()
 
-            # create each edge
-        if 'edges' in data:
-            for edge_data in data['edges']:
-                new_edge = Edge(self.scene)
-                new_edge.deserialize(edge_data, hashmap, restore_id=False)
+                if DEBUG_PASTING:
+                    print("** PASTA SUM:")
+                    print("\tMouse pos:", mousex, mousey)
+                    print("\tnew node pos:", posx, posy)
+                    print("\tFINAL:", newx, newy)
 
-        self.scene.setSilentSelectionEvents(False)
+                # create each edge
+            if 'edges' in data:
+                for edge_data in data['edges']:
+                    new_edge = Edge(self.scene)
+                    new_edge.deserialize(edge_data, hashmap, restore_id=False)
 
-        # store history
-        self.scene.history.storeHistory("Pasted elements in scene", setModified=True)
+            self.scene.setSilentSelectionEvents(False)
 
         return created_nodes
 
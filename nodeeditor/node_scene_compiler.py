@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the Compiler which turns the graph of a `Scene` into one generated Python function
+"""
+from nodeeditor.utils import dumpException
+
+DEBUG = False
+
+
+class CompiledScene():
+    """
+    Result of :py:meth:`SceneCompiler.compile`. Calling it calls the generated function with values of the
+    argument `Nodes` and returns the values of all `Nodes`
+    """
+    def __init__(self, function:'function', source:str, nodes:list, argument_nodes:list, version:int):
+        """
+        :Instance Attributes:
+
+        - **function** - the generated function. Takes one argument per argument `Node`, returns ``tuple`` with
+          values of all `nodes`
+        - **source** - Python source of the `function`
+        - **nodes** - all compiled `Nodes` in topological order
+        - **argument_nodes** - `Nodes` whose values are arguments of the `function`
+        - **version** - topology version of the `Scene` the function was compiled for
+        """
+        self.function = function
+        self.source = source
+        self.nodes = nodes
+        self.argument_nodes = argument_nodes
+        self.version = version
+
+    def __call__(self, *args) -> tuple:
+        return self.function(*args)
+
+
+class SceneCompiler():
+    """
+    Class compiling the graph of the :class:`~nodeeditor.node_scene.Scene` into one Python function.
+
+    Every `Node` contributes a Python expression by :py:meth:`~nodeeditor.node_node.Node.compileExpression`. The
+    generated function computes them in topological order into local variables, so evaluation doesn't go through
+    ``getInput``, `Edge` lookups and ``eval`` dispatch at all. `Nodes` with ``compile_argument = True`` (e.g.
+    inputs) get their value as argument of the function. A `Node` whose expression raises, or which has an input
+    not connected or with ``None`` value, gets ``None``.
+
+    The compiled function is cached until `Nodes` or `Edges` are added or removed, or until content of a `Node`
+    changes its expression (:py:meth:`~nodeeditor.node_node.Node.onContentChanged` calls :py:meth:`invalidate`).
+    """
+    def __init__(self, scene:'Scene'):
+        """
+        :param scene: Reference to the :class:`~nodeeditor.node_scene.Scene`
+        :type scene: :class:`~nodeeditor.node_scene.Scene`
+
+        :Instance Attributes:
+
+        - **scene** - reference to the :class:`~nodeeditor.node_scene.Scene`
+        """
+        self.scene = scene
+        self._enabled = False
+        # CompiledScene, False when the graph can't be compiled, None when it needs to be compiled
+        self._compiled = None
+        self._version = None
+
+    def isEnabled(self) -> bool:
+        """Should `Nodes` be re-evaluated by the compiled function when an input changes?
+
+        :rtype: ``bool``
+        """
+        return self._enabled
+
+    def setEnabled(self, value:bool=True):
+        """
+        Enable re-evaluating by the compiled function. `Nodes` supporting it check :py:meth:`isEnabled`
+        and call :py:meth:`evaluate`
+
+        :param value: ``True`` to enable
+        :type value: ``bool``
+        """
+        self._enabled = value
+
+    def invalidate(self):
+        """Forget the compiled function, it is compiled again when needed"""
+        self._compiled = None
+
+    def getCompiled(self) -> 'CompiledScene or None':
+        """
+        Returns the compiled graph, compiles it when the cached one is out of date
+
+        :return: :class:`CompiledScene` or ``None`` if some `Node` can't be compiled
+        :rtype: :class:`CompiledScene` or ``None``
+        """
+        version = self.scene.evaluator.getTopologyVersion()
+        if self._compiled is None or self._version != version:
+            self._version = version
+            try:
+                self._compiled = self.compile() or False
+            except Exception as e:
+                dumpException(e)
+                self._compiled = False
+        return self._compiled or None
+
+    def compile(self) -> 'CompiledScene or None':
+        """
+        Generate and compile Python function evaluating the whole graph
+
+        :return: compiled graph or ``None`` when some `Node` doesn't support compiling
+        :rtype: :class:`CompiledScene` or ``None``
+        """
+        evaluator = self.scene.evaluator
+        nodes = list(evaluator.getTopologicalOrder())
+        names = {node: "v%d" % ix for ix, node in enumerate(nodes)}
+
+        argument_nodes = [node for node in nodes if node.compile_argument]
+        arguments = {node: "a%d" % ix for ix, node in enumerate(argument_nodes)}
+
+        lines = ["def compiled_scene(%s):" % ", ".join(arguments[node] for node in argument_nodes)]
+        for node in nodes:
+            position = evaluator.getPosition(node)
+            input_names = []
+            for ix in range(len(node.inputs)):
+                parent = node.getInput(ix)
+                # Nodes in a cycle see their inputs later in the order as not connected
+                if parent is None or parent not in names or evaluator.getPosition(parent) >= position:
+                    input_names.append(None)
+                else:
+                    input_names.append(names[parent])
+
+            expression = node.compileExpression(input_names, arguments.get(node))
+            if expression is None:
+                if DEBUG: print("SceneCompiler: cannot compile the scene, %s doesn't support compiling" % node)
+                return None
+            if None in input_names:
+                expression = "None"
+            elif input_names:
+                expression = "None if %s else %s" % (" or ".join("%s is None" % name for name in input_names), expression)
+
+            lines.append("    try:")
+            lines.append("        %s = %s" % (names[node], expression))
+            lines.append("    except Exception:")
+            lines.append("        %s = None" % names[node])
+        lines.append("    return (%s)" % "".join("%s, " % names[node] for node in nodes))
+
+        source = "\n".join(lines) + "\n"
+        if DEBUG: print("SceneCompiler: compiled\n" + source)
+        namespace = {}
+        exec(compile(source, "<compiled scene %s>" % self.scene.id, "exec"), namespace)
+        return CompiledScene(namespace['compiled_scene'], source, nodes, argument_nodes, self._version)
+
+    def evaluate(self) -> 'dict or None':
+        """
+        Evaluate the graph by the compiled function with current values of the argument `Nodes` and hand the
+        results to the `Nodes` by :py:meth:`~nodeeditor.node_node.Node.setCompiledResult`. When the graph can't
+        be compiled or some `Node` ended up with ``None``, nothing is changed and ``None`` is returned, so the caller
+        can evaluate the usual way, which also sets the error tooltips
+
+        :return: ``{node id: value}`` of `Nodes` without outputs or ``None``
+        :rtype: ``dict`` or ``None``
+        """
+        compiled = self.getCompiled()
+        if compiled is None: return None
+
+        values = compiled(*[node.getCompileArgumentValue() for node in compiled.argument_nodes])
+        if any(value is None for value in values): return None
+
+        for node, value in zip(compiled.nodes, values): node.setCompiledResult(value)
+        return {node.id: value for node, value in zip(compiled.nodes, values) if not node.outputs}
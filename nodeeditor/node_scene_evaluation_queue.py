@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the Evaluation Queue which coalesces evaluation requests of `Nodes` in a `Scene`
+"""
+from PySide6.QtCore import QCoreApplication, QTimer
+
+from nodeeditor.node_ordered_set import OrderedSet
+from nodeeditor.utils import dumpException
+
+DEBUG = False
+
+
+class SceneEvaluationQueue():
+    """
+    Class collecting requests for evaluating changed `Nodes` and evaluating all of them together later.
+
+    Every :py:meth:`request` (re)starts a single shot ``QTimer``. With `debounce` ``0`` all requests made during
+    one event loop iteration are evaluated together right after it, with bigger `debounce` the evaluation waits
+    until there were no requests for `debounce` milliseconds (e.g. user stopped typing). The union of requested
+    `Nodes` is handed to the flush callback, by default
+    :py:meth:`~nodeeditor.node_scene_evaluator.SceneEvaluator.evaluate`, which evaluates each affected `Node` once.
+
+    The queue is disabled by default, `Nodes` supporting it check :py:meth:`isEnabled`. Without a running
+    ``QCoreApplication`` requests are evaluated immediately.
+    """
+    def __init__(self, scene:'Scene'):
+        """
+        :param scene: Reference to the :class:`~nodeeditor.node_scene.Scene`
+        :type scene: :class:`~nodeeditor.node_scene.Scene`
+
+        :Instance Attributes:
+
+        - **scene** - reference to the :class:`~nodeeditor.node_scene.Scene`
+        - **debounce** - milliseconds to wait after the last request before evaluating
+        """
+        self.scene = scene
+        self.debounce = 0
+        self._enabled = False
+        self._pending = OrderedSet()
+        self._timer = None
+        self._flush_callback = None
+        self._flushed_listeners = []
+
+    def isEnabled(self) -> bool:
+        """Should `Nodes` put their evaluation requests into this queue?
+
+        :rtype: ``bool``
+        """
+        return self._enabled
+
+    def setEnabled(self, value:bool=True):
+        """
+        Enable or disable the queue. Disabling evaluates pending requests right now
+
+        :param value: ``True`` to enable
+        :type value: ``bool``
+        """
+        self._enabled = value
+        if not value: self.flush()
+
+    def setDebounce(self, msec:int):
+        """
+        Set how long to wait after the last request before evaluating. ``0`` coalesces requests of one event loop
+        iteration
+
+        :param msec: milliseconds
+        :type msec: ``int``
+        """
+        self.debounce = max(0, int(msec))
+
+    def setFlushCallback(self, callback:'function'):
+        """
+        Set function evaluating the requested `Nodes`. It gets ``list`` of `Nodes` in topological order
+
+        :param callback: function or ``None`` for :py:meth:`~nodeeditor.node_scene_evaluator.SceneEvaluator.evaluate`
+        :type callback: ``function``
+        """
+        self._flush_callback = callback
+
+    def addFlushedListener(self, callback:'function'):
+        """Register callback for `Flushed` event, called after the requested `Nodes` were evaluated
+
+        :param callback: callback function
+        """
+        self._flushed_listeners.append(callback)
+
+    def hasPending(self) -> bool:
+        """Are there requests waiting for evaluation?
+
+        :rtype: ``bool``
+        """
+        return bool(self._pending)
+
+    def request(self, node:'Node'):
+        """
+        Request evaluation of the changed `node`. It is evaluated together with the other requested `Nodes` when
+        the timer fires
+
+        :param node: `Node` to be evaluated
+        :type node: :class:`~nodeeditor.node_node.Node`
+        """
+        self._pending.append(node)
+        if QCoreApplication.instance() is None:
+            self.flush()
+            return
+
+        if self._timer is None:
+            self._timer = QTimer()
+            self._timer.setSingleShot(True)
+            self._timer.timeout.connect(self.flush)
+        self._timer.start(self.debounce)
+
+    def cancel(self):
+        """Forget pending requests without evaluating them"""
+        self._pending.clear()
+        if self._timer is not None: self._timer.stop()
+
+    def flush(self):
+        """Evaluate all pending requests right now"""
+        if self._timer is not None: self._timer.stop()
+        if not self._pending: return
+
+        pending, self._pending = self._pending, OrderedSet()
+        evaluator = self.scene.evaluator
+        nodes = sorted((node for node in pending if node in self.scene.nodes), key=evaluator.getPosition)
+        if DEBUG: print("SceneEvaluationQueue: evaluating", len(nodes), "requested nodes")
+
+        try:
+            if self._flush_callback is not None: self._flush_callback(nodes)
+            else: evaluator.evaluate(nodes)
+        except Exception as e: dumpException(e)
+
+        for callback in self._flushed_listeners: callback()
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the Evaluation Stats which profile evaluation of `Nodes` in a `Scene`
+"""
+import threading
+import time
+
+
+class NodeEvaluationStats():
+    """Counters of one `Node`. See :class:`SceneEvaluationStats`"""
+    __slots__ = ('node_id', 'calls', 'total_time', 'max_time', 'cache_hits', 'invalidations')
+
+    def __init__(self, node_id:int):
+        """
+        :Instance Attributes:
+
+        - **node_id** - id of the `Node`
+        - **calls** - number of evaluations
+        - **total_time** - wall time of all evaluations in seconds
+        - **max_time** - the longest evaluation in seconds
+        - **cache_hits** - number of evaluations which returned cached value
+        - **invalidations** - number of times the `Node` was marked `Invalid`
+        """
+        self.node_id = node_id
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.cache_hits = 0
+        self.invalidations = 0
+
+    def __repr__(self):
+        return "<%s %s calls:%d total:%.6fs hits:%d invalidations:%d>" % (
+            self.__class__.__name__, self.node_id, self.calls, self.total_time, self.cache_hits, self.invalidations
+        )
+
+    @property
+    def average_time(self) -> float:
+        """Average wall time of one evaluation in seconds"""
+        return self.total_time / self.calls if self.calls else 0.0
+
+
+class SceneEvaluationStats():
+    """
+    Class collecting per `Node` evaluation statistics of the :class:`~nodeeditor.node_scene.Scene`.
+
+    Profiling is disabled by default. The instrumented places (evaluation passes of
+    :class:`~nodeeditor.node_scene_evaluator.SceneEvaluator` and
+    :class:`~nodeeditor.node_scene_async_evaluator.SceneAsyncEvaluator`, ``markInvalid`` and cached branches of
+    `Nodes`) only check :py:attr:`enabled` then, so the cost is one attribute lookup. When :py:attr:`heat_map` is
+    set, Graphics Nodes are tinted by their share of the total evaluation time.
+    """
+    def __init__(self, scene:'Scene'):
+        """
+        :param scene: Reference to the :class:`~nodeeditor.node_scene.Scene`
+        :type scene: :class:`~nodeeditor.node_scene.Scene`
+
+        :Instance Attributes:
+
+        - **scene** - reference to the :class:`~nodeeditor.node_scene.Scene`
+        - **enabled** - are the statistics being collected?
+        - **heat_map** - should Graphics Nodes be tinted by their cost?
+        """
+        self.scene = scene
+        self.enabled = False
+        self.heat_map = False
+        self._lock = threading.Lock()
+        self.reset()
+
+    def setEnabled(self, value:bool=True):
+        """Start or stop collecting statistics
+
+        :param value: ``True`` to collect
+        :type value: ``bool``
+        """
+        self.enabled = value
+
+    def setHeatMap(self, value:bool=True):
+        """Show or hide cost tint of Graphics Nodes
+
+        :param value: ``True`` to tint
+        :type value: ``bool``
+        """
+        self.heat_map = value
+        self.scene.notifier.requestUpdate()
+
+    def reset(self):
+        """Forget all collected statistics"""
+        with self._lock:
+            self._stats = {}
+            self._max_total_time = 0.0
+
+    def _getOrCreate(self, node:'Node') -> NodeEvaluationStats:
+        stats = self._stats.get(node.id)
+        if stats is None: stats = self._stats[node.id] = NodeEvaluationStats(node.id)
+        return stats
+
+    def recordEval(self, node:'Node', seconds:float):
+        """
+        Record one evaluation of the `node`
+
+        :param node: evaluated `Node`
+        :type node: :class:`~nodeeditor.node_node.Node`
+        :param seconds: wall time of the evaluation
+        :type seconds: ``float``
+        """
+        with self._lock:
+            stats = self._getOrCreate(node)
+            stats.calls += 1
+            stats.total_time += seconds
+            if seconds > stats.max_time: stats.max_time = seconds
+            if stats.total_time > self._max_total_time: self._max_total_time = stats.total_time
+
+    def recordCacheHit(self, node:'Node'):
+        """Record evaluation of the `node` which returned cached value
+
+        :param node: evaluated `Node`
+        :type node: :class:`~nodeeditor.node_node.Node`
+        """
+        with self._lock: self._getOrCreate(node).cache_hits += 1
+
+    def recordInvalidation(self, node:'Node'):
+        """Record the `node` being marked `Invalid`
+
+        :param node: invalidated `Node`
+        :type node: :class:`~nodeeditor.node_node.Node`
+        """
+        with self._lock: self._getOrCreate(node).invalidations += 1
+
+    def timeEval(self, node:'Node'):
+        """
+        Call ``node.eval()`` and record its wall time
+
+        :param node: `Node` to evaluate
+        :type node: :class:`~nodeeditor.node_node.Node`
+        :return: value returned by ``eval()``
+        """
+        start = time.perf_counter()
+        try:
+            return node.eval()
+        finally:
+            self.recordEval(node, time.perf_counter() - start)
+
+    def getNodeStats(self, node:'Node') -> 'NodeEvaluationStats or None':
+        """Returns statistics of the `node` or ``None`` if nothing was recorded
+
+        :param node: `Node` to look for
+        :type node: :class:`~nodeeditor.node_node.Node`
+        :rtype: :class:`NodeEvaluationStats` or ``None``
+        """
+        return self._stats.get(node.id)
+
+    def getStats(self, sort_by:str='total_time') -> 'List[NodeEvaluationStats]':
+        """
+        Returns statistics of `Nodes` which are still in the `Scene`, the most expensive first
+
+        :param sort_by: attribute of :class:`NodeEvaluationStats` to sort by
+        :type sort_by: ``str``
+        :rtype: List[:class:`NodeEvaluationStats`]
+        """
+        with self._lock:
+            stats = [item for node_id, item in self._stats.items() if self.scene.getNodeByID(node_id) is not None]
+        stats.sort(key=lambda item: getattr(item, sort_by), reverse=True)
+        return stats
+
+    def getHeat(self, node:'Node') -> float:
+        """
+        Returns total evaluation time of the `node` relative to the most expensive `Node`
+
+        :param node: `Node` to look for
+        :type node: :class:`~nodeeditor.node_node.Node`
+        :return: number between ``0.0`` and ``1.0``
+        :rtype: ``float``
+        """
+        stats = self._stats.get(node.id)
+        if stats is None or self._max_total_time <= 0.0: return 0.0
+        return stats.total_time / self._max_total_time
@@ -0,0 +1,618 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the Evaluator which evaluates `Nodes` of a `Scene` in topological order
+"""
+import heapq
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from nodeeditor.node_cancellation import CancellationToken
+from nodeeditor.utils import dumpException
+
+DEBUG = False
+
+
+class SceneEvaluator():
+    """
+    Class scheduling evaluation of `Nodes` in the :class:`~nodeeditor.node_scene.Scene`.
+
+    `Nodes` still evaluate themselves with :py:meth:`~nodeeditor.node_node.Node.eval`, which stays the kernel
+    reading the values of input `Nodes` and computing the new value. The Evaluator just decides the order: during
+    an evaluation pass each scheduled `Node` is evaluated once, after all its scheduled ancestors, in topological
+    order of the graph. :py:meth:`~nodeeditor.node_node.Node.evalChildren` schedules the children into the current
+    pass instead of recursively evaluating them, so diamond shaped graphs don't evaluate shared descendants
+    once per path and deep chains don't hit the recursion limit.
+
+    With :py:meth:`setMaxWorkers` bigger than ``1`` the pass runs `Nodes` whose inputs are ready in parallel.
+    `Nodes` with class attribute ``eval_thread_safe = True`` are evaluated on a ``ThreadPoolExecutor``, the others
+    in the thread which started the pass (the GUI thread). `Dirty`/`Invalid` marks, tooltips and
+    ``evalChildren`` requests made by a `Node` in a worker thread are recorded and replayed in the GUI thread when
+    the `Node` is finished.
+
+    A pass can be stopped from another thread by :py:meth:`cancel`. `Nodes` which were not evaluated yet keep
+    their `Dirty` marks.
+
+    Passes have a time budget (:py:meth:`setTimeout`) and so have single `Nodes` (``eval_timeout`` class
+    attribute or :py:meth:`setNodeTimeout`). Python can't interrupt a running ``eval``, so the budgets are
+    cooperative: `Nodes` check the :class:`~nodeeditor.node_cancellation.CancellationToken` returned by
+    :py:meth:`getToken`. A `Node` which ran out of its budget is marked `Invalid` with a tooltip and its
+    descendants are skipped. When the budget of the pass runs out, the pass stops like after :py:meth:`cancel`.
+
+    In pull mode (:py:meth:`setPullMode`) ``evalChildren`` evaluates only `Nodes` somebody needs: the demanded
+    outputs (:py:meth:`requestOutputs` or the callback of :py:meth:`setDemandCallback`, e.g. outputs in the
+    viewport) and their ancestors. Other descendants keep their `Dirty` marks until they are demanded and
+    :py:meth:`evaluateDemanded` is called.
+    """
+    def __init__(self, scene:'Scene'):
+        """
+        :param scene: Reference to the :class:`~nodeeditor.node_scene.Scene`
+        :type scene: :class:`~nodeeditor.node_scene.Scene`
+
+        :Instance Attributes:
+
+        - **scene** - reference to the :class:`~nodeeditor.node_scene.Scene`
+        - **timeout** - time budget of one evaluation pass in seconds or ``None``
+        - **node_timeout** - time budget of `Nodes` without their own ``eval_timeout`` in seconds or ``None``
+        - **pull_mode** - are only demanded `Nodes` evaluated?
+        """
+        self.scene = scene
+        self.timeout = None
+        self.node_timeout = None
+
+        # state of the running evaluation pass
+        self._queue = None
+        self._scheduled = None
+        self._results = None
+        self._counter = 0
+        self._cancelled = False
+        self._token = None
+        self._skipped = None
+
+        # generation of Dirty/Invalid mark propagation. See Node._collectDescendants
+        self._mark_generation = 0
+
+        # parallel evaluation
+        self.max_workers = 1
+        self._executor = None
+        self._members = None
+        self._local = threading.local()
+
+        # pull mode. Demanded nodes are cached until the graph or the demanded outputs change
+        self.pull_mode = False
+        self._requested_outputs = []
+        self._demand_callback = None
+        self._demanded = None
+        self._demanded_key = None
+        self._pass_demanded = None
+
+    def setMaxWorkers(self, max_workers:int):
+        """
+        Set number of worker threads for evaluating `Nodes` marked with ``eval_thread_safe``. ``1`` (default)
+        evaluates everything sequentially in topological order
+
+        :param max_workers: number of worker threads
+        :type max_workers: ``int``
+        """
+        if max_workers == self.max_workers: return
+        self.shutdown()
+        self.max_workers = max(1, int(max_workers))
+
+    def setTimeout(self, timeout:float):
+        """
+        Set time budget of one evaluation pass
+
+        :param timeout: seconds or ``None`` for no limit
+        :type timeout: ``float``
+        """
+        self.timeout = timeout
+
+    def setNodeTimeout(self, timeout:float):
+        """
+        Set time budget of one `Node`'s evaluation, used for `Nodes` whose ``eval_timeout`` is ``None``
+
+        :param timeout: seconds or ``None`` for no limit
+        :type timeout: ``float``
+        """
+        self.node_timeout = timeout
+
+    def setPullMode(self, value:bool=True):
+        """
+        Evaluate only demanded `Nodes` (``True``) or all descendants of changed `Nodes` (``False``, default)
+
+        :param value: ``True`` for pull mode
+        :type value: ``bool``
+        """
+        self.pull_mode = value
+
+    def setDemandCallback(self, callback:'function'):
+        """
+        Set function returning `Nodes` demanded right now in addition to :py:meth:`requestOutputs`, e.g. outputs
+        visible in the viewport
+
+        :param callback: function without arguments returning list of `Nodes`, or ``None``
+        :type callback: ``function``
+        """
+        self._demand_callback = callback
+
+    def requestOutputs(self, nodes:'Iterable[Node]'):
+        """
+        Demand `nodes` until :py:meth:`releaseOutputs` is called
+
+        :param nodes: `Nodes` whose values are needed
+        :type nodes: Iterable[:class:`~nodeeditor.node_node.Node`]
+        """
+        for node in nodes:
+            if node not in self._requested_outputs: self._requested_outputs.append(node)
+
+    def releaseOutputs(self, nodes:'Iterable[Node]'):
+        """
+        Stop demanding `nodes` requested by :py:meth:`requestOutputs`
+
+        :param nodes: `Nodes` whose values are not needed anymore
+        :type nodes: Iterable[:class:`~nodeeditor.node_node.Node`]
+        """
+        for node in nodes:
+            if node in self._requested_outputs: self._requested_outputs.remove(node)
+
+    def getDemandedOutputs(self) -> 'List[Node]':
+        """
+        Returns `Nodes` requested by :py:meth:`requestOutputs` and by the callback of :py:meth:`setDemandCallback`
+
+        :rtype: List[:class:`~nodeeditor.node_node.Node`]
+        """
+        outputs = [node for node in self._requested_outputs if node in self.scene.nodes]
+        if self._demand_callback is not None:
+            try:
+                for node in self._demand_callback():
+                    if node not in outputs: outputs.append(node)
+            except Exception as e: dumpException(e)
+        return outputs
+
+    def getDemandedNodes(self) -> set:
+        """
+        Returns demanded outputs together with all their ancestors
+
+        :rtype: ``set`` of :class:`~nodeeditor.node_node.Node`
+        """
+        outputs = self.getDemandedOutputs()
+        key = (self.getTopologyVersion(), tuple(id(node) for node in outputs))
+        if key == self._demanded_key: return self._demanded
+
+        demanded = set()
+        stack = list(outputs)
+        while stack:
+            node = stack.pop()
+            if node in demanded: continue
+            demanded.add(node)
+            for socket in node.inputs:
+                for edge in socket.edges:
+                    other_socket = edge.getOtherSocket(socket)
+                    if other_socket is not None: stack.append(other_socket.node)
+
+        self._demanded, self._demanded_key = demanded, key
+        return demanded
+
+    def isDemanded(self, node:'Node') -> bool:
+        """
+        Should the `node` be evaluated by ``evalChildren``? Always ``True`` when not in pull mode
+
+        :param node: `Node` to check
+        :type node: :class:`~nodeeditor.node_node.Node`
+        :rtype: ``bool``
+        """
+        if not self.pull_mode: return True
+        if self.isEvaluating():
+            # the viewport doesn't change during the pass, ask the callback only once
+            if self._pass_demanded is None: self._pass_demanded = self.getDemandedNodes()
+            return node in self._pass_demanded
+        return node in self.getDemandedNodes()
+
+    def evaluateDemanded(self) -> 'List[Node]':
+        """
+        Evaluate `Dirty` or `Invalid` demanded outputs together with their `Dirty` or `Invalid` ancestors
+
+        :return: evaluated outputs
+        :rtype: List[:class:`~nodeeditor.node_node.Node`]
+        """
+        outputs = [node for node in self.getDemandedOutputs() if node.isDirty() or node.isInvalid()]
+        if outputs: self.evaluate(outputs)
+        return outputs
+
+    def getToken(self) -> 'CancellationToken or None':
+        """
+        Returns :class:`~nodeeditor.node_cancellation.CancellationToken` of the `Node` being evaluated in this
+        thread, ``None`` outside of an evaluation pass
+
+        :rtype: :class:`~nodeeditor.node_cancellation.CancellationToken` or ``None``
+        """
+        token = getattr(self._local, 'token', None)
+        return token if token is not None else self._token
+
+    def shutdown(self):
+        """Stop worker threads of the parallel evaluation. They are started again when needed"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def getExecutor(self) -> ThreadPoolExecutor:
+        """Returns ``ThreadPoolExecutor`` used for parallel evaluation, creates it when needed"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="NodeEvaluator")
+        return self._executor
+
+    def deferFromWorker(self, callback:'function', *args) -> bool:
+        """
+        When called from a worker thread of the parallel evaluation, record `callback` to be called with `args` in
+        the GUI thread after the evaluated `Node` is finished
+
+        :param callback: function to call in the GUI thread
+        :return: ``True`` if the call was deferred, ``False`` if the caller should do it right now
+        :rtype: ``bool``
+        """
+        deferred = getattr(self._local, 'deferred', None)
+        if deferred is None: return False
+        deferred.append((callback, args))
+        return True
+
+    def invalidateOrder(self):
+        """Forget topological order, it is computed from scratch when needed. Changes of `Nodes` and `Edges` are
+        tracked by :class:`~nodeeditor.node_scene_topology.SceneTopology` without this"""
+        self.scene.topology.invalidate()
+
+    def getTopologyVersion(self) -> int:
+        """Returns number which changes every time `Nodes` or `Edges` are added or removed
+
+        :rtype: ``int``
+        """
+        return self.scene.topology.getVersion()
+
+    def getTopologicalOrder(self) -> 'List[Node]':
+        """
+        Returns all `Nodes` of the `Scene` in topological order: each `Node` comes after all `Nodes` connected to
+        its inputs. `Nodes` which are part of a cycle are appended at the end. The order is maintained by
+        :class:`~nodeeditor.node_scene_topology.SceneTopology`
+
+        :rtype: List[:class:`~nodeeditor.node_node.Node`]
+        """
+        return self.scene.topology.getOrder()
+
+    def getPosition(self, node:'Node') -> int:
+        """
+        Returns position of the `node` in the topological order
+
+        :param node: `Node` to look for
+        :type node: :class:`~nodeeditor.node_node.Node`
+        :rtype: ``int``
+        """
+        return self.scene.topology.getPosition(node)
+
+    def getMarkGeneration(self) -> int:
+        """
+        Returns generation stamp for propagating `Dirty` and `Invalid` marks to descendants. All propagations inside
+        of one evaluation pass share the same generation, outside of a pass each propagation gets a new one
+
+        :rtype: ``int``
+        """
+        if not self.isEvaluating(): self._mark_generation += 1
+        return self._mark_generation
+
+    def cancel(self):
+        """
+        Stop the running evaluation pass after the `Nodes` being evaluated right now are finished. When called
+        before the pass started, the next pass is cancelled. `Nodes` checking :py:meth:`getToken` stop right
+        away. Can be called from any thread
+        """
+        self._cancelled = True
+        token = self._token
+        if token is not None: token.cancel()
+
+    def clearCancel(self):
+        """Forget :py:meth:`cancel` called when no pass was running, so the next pass is not cancelled"""
+        if not self.isEvaluating(): self._cancelled = False
+
+    def isCancelled(self) -> bool:
+        """Has the running (or next) evaluation pass been cancelled?
+
+        :rtype: ``bool``
+        """
+        return self._cancelled
+
+    def isEvaluating(self) -> bool:
+        """Is there evaluation pass running?
+
+        :rtype: ``bool``
+        """
+        return self._queue is not None
+
+    def schedule(self, node:'Node'):
+        """
+        Add `node` to the running evaluation pass together with its `Dirty` or `Invalid` ancestors, which have to
+        be evaluated before it. Each `Node` is scheduled only once per pass
+
+        :param node: `Node` to be evaluated
+        :type node: :class:`~nodeeditor.node_node.Node`
+        """
+        if node in self._scheduled: return
+
+        stack = [node]
+        self._scheduled.add(node)
+        while stack:
+            current = stack.pop()
+            if self._members is None:
+                self._counter += 1
+                heapq.heappush(self._queue, (self.getPosition(current), self._counter, current))
+
+            for socket in current.inputs:
+                for edge in socket.edges:
+                    other_socket = edge.getOtherSocket(socket)
+                    if other_socket is None: continue
+                    parent = other_socket.node
+                    if parent in self._scheduled: continue
+                    if parent.isDirty() or parent.isInvalid():
+                        self._scheduled.add(parent)
+                        stack.append(parent)
+
+    def _run(self):
+        while self._queue and not self._cancelled:
+            position, counter, node = heapq.heappop(self._queue)
+            if node not in self.scene.nodes: continue
+            if self._hasSkippedParent(node):
+                self._skip(node)
+                continue
+            if DEBUG: print("SceneEvaluator: evaluating", node)
+            try:
+                self._results[node] = self._eval(node)
+            except Exception as e: dumpException(e)
+
+    def _eval(self, node:'Node'):
+        token = None
+        if self._token is not None:
+            timeout = getattr(node, 'eval_timeout', None)
+            token = self._token.createChild(timeout if timeout is not None else self.node_timeout)
+        previous = getattr(self._local, 'token', None)
+        self._local.token = token
+        try:
+            stats = self.scene.evaluation_stats
+            value = stats.timeEval(node) if stats.enabled else node.eval()
+        finally:
+            self._local.token = previous
+
+        if token is not None:
+            # stopped by the token, or not cooperative and ran over its own budget
+            timeout = token.timed_out
+            if timeout is None: timeout = token.getExpiredTimeout(inherited=False)
+            if timeout is not None:
+                self._onTimeout(node, timeout)
+                return None
+            # finished in its budget, but the whole pass ran out of time meanwhile: keep the value, stop the pass
+            if self._token.isExpired(): self._cancelled = True
+        return value
+
+    def _onTimeout(self, node:'Node', timeout:float):
+        if DEBUG: print("SceneEvaluator: timed out", node)
+        self._skipped.add(node)
+        node.markInvalid()
+        node.markDescendantsDirty()
+        node.setToolTip("Evaluation timed out after %gs" % timeout)
+        # the whole pass ran out of time, stop it
+        if self._token.isExpired(): self._cancelled = True
+
+    def _skip(self, node:'Node'):
+        # descendant of a timed out Node, keeps its Dirty mark
+        self._skipped.add(node)
+        self._results[node] = None
+
+    def _hasSkippedParent(self, node:'Node') -> bool:
+        if not self._skipped: return False
+        for socket in node.inputs:
+            for edge in socket.edges:
+                other_socket = edge.getOtherSocket(socket)
+                if other_socket is not None and other_socket.node in self._skipped: return True
+        return False
+
+    def _runPass(self, roots:list, exclude:'Iterable[Node]'=(), timeout:float=None) -> dict:
+        self._startPass(timeout if timeout is not None else self.timeout)
+        try:
+            self._scheduled.update(exclude)
+            if self.max_workers > 1:
+                self._runParallel(roots)
+            else:
+                for node in roots: self.schedule(node)
+                self._run()
+            return self._results
+        finally:
+            self._endPass()
+
+    def _collectMembers(self, roots:list) -> set:
+        # everything the pass may evaluate: roots, their descendants (scheduled by evalChildren while
+        # evaluating) and Dirty or Invalid ancestors of all of them
+        members = set()
+        stack = list(roots)
+        while stack:
+            node = stack.pop()
+            if node in members or node in self._scheduled: continue
+            members.add(node)
+            stack.extend(node.getChildrenNodes())
+            for socket in node.inputs:
+                for edge in socket.edges:
+                    other_socket = edge.getOtherSocket(socket)
+                    if other_socket is None: continue
+                    parent = other_socket.node
+                    if parent.isDirty() or parent.isInvalid(): stack.append(parent)
+        return members
+
+    def _runParallel(self, roots:list):
+        members = self._collectMembers(roots)
+        self._members = members
+        for node in roots: self.schedule(node)
+
+        # number of unfinished member parents of each member
+        waiting = {}
+        for node in members:
+            count = 0
+            for socket in node.inputs:
+                for edge in socket.edges:
+                    other_socket = edge.getOtherSocket(socket)
+                    if other_socket is not None and other_socket.node in members: count += 1
+            waiting[node] = count
+
+        ready = sorted((node for node, count in waiting.items() if count == 0), key=self.getPosition)
+        ready = deque(ready)
+        running = {}
+
+        def finish(node):
+            del waiting[node]
+            for child in node.getChildrenNodes():
+                if child not in waiting: continue
+                waiting[child] -= 1
+                if waiting[child] == 0: ready.append(child)
+
+        while waiting:
+            # start everything which can go to the worker threads first, so they work while we evaluate the rest
+            in_gui_thread = []
+            if self._cancelled:
+                ready.clear()
+                if not running: break
+            while ready:
+                node = ready.popleft()
+                if node not in self._scheduled or node not in self.scene.nodes:
+                    # nobody asked for evaluating this node in this pass
+                    finish(node)
+                elif self._hasSkippedParent(node):
+                    self._skip(node)
+                    finish(node)
+                elif getattr(node, 'eval_thread_safe', False):
+                    running[self.getExecutor().submit(self._evalInWorker, node)] = node
+                else:
+                    in_gui_thread.append(node)
+
+            for node in in_gui_thread:
+                if self._cancelled: break
+                try:
+                    self._results[node] = self._eval(node)
+                except Exception as e: dumpException(e)
+                finish(node)
+
+            if running:
+                done, not_done = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    value, deferred, exception = future.result()
+                    if exception is not None: dumpException(exception)
+                    else: self._results[node] = value
+                    for callback, args in deferred:
+                        try:
+                            callback(*args)
+                        except Exception as e: dumpException(e)
+                    finish(node)
+
+            elif not ready and not in_gui_thread and waiting:
+                # only cycles are left, break them at the topologically first node
+                node = min(waiting, key=self.getPosition)
+                waiting[node] = 0
+                ready.append(node)
+
+    def _evalInWorker(self, node:'Node') -> tuple:
+        self._local.deferred = deferred = []
+        try:
+            return self._eval(node), deferred, None
+        except Exception as e:
+            return None, deferred, e
+        finally:
+            self._local.deferred = None
+
+    def evaluate(self, nodes:'Iterable[Node]', timeout:float=None) -> list:
+        """
+        Evaluate `nodes` together with their `Dirty` or `Invalid` ancestors in topological order. Descendants
+        scheduled by :py:meth:`~nodeeditor.node_node.Node.evalChildren` are evaluated in the same pass
+
+        :param nodes: `Nodes` to evaluate
+        :type nodes: Iterable[:class:`~nodeeditor.node_node.Node`]
+        :param timeout: time budget of this pass in seconds, :py:attr:`timeout` when ``None``
+        :type timeout: ``float``
+        :return: values returned by ``eval()`` of the `nodes`. ``None`` for `Nodes` skipped by :py:meth:`cancel`
+            or because of a timeout
+        :rtype: ``list``
+        """
+        nodes = list(nodes)
+        if self.isEvaluating():
+            # called from a Node's eval, the caller needs the values right now
+            return [node.eval() for node in nodes]
+
+        results = self._runPass(nodes, timeout=timeout)
+        if self._cancelled:
+            self._cancelled = False
+            return [results.get(node) for node in nodes]
+        return [results[node] if node in results else node.eval() for node in nodes]
+
+    def evaluateBatch(self, inputs:dict) -> dict:
+        """
+        Evaluate the whole graph once for many values at the same time. Every `Node` in topological order gets
+        the batch values of its inputs and returns its own batch value by
+        :py:meth:`~nodeeditor.node_node.Node.evalBatch`. `Dirty`/`Invalid` marks and values of the `Nodes` are
+        not touched
+
+        :param inputs: ``{node id: batch value}`` fed into the `Nodes` (e.g. arrays)
+        :type inputs: ``dict``
+        :return: ``{node id: batch value}`` of all `Nodes` without output `Sockets`. ``None`` for invalid ones
+        :rtype: ``dict``
+        :raises: ``ValueError`` when there is no `Node` with the id in the `Scene` or some `Node` doesn't support
+            batch evaluation
+        """
+        for node_id in inputs:
+            if self.scene.getNodeByID(node_id) is None: raise ValueError("There is no node with id %r" % node_id)
+
+        size = len(next(iter(inputs.values()))) if inputs else 1
+        order = self.getTopologicalOrder()
+        for node in order:
+            if not node.supportsBatch(): raise ValueError("%s doesn't support batch evaluation" % node)
+        values = {}
+        for node in order:
+            input_values = []
+            for ix in range(len(node.inputs)):
+                parent = node.getInput(ix)
+                input_values.append(None if parent is None else values.get(parent))
+            try:
+                values[node] = node.evalBatch(input_values, inputs.get(node.id), size)
+            except Exception as e:
+                dumpException(e)
+                values[node] = None
+
+        return {node.id: values[node] for node in order if not node.outputs}
+
+    def evalChildren(self, node:'Node'):
+        """
+        Evaluate children of the `node`. Inside of running pass they are just scheduled, otherwise new pass is
+        started. In pull mode only demanded children are evaluated
+
+        :param node: `Node` whose children should be evaluated
+        :type node: :class:`~nodeeditor.node_node.Node`
+        """
+        children = [child for child in node.getChildrenNodes() if self.isDemanded(child)]
+        if self.isEvaluating():
+            for child in children: self.schedule(child)
+            return
+
+        # the node itself is evaluated already, don't schedule it again as a dirty ancestor
+        if children: self._runPass(children, exclude=(node,))
+        self._cancelled = False
+
+    def _startPass(self, timeout:float=None):
+        self._mark_generation += 1
+        self._queue = []
+        self._scheduled = set()
+        self._results = {}
+        self._skipped = set()
+        self._token = CancellationToken(timeout)
+        # cancel() called before the pass started
+        if self._cancelled: self._token.cancel()
+
+    def _endPass(self):
+        self._queue = None
+        self._scheduled = None
+        self._results = None
+        self._members = None
+        self._token = None
+        self._skipped = None
+        self._pass_demanded = None
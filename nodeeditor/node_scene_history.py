@@ -133,6 +133,9 @@ class SceneHistory():
         if setModified:
             self.scene.has_been_modified = True
 
+        # inside of Scene.batch only one History Stamp is stored when it ends
+        if self.scene.isInBatch(): return
+
         if DEBUG: print("Storing history", '"%s"' % desc,
                         ".... current_step: @%d" % self.history_current_step,
                         "(%d)" % len(self.history_stack))
@@ -167,7 +170,7 @@ class SceneHistory():
             'nodes': [],
             'edges': [],
         }
-        for item in self.scene.grScene.selectedItems():
+        for item in self.scene.getSelectedItems():
             if hasattr(item, 'node'): sel_obj['nodes'].append(item.node.id)
             elif hasattr(item, 'edge'): sel_obj['edges'].append(item.edge.id)
         return sel_obj
@@ -204,25 +207,21 @@ class SceneHistory():
 
             self.scene.deserialize(history_stamp['snapshot'])
 
-            # restore selection
-
-            # first clear all selection on edges
-            for edge in self.scene.edges: edge.grEdge.setSelected(False)
-            # now restore selected edges from history_stamp
-            for edge_id in history_stamp['selection']['edges']:
-                for edge in self.scene.edges:
-                    if edge.id == edge_id:
-                        edge.grEdge.setSelected(True)
-                        break
-
-            # first clear all selection on nodes
-            for node in self.scene.nodes: node.grNode.setSelected(False)
-            # now restore selected nodes from history_stamp
-            for node_id in history_stamp['selection']['nodes']:
-                for node in self.scene.nodes:
-                    if node.id == node_id:
-                        node.grNode.setSelected(True)
-                        break
+            # restore selection (there are no graphics items to select in headless Scene)
+            if not self.scene.isHeadless():
+                # first clear all selection on edges
+                for edge in self.scene.edges: edge.grEdge.setSelected(False)
+                # now restore selected edges from history_stamp
+                for edge_id in history_stamp['selection']['edges']:
+                    edge = self.scene.getEdgeByID(edge_id)
+                    if edge is not None: edge.grEdge.setSelected(True)
+
+                # first clear all selection on nodes
+                for node in self.scene.nodes: node.grNode.setSelected(False)
+                # now restore selected nodes from history_stamp
+                for node_id in history_stamp['selection']['nodes']:
+                    node = self.scene.getNodeByID(node_id)
+                    if node is not None: node.grNode.setSelected(True)
 
             current_selection = self.captureCurrentSelection()
             if DEBUG_SELECTION: print("selected nodes after restore:", current_selection['nodes'])
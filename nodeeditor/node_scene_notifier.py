@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the Notifier which collects `Scene` notifications during a batch and dispatches them at once
+"""
+from collections import OrderedDict
+
+from nodeeditor.utils import dumpException
+
+DEBUG = False
+
+
+class SceneNotifier():
+    """
+    Class routing `Node` connection notifications, `Has Been Modified` events and ``QGraphicsScene`` updates.
+
+    Outside of a batch everything is delivered immediately. Between :py:meth:`collect` and :py:meth:`dispatch`
+    the notifications are collected and deduplicated, so each affected `Node` gets notified only once.
+    See :py:meth:`~nodeeditor.node_scene.Scene.batch`
+    """
+    def __init__(self, scene:'Scene'):
+        """
+        :param scene: Reference to the :class:`~nodeeditor.node_scene.Scene`
+        :type scene: :class:`~nodeeditor.node_scene.Scene`
+
+        :Instance Attributes:
+
+        - **scene** - reference to the :class:`~nodeeditor.node_scene.Scene`
+        """
+        self.scene = scene
+        self._depth = 0
+        self.clear()
+
+    def clear(self):
+        """Forget all collected notifications"""
+        # node -> [last changed edge, last changed input socket or None]
+        self._connection_changes = OrderedDict()
+        self._modified = False
+        self._update_requested = False
+
+    def isCollecting(self) -> bool:
+        """Are we inside of a batch and notifications are being collected?
+
+        :rtype: ``bool``
+        """
+        return self._depth > 0
+
+    def collect(self):
+        """Start collecting notifications. Calls can be nested, each has to be paired with :py:meth:`dispatch`"""
+        self._depth += 1
+
+    def dispatch(self) -> bool:
+        """
+        End collecting started by :py:meth:`collect`. When the outermost batch ends, all collected notifications
+        are delivered: one connection change per affected `Node`, one ``QGraphicsScene`` update and one
+        `Has Been Modified` event
+
+        :return: ``True`` if the outermost batch ended and the notifications were dispatched
+        :rtype: ``bool``
+        """
+        if self._depth == 0: return False
+        self._depth -= 1
+        if self._depth > 0: return False
+
+        connection_changes, modified, update_requested = \
+            self._connection_changes, self._modified, self._update_requested
+        self.clear()
+
+        if DEBUG: print("SceneNotifier: dispatching to", len(connection_changes), "nodes")
+
+        for node, (edge, input_socket) in connection_changes.items():
+            # nodes removed during the batch are not interested anymore
+            if node not in self.scene.nodes: continue
+            try:
+                node.onEdgeConnectionChanged(edge)
+                if input_socket is not None: node.onInputChanged(input_socket)
+            except Exception as e: dumpException(e)
+
+        if update_requested: self.requestUpdate()
+        if modified and self.scene.has_been_modified: self.notifyHasBeenModified()
+        return True
+
+    def notifyConnectionChanged(self, socket:'Socket', edge:'Edge'):
+        """
+        `Edge` connected to `socket` has been created or removed. Triggers Node's
+        :py:meth:`~nodeeditor.node_node.Node.onEdgeConnectionChanged` and for input `Sockets` also
+        :py:meth:`~nodeeditor.node_node.Node.onInputChanged`
+
+        :param socket: :class:`~nodeeditor.node_socket.Socket` whose connection changed
+        :type socket: :class:`~nodeeditor.node_socket.Socket`
+        :param edge: the changed :class:`~nodeeditor.node_edge.Edge`
+        :type edge: :class:`~nodeeditor.node_edge.Edge`
+        """
+        node = socket.node
+        if not self.isCollecting():
+            node.onEdgeConnectionChanged(edge)
+            if socket.is_input: node.onInputChanged(socket)
+            return
+
+        change = self._connection_changes.get(node)
+        if change is None:
+            self._connection_changes[node] = [edge, socket if socket.is_input else None]
+        else:
+            change[0] = edge
+            if socket.is_input: change[1] = socket
+
+    def notifyHasBeenModified(self):
+        """Call `Has Been Modified` listeners of the `Scene` now or at the end of the batch"""
+        if self.isCollecting():
+            self._modified = True
+            return
+        for callback in self.scene._has_been_modified_listeners: callback()
+
+    def requestUpdate(self):
+        """Request repaint of the whole ``QGraphicsScene`` now or at the end of the batch"""
+        if self.isCollecting():
+            self._update_requested = True
+            return
+        if not self.scene.isHeadless(): self.scene.grScene.update()
@@ -0,0 +1,416 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the spatial index of `Node` and `Edge` geometry used for "what is near here" queries
+"""
+import heapq
+import math
+
+DEBUG = False
+
+
+def rect_distance(rect:tuple, x:float, y:float) -> float:
+    """Distance of point `x`, `y` to the rectangle `rect`. ``0.0`` if the point is inside
+
+    :param rect: ``(x1, y1, x2, y2)`` rectangle
+    :type rect: ``tuple``
+    :rtype: ``float``
+    """
+    dx = max(rect[0] - x, 0.0, x - rect[2])
+    dy = max(rect[1] - y, 0.0, y - rect[3])
+    return math.hypot(dx, dy)
+
+
+def segment_intersects_rect(x1:float, y1:float, x2:float, y2:float, rect:tuple) -> bool:
+    """Does the line segment from `x1`, `y1` to `x2`, `y2` intersect rectangle `rect`? (Liang-Barsky clipping)
+
+    :param rect: ``(x1, y1, x2, y2)`` rectangle
+    :type rect: ``tuple``
+    :rtype: ``bool``
+    """
+    dx, dy = x2 - x1, y2 - y1
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, x1 - rect[0]), (dx, rect[2] - x1), (-dy, y1 - rect[1]), (dy, rect[3] - y1)):
+        if p == 0:
+            if q < 0: return False
+        else:
+            t = q / p
+            if p < 0:
+                if t > t1: return False
+                if t > t0: t0 = t
+            else:
+                if t < t0: return False
+                if t < t1: t1 = t
+    return True
+
+
+class GridIndex():
+    """
+    Uniform grid of square cells storing items with their bounding rectangles.
+
+    Each item is registered in every cell its rectangle overlaps. Items covering more than
+    ``max_item_cells`` cells (i.e. very long `Edges`) are kept in a separate list which is always checked, so they
+    don't fill up thousands of cells. Query results are returned in the order in which the items were inserted.
+    """
+    def __init__(self, cell_size:float=256.0, max_item_cells:int=64):
+        """
+        :param cell_size: size of one grid cell in `Scene` units
+        :type cell_size: ``float``
+        :param max_item_cells: items overlapping more cells are not stored in the grid
+        :type max_item_cells: ``int``
+
+        :Instance Attributes:
+
+        - **cell_size** - size of one grid cell
+        """
+        self.cell_size = float(cell_size)
+        self.max_item_cells = max_item_cells
+        self.clear()
+
+    def clear(self):
+        """Remove all items"""
+        # item -> [rect, cells or None for oversized items, insertion serial]
+        self._items = {}
+        self._cells = {}
+        self._oversized = {}
+        self._serial = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item):
+        return item in self._items
+
+    def getRect(self, item) -> tuple:
+        """Returns stored rectangle of the `item` or ``None``"""
+        entry = self._items.get(item)
+        return None if entry is None else entry[0]
+
+    def _cellRange(self, rect:tuple) -> tuple:
+        size = self.cell_size
+        return (
+            math.floor(rect[0] / size), math.floor(rect[1] / size),
+            math.floor(rect[2] / size), math.floor(rect[3] / size),
+        )
+
+    def insert(self, item, rect:tuple):
+        """
+        Insert `item` or update its rectangle
+
+        :param item: any hashable object
+        :param rect: ``(x1, y1, x2, y2)`` bounding rectangle with ``x1 <= x2`` and ``y1 <= y2``
+        :type rect: ``tuple``
+        """
+        entry = self._items.get(item)
+        cx1, cy1, cx2, cy2 = self._cellRange(rect)
+        oversized = (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > self.max_item_cells
+        cells = None if oversized else (cx1, cy1, cx2, cy2)
+
+        if entry is not None:
+            if entry[1] == cells:
+                # still the same cells, just store the new rect
+                entry[0] = rect
+                return
+            self._unlink(item, entry[1])
+            entry[0], entry[1] = rect, cells
+        else:
+            self._serial += 1
+            self._items[item] = [rect, cells, self._serial]
+
+        if cells is None:
+            self._oversized[item] = None
+            return
+
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                bucket = self._cells.get((cx, cy))
+                if bucket is None: self._cells[(cx, cy)] = bucket = {}
+                bucket[item] = None
+
+    update = insert
+
+    def _unlink(self, item, cells:tuple):
+        if cells is None:
+            self._oversized.pop(item, None)
+            return
+        cx1, cy1, cx2, cy2 = cells
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                bucket = self._cells.get((cx, cy))
+                if bucket is None: continue
+                bucket.pop(item, None)
+                if not bucket: del self._cells[(cx, cy)]
+
+    def remove(self, item):
+        """Remove `item`. Does nothing if the `item` is not stored
+
+        :param item: item to be removed
+        """
+        entry = self._items.pop(item, None)
+        if entry is not None: self._unlink(item, entry[1])
+
+    def _sorted(self, items) -> list:
+        return sorted(items, key=lambda item: self._items[item][2])
+
+    def queryRect(self, rect:tuple) -> list:
+        """
+        Find items whose rectangle intersects `rect`
+
+        :param rect: ``(x1, y1, x2, y2)`` query rectangle
+        :type rect: ``tuple``
+        :return: found items
+        :rtype: ``list``
+        """
+        x1, y1, x2, y2 = rect
+        cx1, cy1, cx2, cy2 = self._cellRange(rect)
+        if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > len(self._cells):
+            candidates = self._items.keys()
+        else:
+            candidates = set(self._oversized)
+            for cx in range(cx1, cx2 + 1):
+                for cy in range(cy1, cy2 + 1):
+                    bucket = self._cells.get((cx, cy))
+                    if bucket is not None: candidates.update(bucket)
+
+        found = []
+        for item in candidates:
+            r = self._items[item][0]
+            if r[0] <= x2 and r[2] >= x1 and r[1] <= y2 and r[3] >= y1: found.append(item)
+        return self._sorted(found)
+
+    def _segmentCells(self, x1:float, y1:float, x2:float, y2:float):
+        # walk the grid cells crossed by the segment (Amanatides & Woo)
+        size = self.cell_size
+        cx, cy = math.floor(x1 / size), math.floor(y1 / size)
+        end_cx, end_cy = math.floor(x2 / size), math.floor(y2 / size)
+        dx, dy = x2 - x1, y2 - y1
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        t_delta_x = abs(size / dx) if dx != 0 else math.inf
+        t_delta_y = abs(size / dy) if dy != 0 else math.inf
+        t_max_x = (((cx + (step_x > 0)) * size - x1) / dx) if dx != 0 else math.inf
+        t_max_y = (((cy + (step_y > 0)) * size - y1) / dy) if dy != 0 else math.inf
+
+        yield cx, cy
+        for i in range(abs(end_cx - cx) + abs(end_cy - cy)):
+            if t_max_x < t_max_y:
+                cx += step_x
+                t_max_x += t_delta_x
+            else:
+                cy += step_y
+                t_max_y += t_delta_y
+            yield cx, cy
+
+    def querySegment(self, p1:tuple, p2:tuple) -> list:
+        """
+        Find items whose rectangle intersects the line segment from `p1` to `p2`
+
+        :param p1: ``(x, y)`` start of the segment
+        :type p1: ``tuple``
+        :param p2: ``(x, y)`` end of the segment
+        :type p2: ``tuple``
+        :return: found items
+        :rtype: ``list``
+        """
+        x1, y1 = p1
+        x2, y2 = p2
+        candidates = set(self._oversized)
+        for cell in self._segmentCells(x1, y1, x2, y2):
+            bucket = self._cells.get(cell)
+            if bucket is not None: candidates.update(bucket)
+
+        return self._sorted(item for item in candidates if segment_intersects_rect(x1, y1, x2, y2, self._items[item][0]))
+
+    def iterNearest(self, x:float, y:float) -> 'Iterator[tuple]':
+        """
+        Iterate over items ordered by the distance of their rectangle to the point `x`, `y`. The grid is searched
+        in growing rings of cells, so taking just the first few items is cheap
+
+        :param x: X `Scene` position
+        :param y: Y `Scene` position
+        :return: ``(distance, item)`` tuples
+        """
+        if not self._items: return
+
+        size = self.cell_size
+        cx, cy = math.floor(x / size), math.floor(y / size)
+        heap = []
+        for item in self._oversized:
+            entry = self._items[item]
+            heapq.heappush(heap, (rect_distance(entry[0], x, y), entry[2], item))
+
+        seen = set()
+        if self._cells:
+            xs = [cell[0] for cell in self._cells]
+            ys = [cell[1] for cell in self._cells]
+            max_ring = max(abs(cx - min(xs)), abs(cx - max(xs)), abs(cy - min(ys)), abs(cy - max(ys)))
+        else:
+            max_ring = -1
+
+        ring = 0
+        while ring <= max_ring:
+            if ring == 0:
+                ring_cells = ((cx, cy),)
+            else:
+                ring_cells = [(cx + i, cy - ring) for i in range(-ring, ring + 1)]
+                ring_cells += [(cx + i, cy + ring) for i in range(-ring, ring + 1)]
+                ring_cells += [(cx - ring, cy + i) for i in range(-ring + 1, ring)]
+                ring_cells += [(cx + ring, cy + i) for i in range(-ring + 1, ring)]
+
+            for cell in ring_cells:
+                bucket = self._cells.get(cell)
+                if bucket is None: continue
+                for item in bucket:
+                    if item in seen: continue
+                    seen.add(item)
+                    entry = self._items[item]
+                    heapq.heappush(heap, (rect_distance(entry[0], x, y), entry[2], item))
+
+            # nothing outside of the searched rings can be closer than this
+            bound = ring * size
+            while heap and heap[0][0] <= bound:
+                distance, serial, item = heapq.heappop(heap)
+                yield distance, item
+            ring += 1
+
+        while heap:
+            distance, serial, item = heapq.heappop(heap)
+            yield distance, item
+
+    def nearest(self, x:float, y:float, k:int=1, max_distance:float=None) -> list:
+        """
+        Find `k` items nearest to the point `x`, `y`
+
+        :param x: X `Scene` position
+        :param y: Y `Scene` position
+        :param k: maximum number of items to return
+        :type k: ``int``
+        :param max_distance: ignore items further than this
+        :type max_distance: ``float``
+        :return: found items, the nearest first
+        :rtype: ``list``
+        """
+        found = []
+        for distance, item in self.iterNearest(x, y):
+            if len(found) >= k or (max_distance is not None and distance > max_distance): break
+            found.append(item)
+        return found
+
+
+class SceneSpatialIndex():
+    """
+    Class keeping `Node` rectangles and `Edge` bounding boxes of a :class:`~nodeeditor.node_scene.Scene` in
+    :class:`GridIndex` instances. It is updated incrementally when `Nodes` move and `Edges` get connected, and it
+    is computed from the model only, so it works in headless `Scene` as well
+    """
+    def __init__(self, scene:'Scene', cell_size:float=256.0):
+        """
+        :param scene: Reference to the :class:`~nodeeditor.node_scene.Scene`
+        :type scene: :class:`~nodeeditor.node_scene.Scene`
+        :param cell_size: size of one grid cell in `Scene` units
+        :type cell_size: ``float``
+
+        :Instance Attributes:
+
+        - **scene** - reference to the :class:`~nodeeditor.node_scene.Scene`
+        - **nodes** - :class:`GridIndex` of `Node` rectangles
+        - **edges** - :class:`GridIndex` of `Edge` bounding boxes
+        """
+        self.scene = scene
+        self.nodes = GridIndex(cell_size)
+        self.edges = GridIndex(cell_size)
+
+    def clear(self):
+        """Remove everything from the index"""
+        self.nodes.clear()
+        self.edges.clear()
+
+    def rebuild(self):
+        """Index all `Nodes` and `Edges` of the `Scene` again"""
+        self.clear()
+        for node in self.scene.nodes: self.updateNode(node, with_edges=False)
+        for edge in self.scene.edges: self.updateEdge(edge)
+
+    def updateNode(self, node:'Node', with_edges:bool=True):
+        """
+        Store current rectangle of the `node`
+
+        :param node: `Node` which moved or was created
+        :type node: :class:`~nodeeditor.node_node.Node`
+        :param with_edges: update connected `Edges` as well
+        :type with_edges: ``bool``
+        """
+        self.nodes.insert(node, node.getBoundingRect())
+        if with_edges:
+            for socket in node.inputs + node.outputs:
+                for edge in socket.edges: self.updateEdge(edge)
+
+    def removeNode(self, node:'Node'):
+        """Remove `node` from the index"""
+        self.nodes.remove(node)
+
+    def updateEdge(self, edge:'Edge'):
+        """
+        Store current bounding box of the `edge`. `Edges` not connected on both sides are not indexed
+
+        :param edge: `Edge` which changed
+        :type edge: :class:`~nodeeditor.node_edge.Edge`
+        """
+        rect = edge.getBoundingRect()
+        if rect is None: self.edges.remove(edge)
+        else: self.edges.insert(edge, rect)
+
+    def removeEdge(self, edge:'Edge'):
+        """Remove `edge` from the index"""
+        self.edges.remove(edge)
+
+    def nodesInRect(self, rect:tuple) -> 'List[Node]':
+        """Returns `Nodes` intersecting ``(x1, y1, x2, y2)`` rectangle `rect`"""
+        return self.nodes.queryRect(rect)
+
+    def edgesInRect(self, rect:tuple) -> 'List[Edge]':
+        """Returns `Edges` whose bounding box intersects ``(x1, y1, x2, y2)`` rectangle `rect`"""
+        return self.edges.queryRect(rect)
+
+    def edgesNearSegment(self, p1:tuple, p2:tuple) -> 'List[Edge]':
+        """
+        Returns candidate `Edges` for intersecting the line segment `p1` - `p2`. Only bounding boxes are tested,
+        so the exact test (i.e. :py:meth:`~nodeeditor.node_graphics_edge.QDMGraphicsEdge.intersectsWith`) still
+        needs to be done on the result
+
+        :param p1: ``(x, y)`` start of the segment
+        :param p2: ``(x, y)`` end of the segment
+        :rtype: List[:class:`~nodeeditor.node_edge.Edge`]
+        """
+        return self.edges.querySegment(p1, p2)
+
+    def nearestNodes(self, x:float, y:float, k:int=1, max_distance:float=None) -> 'List[Node]':
+        """Returns up to `k` `Nodes` nearest to the point `x`, `y`. See :py:meth:`GridIndex.nearest`"""
+        return self.nodes.nearest(x, y, k, max_distance)
+
+    def nearestSockets(self, x:float, y:float, k:int=1, max_distance:float=None) -> 'List[Socket]':
+        """
+        Returns up to `k` `Sockets` nearest to the point `x`, `y`
+
+        :param x: X `Scene` position
+        :param y: Y `Scene` position
+        :param k: maximum number of `Sockets` to return
+        :type k: ``int``
+        :param max_distance: ignore `Sockets` further than this
+        :type max_distance: ``float``
+        :rtype: List[:class:`~nodeeditor.node_socket.Socket`]
+        """
+        found = []      # (distance, order, socket)
+        order = 0
+        for node_distance, node in self.nodes.iterNearest(x, y):
+            # sockets lie on the node's border, so farther nodes can't have closer sockets
+            if len(found) >= k and node_distance > found[-1][0]: break
+            if max_distance is not None and node_distance > max_distance: break
+            for socket in node.inputs + node.outputs:
+                sx, sy = node.getSocketScenePosition(socket)
+                distance = math.hypot(sx - x, sy - y)
+                if max_distance is not None and distance > max_distance: continue
+                order += 1
+                found.append((distance, order, socket))
+            found.sort()
+            del found[k:]
+        return [socket for distance, order, socket in found]
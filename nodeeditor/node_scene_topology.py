@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""
+A module containing the Topology which keeps `Nodes` of a `Scene` in topological order while the graph changes
+"""
+
+DEBUG = False
+
+
+class SceneTopology():
+    """
+    Class maintaining topological order of `Nodes` in the :class:`~nodeeditor.node_scene.Scene`.
+
+    Each `Node` has a position and every `Edge` goes from a lower position to a higher one. The order is updated
+    incrementally by the Pearce-Kelly algorithm: adding `Node` appends it at the end, removing `Node` or `Edge`
+    keeps the order valid, and adding `Edge` which points backwards only reorders the `Nodes` between the two
+    positions reachable from the `Edge`. The same search detects `Edges` closing a cycle, see
+    :py:meth:`wouldCreateCycle`.
+
+    Cycles can still be created by the API or loaded from a file. While the graph contains a cycle, the order is
+    recomputed from scratch when needed and `Nodes` of the cycle are appended at the end.
+    """
+    def __init__(self, scene:'Scene'):
+        """
+        :param scene: Reference to the :class:`~nodeeditor.node_scene.Scene`
+        :type scene: :class:`~nodeeditor.node_scene.Scene`
+
+        :Instance Attributes:
+
+        - **scene** - reference to the :class:`~nodeeditor.node_scene.Scene`
+        """
+        self.scene = scene
+
+        # node -> unique position, increasing along every edge while _valid and not _has_cycle
+        self._position = {}
+        self._next_position = 0
+        self._valid = True
+        self._has_cycle = False
+        # cached list of nodes sorted by position. None when it needs to be sorted again
+        self._order = None
+        self._version = 0
+
+    def invalidate(self):
+        """Forget the order, it is computed from scratch when needed"""
+        self._valid = False
+        self._order = None
+        self._version += 1
+
+    def getVersion(self) -> int:
+        """Returns number which changes every time `Nodes` or `Edges` are added or removed
+
+        :rtype: ``int``
+        """
+        return self._version
+
+    def hasCycle(self) -> bool:
+        """Does the graph contain a cycle?
+
+        :rtype: ``bool``
+        """
+        self._ensureValid()
+        return self._has_cycle
+
+    def getOrder(self) -> 'List[Node]':
+        """
+        Returns all `Nodes` of the `Scene` in topological order. The list is cached until the graph changes
+
+        :rtype: List[:class:`~nodeeditor.node_node.Node`]
+        """
+        self._ensureValid()
+        if self._order is None: self._order = sorted(self._position, key=self._position.__getitem__)
+        return self._order
+
+    def getPosition(self, node:'Node') -> int:
+        """
+        Returns position of the `node` in the topological order. Positions are unique but not contiguous
+
+        :param node: `Node` to look for
+        :type node: :class:`~nodeeditor.node_node.Node`
+        :rtype: ``int``
+        """
+        self._ensureValid()
+        position = self._position.get(node)
+        if position is None:
+            # not part of the Scene (anymore), evaluate it after everything else
+            position = self._next_position
+        return position
+
+    def nodeAdded(self, node:'Node'):
+        """Append new `node` at the end of the order. Called by :py:meth:`~nodeeditor.node_scene.Scene.addNode`"""
+        self._position[node] = self._next_position
+        self._next_position += 1
+        self._order = None
+        self._version += 1
+
+    def nodeRemoved(self, node:'Node'):
+        """Forget removed `node`. Called by :py:meth:`~nodeeditor.node_scene.Scene.removeNode`"""
+        self._position.pop(node, None)
+        self._order = None
+        self._version += 1
+        # the removed node might have been part of the cycle
+        if self._has_cycle: self.invalidate()
+
+    def edgeAdded(self, edge:'Edge'):
+        """
+        Update the order after `edge` was connected. Called by :py:meth:`~nodeeditor.node_socket.Socket.addEdge`,
+        does something when the second `Socket` of the `edge` is connected
+
+        :param edge: connected :class:`~nodeeditor.node_edge.Edge`
+        :type edge: :class:`~nodeeditor.node_edge.Edge`
+        """
+        start_socket, end_socket = edge.start_socket, edge.end_socket
+        if start_socket is None or end_socket is None: return
+        if edge not in start_socket.edges or edge not in end_socket.edges: return
+
+        self._version += 1
+        if not self._valid or self._has_cycle: return self.invalidate()
+
+        parent, child = self._getParentAndChild(start_socket, end_socket)
+        if parent not in self._position or child not in self._position: return self.invalidate()
+        if not self._reorder(parent, child):
+            if DEBUG: print("SceneTopology: edge", edge, "creates a cycle")
+            self._has_cycle = True
+            self.invalidate()
+
+    def edgeRemoved(self, edge:'Edge'):
+        """
+        Called by :py:meth:`~nodeeditor.node_socket.Socket.removeEdge`. Removing an `Edge` keeps the order valid
+
+        :param edge: disconnected :class:`~nodeeditor.node_edge.Edge`
+        :type edge: :class:`~nodeeditor.node_edge.Edge`
+        """
+        self._version += 1
+        # the removed edge might have been part of the cycle
+        if self._has_cycle: self.invalidate()
+
+    def wouldCreateCycle(self, start_socket:'Socket', end_socket:'Socket') -> bool:
+        """
+        Would connecting `start_socket` with `end_socket` create a cycle? Only `Nodes` between the positions of
+        the two `Nodes` are searched
+
+        :param start_socket: one end of the new `Edge`
+        :type start_socket: :class:`~nodeeditor.node_socket.Socket`
+        :param end_socket: the other end of the new `Edge`
+        :type end_socket: :class:`~nodeeditor.node_socket.Socket`
+        :rtype: ``bool``
+        """
+        parent, child = self._getParentAndChild(start_socket, end_socket)
+        if parent is child: return True
+
+        self._ensureValid()
+        upper = self._position.get(parent)
+        if upper is None or child not in self._position: return False
+        if not self._has_cycle and self._position[child] > upper: return False
+
+        # is the parent reachable from the child? With valid order only through nodes before the parent
+        visited = {child}
+        stack = [child]
+        while stack:
+            for node in stack.pop().getChildrenNodes():
+                if node is parent: return True
+                if node in visited: continue
+                position = self._position.get(node)
+                if position is None or (not self._has_cycle and position > upper): continue
+                visited.add(node)
+                stack.append(node)
+        return False
+
+    def _getParentAndChild(self, start_socket:'Socket', end_socket:'Socket') -> tuple:
+        # edges can be dragged from input to output too
+        if start_socket.is_input: return end_socket.node, start_socket.node
+        return start_socket.node, end_socket.node
+
+    def _getParents(self, node:'Node') -> 'List[Node]':
+        parents = []
+        for socket in node.inputs:
+            for edge in socket.edges:
+                other_socket = edge.getOtherSocket(socket)
+                if other_socket is not None: parents.append(other_socket.node)
+        return parents
+
+    def _reorder(self, parent:'Node', child:'Node') -> bool:
+        # Pearce-Kelly: make `parent` come before `child`. Returns False when the edge closes a cycle
+        position = self._position
+        lower, upper = position[child], position[parent]
+        if lower > upper: return True
+        if parent is child: return False
+
+        # nodes reachable from the child which are not after the parent
+        forward = []
+        visited = {child}
+        stack = [child]
+        while stack:
+            node = stack.pop()
+            forward.append(node)
+            for other in node.getChildrenNodes():
+                if other is parent: return False
+                if other in visited: continue
+                other_position = position.get(other)
+                if other_position is None or other_position > upper: continue
+                visited.add(other)
+                stack.append(other)
+
+        # nodes reaching the parent which are not before the child
+        backward = []
+        visited = {parent}
+        stack = [parent]
+        while stack:
+            node = stack.pop()
+            backward.append(node)
+            for other in self._getParents(node):
+                if other in visited: continue
+                other_position = position.get(other)
+                if other_position is None or other_position < lower: continue
+                visited.add(other)
+                stack.append(other)
+
+        # reuse the positions of the affected nodes, ancestors of the parent first
+        forward.sort(key=position.__getitem__)
+        backward.sort(key=position.__getitem__)
+        affected = backward + forward
+        for node, new_position in zip(affected, sorted(position[node] for node in affected)):
+            position[node] = new_position
+        self._order = None
+        return True
+
+    def _ensureValid(self):
+        if not self._valid: self._computeOrder()
+
+    def _computeOrder(self):
+        # Kahn's algorithm, ties are resolved by the order in which the Nodes were added to the Scene
+        nodes = self.scene.nodes
+        in_degree = {}
+        for node in nodes:
+            in_degree[node] = sum(1 for parent in self._getParents(node) if parent in nodes)
+
+        ready = [node for node, count in in_degree.items() if count == 0]
+        order = []
+        ix = 0
+        while ix < len(ready):
+            node = ready[ix]
+            ix += 1
+            order.append(node)
+            for child in node.getChildrenNodes():
+                if child not in in_degree: continue
+                in_degree[child] -= 1
+                if in_degree[child] == 0: ready.append(child)
+
+        self._has_cycle = len(order) < len(in_degree)
+        if self._has_cycle:
+            if DEBUG: print("SceneTopology: graph contains a cycle")
+            ordered = set(order)
+            order.extend(node for node in in_degree if node not in ordered)
+
+        self._position = {node: ix for ix, node in enumerate(order)}
+        self._next_position = len(order)
+        self._order = order
+        self._valid = True
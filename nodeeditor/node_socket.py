@@ -39,7 +39,7 @@ class Socket(Serializable):
 
             - **node** - reference to the :class:`~nodeeditor.node_node.Node` containing this `Socket`
             - **edges** - list of `Edges` connected to this `Socket`
-            - **grSocket** - reference to the :class:`~nodeeditor.node_graphics_socket.QDMGraphicsSocket`
+            - **grSocket** - reference to the :class:`~nodeeditor.node_graphics_socket.QDMGraphicsSocket` or ``None`` in headless `Scene`
             - **position** - Socket position. See :ref:`socket-position-constants`
             - **index** - Current index of this socket in the position
             - **socket_type** - Constant defining type(color) of this socket
@@ -61,22 +61,32 @@ class Socket(Serializable):
 
         if DEBUG: print("Socket -- creating with", self.index, self.position, "for nodeeditor", self.node)
 
-        self.grSocket = self.__class__.Socket_GR_Class(self)
-
-        self.setSocketPosition()
+        self.grSocket = None
+        if self.node.grNode is not None: self.attachGraphics()
 
         self.edges = []
 
+        self.node.scene.addSocket(self)
+
     def __str__(self):
         return "<Socket #%d %s %s..%s>" % (
             self.index, "ME" if self.is_multi_edges else "SE", hex(id(self))[2:5], hex(id(self))[-3:]
         )
 
+    def attachGraphics(self):
+        """Create the `Graphics Socket` and place it on the `Graphics Node`. Used for `Sockets` created
+        in a headless :class:`~nodeeditor.node_scene.Scene`"""
+        if self.grSocket is not None: return
+        self.grSocket = self.__class__.Socket_GR_Class(self)
+        self.setSocketPosition()
+
     def delete(self):
         """Delete this `Socket` from graphics scene for sure"""
-        self.grSocket.setParentItem(None)
-        self.node.scene.grScene.removeItem(self.grSocket)
-        del self.grSocket
+        if self.grSocket is not None:
+            self.grSocket.setParentItem(None)
+            self.node.scene.grScene.removeItem(self.grSocket)
+        self.node.scene.removeSocket(self)
+        self.grSocket = None
 
     def changeSocketType(self, new_socket_type: int) -> bool:
         """
@@ -89,13 +99,14 @@ class Socket(Serializable):
         """
         if self.socket_type != new_socket_type:
             self.socket_type = new_socket_type
-            self.grSocket.changeSocketType()
+            if self.grSocket is not None: self.grSocket.changeSocketType()
             return True
         return False
 
     def setSocketPosition(self):
         """Helper function to set the ` Graphics Socket ` position. The exact socket position is calculated
         inside :class:`~nodeeditor.node_node.Node`."""
+        if self.grSocket is None: return
         self.grSocket.setPos(*self.node.getSocketPosition(self.index, self.position, self.count_on_this_node_side))
 
     def getSocketPosition(self):
@@ -136,6 +147,7 @@ class Socket(Serializable):
         :type edge: :class:`~nodeeditor.node_edge.Edge`
         """
         self.edges.append(edge)
+        self.node.scene.topology.edgeAdded(edge)
 
     def removeEdge(self, edge:'Edge'):
         """
@@ -145,6 +157,7 @@ class Socket(Serializable):
         """
         if edge in self.edges:
             self.edges.remove(edge)
+            self.node.scene.topology.edgeRemoved(edge)
         else:
             if DEBUG_REMOVE_WARNINGS:
                 print("!W:", "Socket::removeEdge", "wanna remove edge", edge,
@@ -187,7 +200,7 @@ class Socket(Serializable):
         ])
 
     def deserialize(self, data, hashmap={}, restore_id=True):
-        if restore_id: self.id = data['id']
+        if restore_id: self.node.scene.changeSocketID(self, data['id'])
         self.is_multi_edges = self.determineMultiEdges(data)
         self.changeSocketType(data['socket_type'])
         hashmap[data['id']] = self
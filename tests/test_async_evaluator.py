@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+
+"""Tests for :class:`~nodeeditor.node_scene_async_evaluator.SceneAsyncEvaluator`."""
+
+import asyncio
+import unittest
+
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_scene import Scene
+from examples.example_calculator.calc_conf import get_class_from_opcode, OP_NODE_INPUT, OP_NODE_ADD, OP_NODE_OUTPUT
+
+
+class AsyncAdd(get_class_from_opcode(OP_NODE_ADD)):
+    """Add node waiting for a fake backend, counting how many of them wait at the same time"""
+    running = 0
+    max_running = 0
+
+    async def evalImplementation(self):
+        i1 = self.getInput(0)
+        i2 = self.getInput(1)
+        if i1 is None or i2 is None:
+            self.markInvalid()
+            self.setToolTip("Connect all inputs")
+            return None
+
+        AsyncAdd.running += 1
+        AsyncAdd.max_running = max(AsyncAdd.max_running, AsyncAdd.running)
+        try:
+            await asyncio.sleep(0.02)
+        finally:
+            AsyncAdd.running -= 1
+
+        self.value = self.evalOperation(i1.eval(), i2.eval())
+        self.markDirty(False)
+        self.markInvalid(False)
+        self.setToolTip("")
+        self.markDescendantsDirty()
+        self.evalChildren()
+        return self.value
+
+
+class TestAsyncEvaluator(unittest.TestCase):
+    """Tests for evaluating `Nodes` with async `evalImplementation`"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.scene = Scene(headless=True)
+        self.input = get_class_from_opcode(OP_NODE_INPUT)(self.scene)
+        AsyncAdd.running = AsyncAdd.max_running = 0
+
+    def buildFan(self, width):
+        # `width` async nodes reading the input, all summed by a chain of sync adds into one output
+        adds = []
+        for i in range(width):
+            node = AsyncAdd(self.scene)
+            Edge(self.scene, self.input.outputs[0], node.inputs[0])
+            Edge(self.scene, self.input.outputs[0], node.inputs[1])
+            adds.append(node)
+        total = adds[0]
+        for node in adds[1:]:
+            add = get_class_from_opcode(OP_NODE_ADD)(self.scene)
+            Edge(self.scene, total.outputs[0], add.inputs[0])
+            Edge(self.scene, node.outputs[0], add.inputs[1])
+            total = add
+        output = get_class_from_opcode(OP_NODE_OUTPUT)(self.scene)
+        Edge(self.scene, total.outputs[0], output.inputs[0])
+        return adds, output
+
+    def test_concurrent_evaluation(self):
+        """Test that independent async nodes are awaited concurrently and dirty marks are kept"""
+        adds, output = self.buildFan(8)
+        self.input.markDirty()
+        self.input.markDescendantsDirty()
+        result = asyncio.run(self.scene.async_evaluator.evaluate([output]))
+
+        self.assertEqual(result, [16])
+        self.assertEqual(AsyncAdd.max_running, 8)
+        self.assertFalse(any(node.isDirty() for node in self.scene.nodes))
+
+    def test_concurrency_limit(self):
+        """Test that the number of concurrently evaluated nodes is limited per scene"""
+        adds, output = self.buildFan(8)
+        self.scene.async_evaluator.setMaxConcurrency(3)
+        self.input.markDirty()
+        self.input.markDescendantsDirty()
+        asyncio.run(self.scene.async_evaluator.evaluate([output]))
+
+        self.assertEqual(output.value, 16)
+        self.assertEqual(AsyncAdd.max_running, 3)
+
+    def test_sync_edit_without_loop(self):
+        """Test that editing an input without running asyncio loop doesn't block on async descendants"""
+        adds, output = self.buildFan(2)
+        self.input.setInputText("5")
+        self.assertEqual(AsyncAdd.max_running, 0)
+        self.assertTrue(adds[0].isInvalid())
+        self.assertIn("no running asyncio loop", adds[0].getToolTip())
+
+        # awaited in a loop they are evaluated
+        self.assertEqual(asyncio.run(self.scene.async_evaluator.evaluate([output])), [20])
+        self.assertFalse(adds[0].isInvalid())
+
+    def test_node_timeout(self):
+        """Test that an awaiting node is cancelled after its budget and its descendants are skipped"""
+        adds, output = self.buildFan(2)
+        adds[0].eval_timeout = 0.001
+        self.input.markDirty()
+        self.input.markDescendantsDirty()
+        result = asyncio.run(self.scene.async_evaluator.evaluate([output]))
+
+        self.assertEqual(result, [None])
+        self.assertTrue(adds[0].isInvalid())
+        self.assertIn("timed out", adds[0].getToolTip())
+        self.assertFalse(adds[1].isDirty())
+        self.assertTrue(output.isDirty())
+
+    def test_no_running_loop(self):
+        """Test that async nodes are not evaluated blocking when there is no running loop"""
+        node = AsyncAdd(self.scene)
+        with self.assertRaises(RuntimeError):
+            self.scene.async_evaluator.requestEvaluation([node])
+        self.assertEqual(AsyncAdd.max_running, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+
+"""Tests for :class:`~nodeeditor.node_background_evaluator.BackgroundEvaluator`."""
+
+import os
+import threading
+import time
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from nodeeditor.node_background_evaluator import BackgroundEvaluator
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_scene import Scene
+from examples.example_calculator.calc_conf import get_class_from_opcode, OP_NODE_INPUT, OP_NODE_ADD, OP_NODE_OUTPUT
+
+
+app = QApplication.instance() or QApplication([])
+
+
+class ThreadRecordingAdd(get_class_from_opcode(OP_NODE_ADD)):
+    """Add node remembering the thread it was evaluated in"""
+    threads = set()
+
+    def evalImplementation(self):
+        ThreadRecordingAdd.threads.add(threading.get_ident())
+        return super().evalImplementation()
+
+
+class TestBackgroundEvaluator(unittest.TestCase):
+    """Tests for evaluating snapshots of `Scene` in a worker thread"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.scene = Scene(headless=True)
+        self.scene.setNodeClassSelector(self.getNodeClassFromData)
+        self.input1 = get_class_from_opcode(OP_NODE_INPUT)(self.scene)
+        self.input2 = get_class_from_opcode(OP_NODE_INPUT)(self.scene)
+        self.add = ThreadRecordingAdd(self.scene)
+        self.output = get_class_from_opcode(OP_NODE_OUTPUT)(self.scene)
+        Edge(self.scene, self.input1.outputs[0], self.add.inputs[0])
+        Edge(self.scene, self.input2.outputs[0], self.add.inputs[1])
+        Edge(self.scene, self.add.outputs[0], self.output.inputs[0])
+
+        self.evaluator = BackgroundEvaluator(self.scene)
+        self.scene.background_evaluator = self.evaluator
+        ThreadRecordingAdd.threads.clear()
+
+    def tearDown(self):
+        self.evaluator.shutdown()
+
+    def getNodeClassFromData(self, data):
+        if data['title'] == ThreadRecordingAdd.op_title: return ThreadRecordingAdd
+        return get_class_from_opcode(data['op_code'])
+
+    def waitForResults(self, timeout=5.0):
+        end = time.time() + timeout
+        while self.evaluator.isBusy() and time.time() < end:
+            app.processEvents()
+            time.sleep(0.001)
+        self.assertFalse(self.evaluator.isBusy())
+
+    def test_results_are_applied(self):
+        """Test that the edit is evaluated in the worker thread and results come back to the scene"""
+        self.input1.setInputText("2")
+        self.assertTrue(self.output.isBusy())
+        self.waitForResults()
+
+        self.assertEqual(self.output.value, 3)
+        self.assertFalse(self.output.isDirty())
+        self.assertFalse(self.output.isBusy())
+        self.assertNotIn(threading.get_ident(), ThreadRecordingAdd.threads)
+
+    def test_newer_edit_wins(self):
+        """Test that results of an older evaluation are thrown away when a newer edit arrives"""
+        self.input1.setInputText("10")
+        self.input1.setInputText("20")
+        self.waitForResults()
+        self.assertEqual(self.output.value, 21)
+
+    def test_invalid_result(self):
+        """Test that invalid marks and tooltips come back from the worker thread"""
+        self.input2.setInputText("x")
+        self.waitForResults()
+        self.assertTrue(self.input2.isInvalid())
+        self.assertIn("invalid literal", self.input2.getToolTip())
+
+    def test_snapshot_reused(self):
+        """Test that edits of inputs send only the values and the snapshot is rebuilt after other changes"""
+        snapshots = []
+        create_snapshot = self.evaluator.createSnapshot
+        self.evaluator.createSnapshot = lambda nodes: snapshots.append(create_snapshot(nodes)) or snapshots[-1]
+
+        self.input1.setInputText("2")
+        self.waitForResults()
+        self.input1.setInputText("5")
+        self.waitForResults()
+        self.assertEqual(self.output.value, 6)
+        self.assertIsNotNone(snapshots[0]['structure'])
+        self.assertIsNone(snapshots[1]['structure'])
+        self.assertEqual(snapshots[1]['values'], {self.input1.id: "5", self.input2.id: "1"})
+
+        self.add.onContentChanged()
+        self.waitForResults()
+        self.assertIsNotNone(snapshots[2]['structure'])
+
+        self.add.inputs[1].edges[0].remove()
+        Edge(self.scene, self.input1.outputs[0], self.add.inputs[1])
+        self.input1.setInputText("4")
+        self.waitForResults()
+        self.assertIsNotNone(snapshots[3]['structure'])
+        self.assertEqual(self.output.value, 8)
+
+    def test_cancel_pass(self):
+        """Test that cancelled pass leaves the remaining nodes dirty"""
+        self.scene.background_evaluator = None
+        self.output.markDirty()
+        self.add.markDirty()
+        self.scene.evaluator.cancel()
+        self.assertEqual(self.scene.evaluator.evaluate([self.output]), [None])
+        self.assertTrue(self.output.isDirty())
+        self.assertFalse(self.scene.evaluator.isCancelled())
+
+
+if __name__ == '__main__':
+    unittest.main()
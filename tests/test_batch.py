@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+
+"""Tests for :mod:`nodeeditor.batch`."""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from nodeeditor.batch import SceneBatch, BatchError, iterRows, main
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_scene import Scene
+from examples.example_calculator.calc_conf import get_class_from_opcode, get_class_from_data, OP_NODE_INPUT, \
+    OP_NODE_DIV, OP_NODE_OUTPUT
+
+SELECTOR = "examples.example_calculator.calc_conf:get_class_from_data"
+
+
+class TestBatch(unittest.TestCase):
+    """Tests for evaluating a saved graph for many parameter sets"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.directory = tempfile.TemporaryDirectory()
+        # x / y -> output
+        scene = Scene(headless=True)
+        self.x = get_class_from_opcode(OP_NODE_INPUT)(scene)
+        self.x.title = "x"
+        self.y = get_class_from_opcode(OP_NODE_INPUT)(scene)
+        div = get_class_from_opcode(OP_NODE_DIV)(scene)
+        self.output = get_class_from_opcode(OP_NODE_OUTPUT)(scene)
+        Edge(scene, self.x.outputs[0], div.inputs[0])
+        Edge(scene, self.y.outputs[0], div.inputs[1])
+        Edge(scene, div.outputs[0], self.output.inputs[0])
+        self.graph = self.path("graph.json")
+        with contextlib.redirect_stdout(io.StringIO()): scene.saveToFile(self.graph)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def run_main(self, *args):
+        with contextlib.redirect_stderr(io.StringIO()):
+            return main([self.graph, "--node-class-selector", SELECTOR] + list(args))
+
+    def test_jsonl_to_csv(self):
+        """Test mapping columns by title and id and writing CSV, with worker processes too"""
+        with open(self.path("params.jsonl"), "w") as file:
+            for i in range(10): file.write(json.dumps({"x": i * 6, str(self.y.id): i % 3}) + "\n")
+
+        for processes in ("1", "2"):
+            self.assertEqual(self.run_main("--inputs", self.path("params.jsonl"), "--output", self.path("out.csv"),
+                                           "--processes", processes, "--chunk-size", "3"), 0)
+            with open(self.path("out.csv")) as file: lines = file.read().splitlines()
+            self.assertEqual(lines[0], str(self.output.id))
+            self.assertEqual(lines[1:4], ['""', "6.0", "6.0"])
+            self.assertEqual(len(lines), 11)
+
+    def test_evaluator_fallback(self):
+        """Test that graphs which aren't compiled are evaluated by setting the argument values"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            batch = SceneBatch(self.graph, get_class_from_data, output_keys='title')
+            batch.compiled = None
+            self.assertEqual(batch.evaluateRow({"x": 8, str(self.y.id): 2}), {"Output": 4.0})
+            self.assertEqual(batch.evaluateRow({"x": 8, str(self.y.id): 0}), {"Output": None})
+            self.assertRaises(BatchError, batch.evaluateRow, {"Output": 1})
+
+    def test_empty_cell(self):
+        """Test that an empty CSV cell uses the saved value in both compiled and evaluated graphs"""
+        with open(self.path("params.csv"), "w") as file:
+            file.write("x,%d\n8,2\n,4\n6,\n" % self.y.id)
+
+        outputs = []
+        for compiled in (True, False):
+            with contextlib.redirect_stdout(io.StringIO()):
+                batch = SceneBatch(self.graph, get_class_from_data, output_keys='title')
+                if not compiled: batch.compiled = None
+                with open(self.path("params.csv")) as file:
+                    outputs.append([batch.evaluateRow(row) for row in iterRows(file, 'csv')])
+        self.assertEqual(outputs[0], [{"Output": 4.0}, {"Output": 0.25}, {"Output": 6.0}])
+        self.assertEqual(outputs[1], outputs[0])
+
+    def test_unknown_column(self):
+        """Test that unknown column fails with exit code"""
+        with open(self.path("params.csv"), "w") as file: file.write("z\n1\n")
+        self.assertEqual(self.run_main("--inputs", self.path("params.csv"), "--output", self.path("out.jsonl")), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+
+"""Tests for vectorized :py:meth:`~nodeeditor.node_scene.Scene.evaluateBatch`."""
+
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_node import Node
+from nodeeditor.node_scene import Scene
+from examples.example_calculator.calc_conf import get_class_from_opcode, \
+    OP_NODE_INPUT, OP_NODE_ADD, OP_NODE_DIV, OP_NODE_OUTPUT
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestBatchEvaluation(unittest.TestCase):
+    """Tests for evaluating calculator graphs over NumPy arrays"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        # (a + b) / b
+        self.scene = Scene(headless=True)
+        self.a = get_class_from_opcode(OP_NODE_INPUT)(self.scene)
+        self.b = get_class_from_opcode(OP_NODE_INPUT)(self.scene)
+        self.add = get_class_from_opcode(OP_NODE_ADD)(self.scene)
+        self.div = get_class_from_opcode(OP_NODE_DIV)(self.scene)
+        self.output = get_class_from_opcode(OP_NODE_OUTPUT)(self.scene)
+        Edge(self.scene, self.a.outputs[0], self.add.inputs[0])
+        Edge(self.scene, self.b.outputs[0], self.add.inputs[1])
+        Edge(self.scene, self.add.outputs[0], self.div.inputs[0])
+        Edge(self.scene, self.b.outputs[0], self.div.inputs[1])
+        Edge(self.scene, self.div.outputs[0], self.output.inputs[0])
+
+    def test_vectorized(self):
+        """Test that every row gets the same result as the scalar evaluation"""
+        a = numpy.arange(10)
+        b = numpy.arange(1, 11)
+        result = self.scene.evaluateBatch({self.a.id: a, self.b.id: b})
+        self.assertEqual(list(result), [self.output.id])
+        numpy.testing.assert_allclose(result[self.output.id], (a + b) / b)
+
+    def test_division_by_zero_is_masked(self):
+        """Test that division by zero masks just the affected rows"""
+        result = self.scene.evaluateBatch({self.b.id: numpy.array([2, 0, 4])})[self.output.id]
+        self.assertEqual(list(numpy.ma.getmaskarray(result)), [False, True, False])
+        self.assertEqual(result[0], 1.5)
+        self.assertFalse(self.div.isInvalid())
+
+    def test_not_fed_input(self):
+        """Test that inputs without fed values use their text for the whole batch"""
+        self.a.setInputText("3")
+        result = self.scene.evaluateBatch({self.b.id: numpy.array([1, 3])})[self.output.id]
+        self.assertEqual(list(result), [4.0, 2.0])
+
+    def test_unknown_input(self):
+        """Test that feeding a node which is not in the scene raises"""
+        with self.assertRaises(ValueError):
+            self.scene.evaluateBatch({-1: numpy.array([1])})
+
+    def test_not_supported(self):
+        """Test that a node without batch evaluation makes the batch raise"""
+        Node(self.scene)
+        with self.assertRaises(ValueError):
+            self.scene.evaluateBatch({self.b.id: numpy.array([1])})
+
+
+if __name__ == '__main__':
+    unittest.main()
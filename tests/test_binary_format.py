@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+
+"""Tests for :mod:`nodeeditor.node_binary_format`."""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from nodeeditor.node_binary_format import BinarySceneReader, writeBinaryScene
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_scene import Scene, InvalidFile
+from examples.example_calculator.calc_conf import get_class_from_opcode, get_class_from_data, OP_NODE_INPUT, \
+    OP_NODE_ADD, OP_NODE_OUTPUT
+
+
+class TestBinaryFormat(unittest.TestCase):
+    """Tests for saving and loading `Scenes` in the binary format"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.directory = tempfile.TemporaryDirectory()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.scene = Scene(headless=True)
+            self.scene.setNodeClassSelector(get_class_from_data)
+            input = get_class_from_opcode(OP_NODE_INPUT)(self.scene)
+            input.setInputText("7")
+            input.title = "Vstup č. 1"
+            input.setPos(-12.5, 300)
+            add = get_class_from_opcode(OP_NODE_ADD)(self.scene)
+            output = get_class_from_opcode(OP_NODE_OUTPUT)(self.scene)
+            Edge(self.scene, input.outputs[0], add.inputs[0])
+            Edge(self.scene, input.outputs[0], add.inputs[1])
+            Edge(self.scene, add.outputs[0], output.inputs[0])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def roundTrip(self, name:str) -> Scene:
+        filename = os.path.join(self.directory.name, name)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.scene.saveToFile(filename)
+            scene = Scene(headless=True)
+            scene.setNodeClassSelector(get_class_from_data)
+            scene.loadFromFile(filename)
+        return scene
+
+    def test_round_trip(self):
+        """Test that both formats load the same scene"""
+        binary, text = self.roundTrip("scene.nsb"), self.roundTrip("scene.json")
+        self.assertEqual(binary.serialize(), self.scene.serialize())
+        self.assertEqual(binary.serialize(), text.serialize())
+
+    def test_columns(self):
+        """Test reading the columns as memoryview and numpy arrays"""
+        file = io.BytesIO()
+        writeBinaryScene(self.scene.serialize(lazy=True), file)
+        with BinarySceneReader(file.getvalue()) as reader:
+            self.assertEqual(reader.getCount('nodes'), 3)
+            self.assertEqual(reader.column('nodes', 'pos_x').tolist()[0], -12.5)
+            # outputs accept multiple edges
+            self.assertEqual(reader.column('sockets', 'flags').tolist(), [3, 0, 0, 3, 0])
+            self.assertEqual(reader.column('edges', 'start').tolist(), [0, 0, 3])
+            if numpy is not None:
+                self.assertEqual(reader.numpyColumn('nodes', 'pos_y')[0], 300.0)
+
+    def test_invalid_file(self):
+        """Test that JSON or empty file with binary extension raises InvalidFile"""
+        filename = os.path.join(self.directory.name, "scene.nsb")
+        for content in (b"", b'{"id": 1, "nodes": [], "edges": []}'):
+            with open(filename, "wb") as file: file.write(content)
+            self.assertRaises(InvalidFile, Scene(headless=True).loadFromFile, filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
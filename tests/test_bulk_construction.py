@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+"""Tests for bulk construction of `Nodes` and `Edges` in :class:`~nodeeditor.node_scene.Scene`."""
+
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_node import Node
+from nodeeditor.node_scene import Scene
+
+
+class TestBulkConstruction(unittest.TestCase):
+    """Tests for `Scene.addNodesBulk` and `Scene.addEdgesBulk`"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.app = QApplication.instance() or QApplication([])
+        self.scene = Scene()
+
+    def buildChain(self, scene, count):
+        nodes = scene.addNodesBulk(
+            {'title': "Node %d" % i, 'inputs': [1], 'outputs': [1], 'pos': (i * 200, 0)} for i in range(count)
+        )
+        edges = scene.addEdgesBulk((a.outputs[0], b.inputs[0]) for a, b in zip(nodes, nodes[1:]))
+        return nodes, edges
+
+    def test_bulk_creates_graphics(self):
+        """Test that bulk created items get their graphics attached"""
+        nodes, edges = self.buildChain(self.scene, 5)
+        self.assertEqual(self.scene.nodes, nodes)
+        self.assertEqual(self.scene.edges, edges)
+        self.assertFalse(self.scene.isGraphicsDeferred())
+        for node in nodes:
+            self.assertIsNotNone(node.grNode)
+            self.assertIs(node.grNode.scene(), self.scene.grScene)
+            self.assertIsNotNone(node.inputs[0].grSocket)
+        self.assertEqual(nodes[3].pos.x(), 600)
+        self.assertEqual(nodes[3].grNode.pos().x(), 600)
+        for edge in edges:
+            self.assertIs(edge.grEdge.scene(), self.scene.grScene)
+            self.assertIn(edge, edge.start_socket.edges)
+            self.assertIn(edge, edge.end_socket.edges)
+
+    def test_bulk_matches_regular_construction(self):
+        """Test that bulk construction serializes the same as the regular constructors"""
+        nodes, edges = self.buildChain(self.scene, 3)
+
+        regular = Scene()
+        prev = None
+        for i in range(3):
+            node = Node(regular, "Node %d" % i, inputs=[1], outputs=[1])
+            node.setPos(i * 200, 0)
+            if prev is not None: Edge(regular, prev.outputs[0], node.inputs[0])
+            prev = node
+
+        def strip_ids(data):
+            return [(n['title'], n['pos_x'], n['pos_y'], len(n['inputs'])) for n in data['nodes']], len(data['edges'])
+
+        self.assertEqual(strip_ids(self.scene.serialize()), strip_ids(regular.serialize()))
+        for bulk_edge, regular_edge in zip(edges, regular.edges):
+            self.assertEqual(bulk_edge.grEdge.posSource, regular_edge.grEdge.posSource)
+            self.assertEqual(bulk_edge.grEdge.posDestination, regular_edge.grEdge.posDestination)
+
+    def test_bulk_headless(self):
+        """Test that bulk construction in headless `Scene` creates no graphics"""
+        scene = Scene(headless=True)
+        nodes, edges = self.buildChain(scene, 4)
+        self.assertEqual(len(scene.nodes), 4)
+        self.assertEqual(len(scene.edges), 3)
+        self.assertIsNone(nodes[0].grNode)
+        self.assertIsNone(edges[0].grEdge)
+        self.assertIs(scene.getNodeByID(nodes[2].id), nodes[2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+
+"""Tests for evaluation set up by :class:`~examples.example_calculator.calc_sub_window.CalculatorSubWindow`."""
+
+import os
+import time
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from nodeeditor.node_edge import Edge
+from examples.example_calculator.calc_conf import get_class_from_opcode, OP_NODE_INPUT, OP_NODE_ADD, OP_NODE_MUL, \
+    OP_NODE_OUTPUT
+from examples.example_calculator.calc_sub_window import CalculatorSubWindow
+
+
+app = QApplication.instance() or QApplication([])
+
+
+class TestCalculatorSubWindow(unittest.TestCase):
+    """Tests for edits evaluated in the calculator window (pull mode, compiler, background evaluator)"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.window = CalculatorSubWindow()
+        self.window.resize(800, 600)
+        self.scene = self.window.scene
+        self.input = get_class_from_opcode(OP_NODE_INPUT)(self.scene)
+        self.add = get_class_from_opcode(OP_NODE_ADD)(self.scene)
+        self.output = get_class_from_opcode(OP_NODE_OUTPUT)(self.scene)
+        Edge(self.scene, self.input.outputs[0], self.add.inputs[0])
+        Edge(self.scene, self.input.outputs[0], self.add.inputs[1])
+        Edge(self.scene, self.add.outputs[0], self.output.inputs[0])
+        self.scene.evaluator.requestOutputs([self.output])
+
+    def tearDown(self):
+        self.scene.evaluation_queue.cancel()
+        self.scene.background_evaluator.shutdown()
+
+    def test_stats_recorded(self):
+        """Test that edits are profiled when evaluation statistics are enabled"""
+        self.scene.evaluation_stats.setEnabled()
+        self.input.setInputText("3")
+        self.scene.evaluation_queue.flush()
+
+        self.assertEqual(self.output.value, 6)
+        self.assertEqual(self.scene.evaluation_stats.getNodeStats(self.add).calls, 1)
+        self.assertFalse(self.scene.background_evaluator.isBusy())
+
+    def waitForResults(self, timeout=5.0):
+        end = time.time() + timeout
+        while self.scene.background_evaluator.isBusy() and time.time() < end:
+            app.processEvents()
+            time.sleep(0.001)
+        self.assertFalse(self.scene.background_evaluator.isBusy())
+
+    def test_pull_mode_with_compiler(self):
+        """Test that the compiled graph doesn't evaluate outputs nobody demands"""
+        mul = get_class_from_opcode(OP_NODE_MUL)(self.scene)
+        hidden = get_class_from_opcode(OP_NODE_OUTPUT)(self.scene)
+        Edge(self.scene, self.input.outputs[0], mul.inputs[0])
+        Edge(self.scene, self.input.outputs[0], mul.inputs[1])
+        Edge(self.scene, mul.outputs[0], hidden.inputs[0])
+        # far outside of the viewport
+        hidden.setPos(100000, 100000)
+        self.assertNotIn(hidden, self.scene.evaluator.getDemandedOutputs())
+        self.assertTrue(self.scene.compiler.isEnabled())
+
+        self.input.setInputText("3")
+        self.scene.evaluation_queue.flush()
+        self.waitForResults()
+
+        self.assertEqual(self.output.value, 6)
+        self.assertTrue(mul.isDirty())
+        self.assertTrue(hidden.isDirty())
+        self.assertIsNone(hidden.value)
+
+        # the compiled graph is used without pull mode
+        self.scene.evaluator.setPullMode(False)
+        self.input.setInputText("4")
+        self.scene.evaluation_queue.flush()
+        self.assertFalse(self.scene.background_evaluator.isBusy())
+        self.assertEqual(hidden.value, 16)
+
+
+if __name__ == '__main__':
+    unittest.main()
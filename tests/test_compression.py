@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+
+"""Tests for compressed `Scene` files, :mod:`nodeeditor.node_compression`."""
+
+import contextlib
+import gzip
+import io
+import os
+import tempfile
+import unittest
+
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_node import Node
+from nodeeditor.node_scene import Scene, InvalidFile
+
+
+class TestCompression(unittest.TestCase):
+    """Tests for saving and loading `Scenes` compressed by gzip and xz"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.scene = Scene(headless=True)
+        nodes = [Node(self.scene, "Node", inputs=[1], outputs=[1]) for i in range(20)]
+        for a, b in zip(nodes, nodes[1:]): Edge(self.scene, a.outputs[0], b.inputs[0])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def load(self, filename, progress_callback=None):
+        scene = Scene(headless=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            scene.loadFromFile(filename, progress_callback)
+        return scene
+
+    def test_round_trip(self):
+        """Test that compressed files are smaller and load the same scene, even renamed"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.scene.saveToFile(self.path("scene.json"))
+            for name, magic in (("scene.json.gz", b"\x1f\x8b"), ("scene.json.xz", b"\xfd7zXZ\x00")):
+                self.scene.saveToFile(self.path(name))
+                with open(self.path(name), "rb") as file: self.assertEqual(file.read(len(magic)), magic)
+                self.assertLess(os.path.getsize(self.path(name)), os.path.getsize(self.path("scene.json")) / 5)
+
+                progress = []
+                loaded = self.load(self.path(name), lambda position, size: progress.append((position, size)))
+                self.assertEqual(loaded.serialize(), self.scene.serialize())
+                self.assertEqual(progress[-1], (os.path.getsize(self.path(name)),) * 2)
+
+                # detected by the magic bytes, not by the extension
+                os.replace(self.path(name), self.path("renamed.json"))
+                self.assertEqual(self.load(self.path("renamed.json")).serialize(), self.scene.serialize())
+
+    def test_corrupted(self):
+        """Test that truncated compressed file raises InvalidFile"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.scene.saveToFile(self.path("scene.json.gz"))
+        with open(self.path("scene.json.gz"), "rb") as file: data = file.read()
+        with open(self.path("scene.json.gz"), "wb") as file: file.write(data[:len(data) // 2])
+        self.assertRaises(InvalidFile, self.load, self.path("scene.json.gz"))
+        with gzip.open(self.path("scene.json.gz"), "wb") as file: file.write(b"{nodes")
+        self.assertRaises(InvalidFile, self.load, self.path("scene.json.gz"))
+
+
+if __name__ == '__main__':
+    unittest.main()
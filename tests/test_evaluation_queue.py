@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+
+"""Tests for :class:`~nodeeditor.node_scene_evaluation_queue.SceneEvaluationQueue`."""
+
+import os
+import time
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_scene import Scene
+from examples.example_calculator.calc_conf import get_class_from_opcode, OP_NODE_INPUT, OP_NODE_ADD, OP_NODE_OUTPUT
+
+
+app = QApplication.instance() or QApplication([])
+
+
+class CountingAdd(get_class_from_opcode(OP_NODE_ADD)):
+    """Add node counting its evaluations"""
+    evaluations = 0
+
+    def evalImplementation(self):
+        CountingAdd.evaluations += 1
+        return super().evalImplementation()
+
+
+class TestEvaluationQueue(unittest.TestCase):
+    """Tests for coalescing evaluation requests"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.scene = Scene(headless=True)
+        self.input1 = get_class_from_opcode(OP_NODE_INPUT)(self.scene)
+        self.input2 = get_class_from_opcode(OP_NODE_INPUT)(self.scene)
+        self.add = CountingAdd(self.scene)
+        self.output = get_class_from_opcode(OP_NODE_OUTPUT)(self.scene)
+        Edge(self.scene, self.input1.outputs[0], self.add.inputs[0])
+        Edge(self.scene, self.input2.outputs[0], self.add.inputs[1])
+        Edge(self.scene, self.add.outputs[0], self.output.inputs[0])
+        self.output.eval()
+
+        self.queue = self.scene.evaluation_queue
+        self.queue.setEnabled()
+        CountingAdd.evaluations = 0
+
+    def tearDown(self):
+        self.queue.cancel()
+
+    def processEvents(self, seconds=0.0):
+        end = time.time() + seconds
+        while True:
+            app.processEvents()
+            if time.time() >= end: break
+            time.sleep(0.005)
+
+    def test_coalesced_in_one_tick(self):
+        """Test that typing a number is evaluated once"""
+        text = ""
+        for digit in "1234567890":
+            text += digit
+            self.input1.setInputText(text)
+        self.input2.setInputText("5")
+        self.assertTrue(self.queue.hasPending())
+        self.assertEqual(CountingAdd.evaluations, 0)
+
+        self.processEvents()
+        self.assertFalse(self.queue.hasPending())
+        self.assertEqual(CountingAdd.evaluations, 1)
+        self.assertEqual(self.output.value, 1234567895)
+
+    def test_debounce(self):
+        """Test that evaluation waits until there are no requests for the debounce window"""
+        self.queue.setDebounce(50)
+        self.input1.setInputText("2")
+        self.processEvents(0.02)
+        self.input1.setInputText("3")
+        self.processEvents(0.02)
+        self.assertEqual(CountingAdd.evaluations, 0)
+
+        self.processEvents(0.1)
+        self.assertEqual(CountingAdd.evaluations, 1)
+        self.assertEqual(self.output.value, 4)
+
+    def test_disable_flushes(self):
+        """Test that disabling the queue evaluates pending requests"""
+        self.input1.setInputText("7")
+        self.queue.setEnabled(False)
+        self.assertEqual(self.output.value, 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+
+"""Tests for :class:`~nodeeditor.node_scene_evaluation_stats.SceneEvaluationStats`."""
+
+import time
+import unittest
+
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_scene import Scene
+from examples.example_calculator.calc_conf import get_class_from_opcode, OP_NODE_INPUT, OP_NODE_ADD, OP_NODE_OUTPUT
+
+
+class SlowAdd(get_class_from_opcode(OP_NODE_ADD)):
+    """Add node taking some time"""
+
+    def evalOperation(self, input1, input2):
+        time.sleep(0.005)
+        return super().evalOperation(input1, input2)
+
+
+class TestEvaluationStats(unittest.TestCase):
+    """Tests for per node evaluation profiling"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.scene = Scene(headless=True)
+        self.input = get_class_from_opcode(OP_NODE_INPUT)(self.scene)
+        self.fast = get_class_from_opcode(OP_NODE_ADD)(self.scene)
+        self.slow = SlowAdd(self.scene)
+        self.output = get_class_from_opcode(OP_NODE_OUTPUT)(self.scene)
+        Edge(self.scene, self.input.outputs[0], self.fast.inputs[0])
+        Edge(self.scene, self.input.outputs[0], self.fast.inputs[1])
+        Edge(self.scene, self.fast.outputs[0], self.slow.inputs[0])
+        Edge(self.scene, self.input.outputs[0], self.slow.inputs[1])
+        Edge(self.scene, self.slow.outputs[0], self.output.inputs[0])
+        self.stats = self.scene.evaluation_stats
+
+    def test_disabled(self):
+        """Test that nothing is recorded while profiling is disabled"""
+        self.input.setInputText("2")
+        self.assertEqual(self.stats.getStats(), [])
+
+    def test_profile(self):
+        """Test that evaluations, cache hits and invalidations are counted per node"""
+        self.stats.setEnabled()
+        self.input.setInputText("2")
+        self.input.setInputText("3")
+        self.assertEqual(self.output.value, 9)
+
+        stats = self.stats.getStats()
+        self.assertEqual(stats[0].node_id, self.slow.id)
+        self.assertEqual(self.stats.getHeat(self.slow), 1.0)
+        self.assertLess(self.stats.getHeat(self.fast), 1.0)
+        self.assertEqual(self.stats.getNodeStats(self.slow).calls, 2)
+        self.assertGreaterEqual(self.stats.getNodeStats(self.slow).max_time, 0.005)
+        # the input is read by both adds, one of the reads is served from cache
+        self.assertGreater(self.stats.getNodeStats(self.input).cache_hits, 0)
+
+        self.input.setInputText("x")
+        self.assertEqual(self.stats.getNodeStats(self.input).invalidations, 1)
+
+        self.stats.reset()
+        self.assertEqual(self.stats.getStats(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
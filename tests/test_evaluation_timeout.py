@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+
+"""Tests for evaluation time budgets and :class:`~nodeeditor.node_cancellation.CancellationToken`."""
+
+import time
+import unittest
+
+from nodeeditor.node_cancellation import CancellationToken, EvaluationCancelled, EvaluationTimeout
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_scene import Scene
+from examples.example_calculator.calc_conf import get_class_from_opcode, OP_NODE_INPUT, OP_NODE_ADD, OP_NODE_OUTPUT
+
+
+class SpinningAdd(get_class_from_opcode(OP_NODE_ADD)):
+    """Add node working until its token tells it to stop"""
+    memoize = False
+
+    def evalImplementation(self, token=None):
+        while token is not None:
+            token.check()
+            time.sleep(0.001)
+        return super().evalImplementation(token)
+
+
+class SleepingAdd(get_class_from_opcode(OP_NODE_ADD)):
+    """Add node which ignores the token"""
+    memoize = False
+
+    def evalImplementation(self):
+        time.sleep(0.05)
+        return super().evalImplementation()
+
+
+class TestCancellationToken(unittest.TestCase):
+    """Tests for deadlines and cancellation of tokens"""
+
+    def test_child_token(self):
+        """Test that a child expires with its own budget and is cancelled together with the parent"""
+        parent = CancellationToken()
+        child = parent.createChild(0.0)
+        self.assertFalse(parent.isExpired())
+        self.assertTrue(child.isExpired())
+        self.assertEqual(child.getExpiredTimeout(), 0.0)
+        self.assertRaises(EvaluationTimeout, child.check)
+
+        other = parent.createChild(10.0)
+        parent.cancel()
+        self.assertTrue(other.isCancelled())
+        self.assertRaises(EvaluationCancelled, other.check)
+        self.assertIsNone(parent.remaining())
+        self.assertLessEqual(other.remaining(), 10.0)
+
+
+class TestEvaluationTimeout(unittest.TestCase):
+    """Tests for time budgets of `SceneEvaluator`"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.scene = Scene(headless=True)
+        self.input = get_class_from_opcode(OP_NODE_INPUT)(self.scene)
+
+    def connect(self, node):
+        Edge(self.scene, self.input.outputs[0], node.inputs[0])
+        Edge(self.scene, self.input.outputs[0], node.inputs[1])
+        output = get_class_from_opcode(OP_NODE_OUTPUT)(self.scene)
+        Edge(self.scene, node.outputs[0], output.inputs[0])
+        self.input.eval()
+        return output
+
+    def assertTimedOut(self, node, output):
+        self.assertTrue(node.isInvalid())
+        self.assertIn("timed out", node.getToolTip())
+        self.assertTrue(output.isDirty())
+        self.assertIsNone(output.value)
+
+    def test_cooperative_node_timeout(self):
+        """Test that the token stops a node and its descendants are skipped"""
+        node = SpinningAdd(self.scene)
+        node.eval_timeout = 0.02
+        output = self.connect(node)
+
+        start = time.perf_counter()
+        self.assertEqual(self.scene.evaluator.evaluate([output]), [None])
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertTimedOut(node, output)
+
+    def test_non_cooperative_node_timeout(self):
+        """Test that a node finishing after its budget is marked invalid anyway"""
+        node = SleepingAdd(self.scene)
+        self.scene.evaluator.setNodeTimeout(0.01)
+        output = self.connect(node)
+
+        self.scene.evaluator.evaluate([node])
+        self.assertTimedOut(node, output)
+
+        self.scene.evaluator.setNodeTimeout(None)
+        self.assertEqual(self.scene.evaluator.evaluate([output]), [2])
+        self.assertFalse(node.isInvalid())
+        self.assertEqual(node.getToolTip(), "")
+
+    def test_evaluation_timeout(self):
+        """Test that the budget of the pass stops it"""
+        node = SpinningAdd(self.scene)
+        output = self.connect(node)
+
+        self.assertEqual(self.scene.evaluator.evaluate([output], timeout=0.02), [None])
+        self.assertTimedOut(node, output)
+        self.assertFalse(self.scene.evaluator.isCancelled())
+
+    def test_evaluation_timeout_after_node(self):
+        """Test that a node finishing in its own budget keeps its value when the pass runs out of time"""
+        node = SleepingAdd(self.scene)
+        output = self.connect(node)
+
+        self.assertEqual(self.scene.evaluator.evaluate([output], timeout=0.01), [None])
+        self.assertFalse(node.isInvalid())
+        self.assertFalse(node.isDirty())
+        self.assertEqual(node.value, 2)
+        self.assertEqual(node.getToolTip(), "")
+        self.assertTrue(output.isDirty())
+        self.assertFalse(self.scene.evaluator.isCancelled())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+
+"""Tests for headless (model-only) :class:`~nodeeditor.node_scene.Scene`."""
+
+import os
+import tempfile
+import unittest
+
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_node import Node
+from nodeeditor.node_scene import Scene
+from examples.example_calculator.calc_conf import get_class_from_opcode, OP_NODE_INPUT, OP_NODE_ADD, OP_NODE_OUTPUT
+
+
+def calc_class_selector(data):
+    return get_class_from_opcode(data['op_code'])
+
+
+class TestHeadlessScene(unittest.TestCase):
+    """Tests for `Scene` without graphics layer"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.scene = Scene(headless=True)
+        self.scene.setNodeClassSelector(calc_class_selector)
+
+    def buildCalcGraph(self, scene):
+        input1 = get_class_from_opcode(OP_NODE_INPUT)(scene)
+        input2 = get_class_from_opcode(OP_NODE_INPUT)(scene)
+        add = get_class_from_opcode(OP_NODE_ADD)(scene)
+        output = get_class_from_opcode(OP_NODE_OUTPUT)(scene)
+        Edge(scene, input1.outputs[0], add.inputs[0])
+        Edge(scene, input2.outputs[0], add.inputs[1])
+        Edge(scene, add.outputs[0], output.inputs[0])
+        return input1, input2, add, output
+
+    def test_no_graphics(self):
+        """Test that nodes, sockets and edges are created without graphics items"""
+        node1 = Node(self.scene, "Node 1", inputs=[1], outputs=[1])
+        node2 = Node(self.scene, "Node 2", inputs=[1], outputs=[1])
+        edge = Edge(self.scene, node1.outputs[0], node2.inputs[0])
+        node2.setPos(100, 50)
+
+        self.assertTrue(self.scene.isHeadless())
+        self.assertIsNone(node1.grNode)
+        self.assertIsNone(node1.content)
+        self.assertIsNone(node1.outputs[0].grSocket)
+        self.assertIsNone(edge.grEdge)
+        self.assertEqual((node2.pos.x(), node2.pos.y()), (100.0, 50.0))
+        self.assertEqual(node2.getSocketScenePosition(node2.inputs[0])[0], 99.0)
+
+    def test_evaluate(self):
+        """Test that a calculator graph evaluates without QApplication"""
+        input1, input2, add, output = self.buildCalcGraph(self.scene)
+        input1.setInputText("5")
+        input2.setInputText("7")
+        self.assertEqual(output.value, 12)
+
+    def test_save_load_roundtrip(self):
+        """Test that content state survives saving and loading"""
+        input1, input2, add, output = self.buildCalcGraph(self.scene)
+        input1.setInputText("3")
+        input1.setPos(-10.5, 20)
+        filename = os.path.join(tempfile.mkdtemp(), "graph.json")
+        self.scene.saveToFile(filename)
+
+        other = Scene(headless=True)
+        other.setNodeClassSelector(calc_class_selector)
+        other.loadFromFile(filename)
+        self.assertEqual(other.serialize(), self.scene.serialize())
+
+        other_output = other.getNodeByID(output.id)
+        other_output.eval()
+        self.assertEqual(other_output.value, 4)
+
+    def test_undo(self):
+        """Test history in headless scene"""
+        input1, input2, add, output = self.buildCalcGraph(self.scene)
+        self.scene.history.storeHistory("Initial")
+        add.remove()
+        self.scene.history.storeHistory("Removed")
+        self.scene.history.undo()
+        self.assertEqual(len(self.scene.nodes), 4)
+        self.assertEqual(len(self.scene.edges), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
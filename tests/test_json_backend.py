@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+
+"""Tests for :mod:`nodeeditor.node_json_backend`."""
+
+import json
+import math
+import unittest
+from collections import OrderedDict
+
+from nodeeditor import node_json_backend
+from nodeeditor.node_json_backend import BACKENDS, getJsonBackend, setJsonBackend
+
+
+class TestJsonBackend(unittest.TestCase):
+    """Tests that every installed backend has the semantics of the standard json"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.previous = node_json_backend._backend
+        self.backends = [backend for backend in BACKENDS.values() if backend.isAvailable()]
+
+    def tearDown(self):
+        node_json_backend._backend = self.previous
+
+    def test_same_data(self):
+        """Test key order, non-string keys and values json handles specially"""
+        data = OrderedDict([('z', 1), ('a', {5: "é", None: [1.5, (2, 3)], 2.5: True}), ('big', 2 ** 70)])
+        expected = json.loads(json.dumps(data))
+        for backend in self.backends:
+            for indent, compact in ((None, False), (None, True), (4, False)):
+                text = backend.dumps(data, indent=indent, compact=compact)
+                self.assertIsInstance(text, str)
+                loaded = backend.loads(text)
+                self.assertEqual(loaded, expected)
+                self.assertEqual(list(loaded), ['z', 'a', 'big'])
+            self.assertRaises(TypeError, backend.dumps, {'set': {1}})
+            self.assertTrue(math.isnan(backend.loads(b'{"x": [NaN]}')['x'][0]))
+            self.assertRaises(json.JSONDecodeError, backend.loads, '{"x": ')
+
+    def test_non_finite_floats(self):
+        """Test that NaN and infinity are written as the standard json writes them, not as null"""
+        data = OrderedDict([('nan', float('nan')), ('values', [None, 1.5, {'inf': float('inf')}]),
+                            ('neg', (float('-inf'),))])
+        for backend in self.backends:
+            for indent, compact in ((None, False), (None, True), (4, False)):
+                loaded = json.loads(backend.dumps(data, indent=indent, compact=compact))
+                self.assertTrue(math.isnan(loaded['nan']))
+                self.assertEqual(loaded['values'], [None, 1.5, {'inf': float('inf')}])
+                self.assertEqual(loaded['neg'], [float('-inf')])
+
+    def test_configuration(self):
+        """Test choosing the backend of the process"""
+        self.assertIs(setJsonBackend('json'), BACKENDS['json'])
+        self.assertIs(getJsonBackend(), BACKENDS['json'])
+        self.assertIs(setJsonBackend('auto'), self.backends[0])
+        self.assertRaises(ValueError, setJsonBackend, 'unknown')
+
+
+if __name__ == '__main__':
+    unittest.main()
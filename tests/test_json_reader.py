@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+
+"""Tests for :mod:`nodeeditor.node_json_reader`."""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_json_reader import JsonStreamReader
+from nodeeditor.node_node import Node
+from nodeeditor.node_scene import Scene, InvalidFile
+
+
+class TestJsonStreamReader(unittest.TestCase):
+    """Tests for parsing JSON and loading `Scenes` incrementally"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "scene.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read(self, data:bytes, chunk_size:int):
+        reader = JsonStreamReader(io.BytesIO(data), chunk_size=chunk_size)
+        return {key: list(value) if key == 'items' else value
+                for key, value in reader.iterObject(stream_keys=('items',))}
+
+    def test_chunk_boundaries(self):
+        """Test that values split between chunks are parsed the same as by json.loads"""
+        document = {'id': 1234567890, 'items': [{'title': "é ü", 'pos': [1.5e10, -3]}, [], 12345, "x"],
+                    'skipped': None, 'flag': True}
+        for indent in (None, 4):
+            data = json.dumps(document, indent=indent, ensure_ascii=False).encode('utf-8')
+            for chunk_size in (1, 2, 7, 1 << 16):
+                self.assertEqual(self.read(data, chunk_size), document)
+
+        self.assertEqual(self.read(b' { } ', 1), {})
+        for invalid in (b'{"items": [1, 2}', b'{"a": 1} 2', b'[]', b'{"a": 1'):
+            self.assertRaises(json.JSONDecodeError, self.read, invalid, 3)
+
+    def test_load_scene(self):
+        """Test that the loaded scene has all nodes, edges and progress is reported"""
+        scene = Scene(headless=True)
+        nodes = [Node(scene, "Node %d" % i, inputs=[1], outputs=[1]) for i in range(50)]
+        for a, b in zip(nodes, nodes[1:]): Edge(scene, a.outputs[0], b.inputs[0])
+        data = scene.serialize()
+        # edges before nodes still have to be connected
+        data.move_to_end('nodes')
+        with open(self.filename, "w") as file: json.dump(data, file)
+
+        progress = []
+        loaded = Scene(headless=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            loaded.loadFromFile(self.filename, lambda position, size: progress.append((position, size)))
+        self.assertEqual(loaded.serialize(), scene.serialize())
+        self.assertEqual(progress[-1], (os.path.getsize(self.filename),) * 2)
+
+        with open(self.filename, "w") as file: file.write('{"nodes": [')
+        self.assertRaises(InvalidFile, loaded.loadFromFile, self.filename)
+
+    def test_deserialize_override(self):
+        """Test that loading goes through Scene.deserialize and missing arrays are handled as empty"""
+        class RecordingScene(Scene):
+            def deserialize(self, data, hashmap={}, restore_id=True):
+                self.deserialized = True
+                return super().deserialize(data, hashmap, restore_id)
+
+        scene = RecordingScene(headless=True)
+        nodes = [Node(scene, "Node %d" % i, inputs=[1], outputs=[1]) for i in range(3)]
+        for a, b in zip(nodes, nodes[1:]): Edge(scene, a.outputs[0], b.inputs[0])
+        data = scene.serialize()
+        del data['edges']
+        with open(self.filename, "w") as file: json.dump(data, file)
+
+        with contextlib.redirect_stdout(io.StringIO()): scene.loadFromFile(self.filename)
+        self.assertTrue(scene.deserialized)
+        self.assertEqual(len(scene.nodes), 3)
+        self.assertEqual(scene.edges, [])
+
+        for filename in ("scene.nsb", "scene.json"):
+            loaded = RecordingScene(headless=True)
+            scene.saveToFile(os.path.join(self.directory.name, filename))
+            with contextlib.redirect_stdout(io.StringIO()):
+                loaded.loadFromFile(os.path.join(self.directory.name, filename))
+            self.assertTrue(loaded.deserialized)
+            self.assertEqual(loaded.serialize(), scene.serialize())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+
+"""Tests for :mod:`nodeeditor.node_json_writer`."""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_json_writer import dumpJson
+from nodeeditor.node_node import Node
+from nodeeditor.node_scene import Scene
+
+
+class TestJsonStreamWriter(unittest.TestCase):
+    """Tests for writing JSON with lazily serialized parts"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.scene = Scene(headless=True)
+        a = Node(self.scene, "A é", inputs=[1], outputs=[1])
+        b = Node(self.scene, "B", inputs=[1, 2], outputs=[1])
+        Edge(self.scene, a.outputs[0], b.inputs[1])
+
+    def dump(self, data, indent=4):
+        file = io.StringIO()
+        dumpJson(data, file, indent)
+        return file.getvalue()
+
+    def test_byte_identical(self):
+        """Test that the output is the same as of json.dumps, indented and compact"""
+        data = self.scene.serialize()
+        self.assertEqual(self.dump(self.scene.serialize(lazy=True)), json.dumps(data, indent=4))
+        self.assertEqual(self.dump(self.scene.serialize(lazy=True), None), json.dumps(data, separators=(',', ':')))
+
+        nested = {'empty': iter([]), 'list': [1, {'inner': iter([{}, {'x': [2.5]}])}], 7: None}
+        expected = {'empty': [], 'list': [1, {'inner': [{}, {'x': [2.5]}]}], 7: None}
+        self.assertEqual(self.dump(nested, 2), json.dumps(expected, indent=2))
+
+    def test_save_to_file(self):
+        """Test that saved compact scene loads back the same"""
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "scene.json")
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.scene.saveToFile(filename, compact=True)
+            with open(filename) as file: text = file.read()
+            self.assertNotIn("\n", text)
+            self.assertEqual(json.loads(text), json.loads(json.dumps(self.scene.serialize())))
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                scene = Scene(headless=True)
+                scene.loadFromFile(filename)
+            self.assertEqual(len(scene.nodes), 2)
+            self.assertEqual(len(scene.edges), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+
+"""Tests for :class:`~nodeeditor.node_memo_cache.MemoCache`."""
+
+import unittest
+
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_memo_cache import MemoCache
+from nodeeditor.node_scene import Scene
+from examples.example_calculator.calc_conf import get_class_from_opcode, OP_NODE_INPUT, OP_NODE_MUL, OP_NODE_OUTPUT
+
+
+class CountingMul(get_class_from_opcode(OP_NODE_MUL)):
+    """Multiply node counting calls of its kernel"""
+    calls = 0
+
+    def evalOperation(self, input1, input2):
+        CountingMul.calls += 1
+        return super().evalOperation(input1, input2)
+
+
+class TestMemoCache(unittest.TestCase):
+    """Tests for LRU cache of node results"""
+
+    def test_lru_budget(self):
+        """Test that the least recently used entries are evicted to stay in the budget"""
+        cache = MemoCache(max_entries=2)
+        cache.store(('a',), 1, node_id=1)
+        cache.store(('b',), 2, node_id=1)
+        self.assertEqual(cache.lookup(('a',)), (True, 1))
+        cache.store(('c',), 3, node_id=2)
+        self.assertEqual(cache.lookup(('b',)), (False, None))
+        self.assertEqual(cache.getStats()['evictions'], 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        cache.invalidateNode(1)
+        self.assertEqual(len(cache), 1)
+
+        small = MemoCache(max_bytes=200)
+        for i in range(100): small.store((i,), i, node_id=1)
+        self.assertLessEqual(small.bytes, 200)
+        self.assertGreater(small.evictions, 0)
+
+    def test_recurring_inputs(self):
+        """Test that toggling an input back and forth reuses the results"""
+        scene = Scene(headless=True)
+        scene.setMemoCache(MemoCache())
+        input_node = get_class_from_opcode(OP_NODE_INPUT)(scene)
+        prev = input_node
+        for i in range(5):
+            mul = CountingMul(scene)
+            Edge(scene, prev.outputs[0], mul.inputs[0])
+            Edge(scene, input_node.outputs[0], mul.inputs[1])
+            prev = mul
+        output = get_class_from_opcode(OP_NODE_OUTPUT)(scene)
+        Edge(scene, prev.outputs[0], output.inputs[0])
+
+        input_node.setInputText("2")
+        input_node.setInputText("3")
+        CountingMul.calls = 0
+        input_node.setInputText("2")
+        self.assertEqual(output.value, 64)
+        input_node.setInputText("3")
+        self.assertEqual(output.value, 729)
+        self.assertEqual(CountingMul.calls, 0)
+
+        # removed node doesn't keep its entries
+        entries = len(scene.memo_cache)
+        mul.remove()
+        self.assertLess(len(scene.memo_cache), entries)
+
+    def test_content_change(self):
+        """Test that changed content drops the entries of the node"""
+        scene = Scene(headless=True)
+        scene.setMemoCache(MemoCache())
+        input_node = get_class_from_opcode(OP_NODE_INPUT)(scene)
+        mul = CountingMul(scene)
+        Edge(scene, input_node.outputs[0], mul.inputs[0])
+        Edge(scene, input_node.outputs[0], mul.inputs[1])
+        input_node.setInputText("3")
+        self.assertEqual(mul.value, 9)
+
+        # evaluated again by the changed content, not found in the cache
+        CountingMul.calls = 0
+        mul.onContentChanged()
+        self.assertEqual(CountingMul.calls, 1)
+        self.assertEqual(len(scene.memo_cache), 1)
+
+    def test_id_change(self):
+        """Test that entries stored under the old id are dropped when a deserialized node gets a new id"""
+        scene = Scene(headless=True)
+        scene.setMemoCache(MemoCache())
+        mul = CountingMul(scene)
+        mul.evalMemoized(mul.evalOperation, 2, 3)
+        data = mul.serialize()
+        data['id'] = mul.id + 1
+        mul.deserialize(data)
+        self.assertEqual(len(scene.memo_cache), 0)
+        self.assertEqual(scene.memo_cache.bytes, 0)
+
+    def test_value_types(self):
+        """Test that equal values of different types don't share the result"""
+        scene = Scene(headless=True)
+        scene.setMemoCache(MemoCache())
+        mul = CountingMul(scene)
+        self.assertIs(type(mul.evalMemoized(mul.evalOperation, 1, 2)), int)
+        self.assertIs(type(mul.evalMemoized(mul.evalOperation, 1.0, 2)), float)
+        self.assertEqual(len(scene.memo_cache), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
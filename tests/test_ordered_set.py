@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+
+"""Tests for :class:`~nodeeditor.node_ordered_set.OrderedSet`."""
+
+import unittest
+
+from nodeeditor.node_ordered_set import OrderedSet
+
+
+class TestOrderedSet(unittest.TestCase):
+    """Tests for the list-compatible behaviour of `OrderedSet`"""
+
+    def test_keeps_insertion_order(self):
+        """Test that iteration order is the insertion order"""
+        items = OrderedSet([3, 1, 2])
+        items.append(5)
+        items.append(1)
+        self.assertEqual(list(items), [3, 1, 2, 5])
+        self.assertEqual(items, [3, 1, 2, 5])
+
+    def test_remove(self):
+        """Test that remove keeps the order and raises ValueError like a list"""
+        items = OrderedSet([3, 1, 2])
+        items.remove(1)
+        self.assertEqual(items, [3, 2])
+        self.assertNotIn(1, items)
+        self.assertRaises(ValueError, items.remove, 1)
+        items.discard(1)
+
+    def test_indexing(self):
+        """Test indexing and slicing"""
+        items = OrderedSet([3, 1, 2])
+        self.assertEqual(items[0], 3)
+        self.assertEqual(items[1], 1)
+        self.assertEqual(items[-1], 2)
+        self.assertEqual(items[1:], [1, 2])
+        self.assertRaises(IndexError, items.__getitem__, 3)
+        self.assertEqual(items.index(2), 2)
+
+    def test_list_interop(self):
+        """Test the operations existing callers use on `Scene.nodes`"""
+        items = OrderedSet([3, 1])
+        copy = items.copy()
+        copy.append(7)
+        self.assertEqual(len(items), 2)
+        self.assertEqual(items + [4], [3, 1, 4])
+        self.assertEqual(items.pop(), 1)
+        self.assertEqual(items.pop(0), 3)
+        self.assertFalse(items)
+        self.assertEqual(items, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+
+"""Tests for pull mode of :class:`~nodeeditor.node_scene_evaluator.SceneEvaluator`."""
+
+import unittest
+
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_scene import Scene
+from examples.example_calculator.calc_conf import get_class_from_opcode, OP_NODE_INPUT, OP_NODE_ADD, OP_NODE_MUL, \
+    OP_NODE_OUTPUT
+
+
+class TestPullEvaluation(unittest.TestCase):
+    """Tests for evaluating only demanded `Nodes`"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.scene = Scene(headless=True)
+        self.input = get_class_from_opcode(OP_NODE_INPUT)(self.scene)
+        # input -> add -> output1, input -> mul -> output2
+        self.add = get_class_from_opcode(OP_NODE_ADD)(self.scene)
+        self.mul = get_class_from_opcode(OP_NODE_MUL)(self.scene)
+        self.output1 = get_class_from_opcode(OP_NODE_OUTPUT)(self.scene)
+        self.output2 = get_class_from_opcode(OP_NODE_OUTPUT)(self.scene)
+        for node in (self.add, self.mul):
+            Edge(self.scene, self.input.outputs[0], node.inputs[0])
+            Edge(self.scene, self.input.outputs[0], node.inputs[1])
+        Edge(self.scene, self.add.outputs[0], self.output1.inputs[0])
+        Edge(self.scene, self.mul.outputs[0], self.output2.inputs[0])
+        self.scene.evaluator.evaluate([self.output1, self.output2])
+        self.scene.evaluator.setPullMode(True)
+
+    def test_requested_outputs(self):
+        """Test that an edit evaluates only ancestors of requested outputs, the rest on request"""
+        self.scene.evaluator.requestOutputs([self.output1])
+        self.assertEqual(self.scene.evaluator.getDemandedNodes(), {self.input, self.add, self.output1})
+
+        self.input.setInputText("3")
+        self.assertEqual(self.output1.value, 6)
+        self.assertTrue(self.mul.isDirty())
+        self.assertTrue(self.output2.isDirty())
+        self.assertEqual(self.output2.value, 1)
+
+        self.scene.evaluator.requestOutputs([self.output2])
+        self.assertEqual(self.scene.evaluator.evaluateDemanded(), [self.output2])
+        self.assertEqual(self.output2.value, 9)
+        self.assertFalse(self.mul.isDirty())
+
+    def test_demand_callback(self):
+        """Test that the callback (e.g. viewport) decides what is demanded"""
+        visible = [self.output2]
+        self.scene.evaluator.setDemandCallback(lambda: visible)
+        self.input.setInputText("5")
+        self.assertEqual(self.output2.value, 25)
+        self.assertTrue(self.output1.isDirty())
+
+        del visible[:]
+        self.scene.evaluator.setPullMode(False)
+        self.input.setInputText("1")
+        self.assertEqual(self.output1.value, 2)
+        self.assertEqual(self.output2.value, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+
+"""Tests for :py:meth:`~nodeeditor.node_scene.Scene.batch`."""
+
+import unittest
+
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_node import Node
+from nodeeditor.node_scene import Scene
+
+
+class CountingNode(Node):
+    """`Node` counting received notifications"""
+
+    def __init__(self, scene, title="Counting Node", inputs=[], outputs=[]):
+        self.connection_changes = 0
+        self.input_changes = 0
+        super().__init__(scene, title, inputs, outputs)
+
+    def onEdgeConnectionChanged(self, new_edge):
+        self.connection_changes += 1
+
+    def onInputChanged(self, socket):
+        self.input_changes += 1
+
+
+class TestSceneBatch(unittest.TestCase):
+    """Tests for collecting `Scene` notifications in a batch"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.scene = Scene(headless=True)
+        self.sources = [CountingNode(self.scene, outputs=[1]) for i in range(3)]
+        self.target = CountingNode(self.scene, inputs=[1, 1, 1])
+        self.edges = [
+            Edge(self.scene, source.outputs[0], self.target.inputs[ix]) for ix, source in enumerate(self.sources)
+        ]
+        self.scene.history.clear()
+        self.scene.history.storeInitialHistoryStamp()
+        self.scene.has_been_modified = False
+
+        self.modified_calls = 0
+        self.scene.addHasBeenModifiedListener(self.onModified)
+
+    def onModified(self):
+        self.modified_calls += 1
+
+    def test_without_batch(self):
+        """Test that every edge removal notifies the node immediately"""
+        for edge in self.edges:
+            edge.remove()
+            self.scene.history.storeHistory("Removed edge", setModified=True)
+        self.assertEqual(self.target.input_changes, 3)
+        self.assertEqual(len(self.scene.history.history_stack), 4)
+
+    def test_batch_coalesces_notifications(self):
+        """Test that a batch notifies each affected node once and stores one History Stamp"""
+        with self.scene.batch("Remove edges"):
+            for edge in self.edges:
+                edge.remove()
+                self.scene.history.storeHistory("Removed edge", setModified=True)
+            self.assertEqual(self.target.input_changes, 0)
+            self.assertEqual(self.target.connection_changes, 0)
+            self.assertEqual(self.modified_calls, 0)
+            self.assertTrue(self.scene.has_been_modified)
+
+        self.assertEqual(self.target.input_changes, 1)
+        self.assertEqual(self.target.connection_changes, 1)
+        for source in self.sources:
+            self.assertEqual(source.connection_changes, 1)
+            self.assertEqual(source.input_changes, 0)
+        self.assertEqual(self.modified_calls, 1)
+        self.assertEqual(len(self.scene.history.history_stack), 2)
+        self.assertEqual(self.scene.history.history_stack[-1]['desc'], "Remove edges")
+        self.assertEqual(len(self.scene.edges), 0)
+
+    def test_nested_batch(self):
+        """Test that only the outermost batch dispatches and stores History Stamp"""
+        with self.scene.batch("Outer"):
+            with self.scene.batch("Inner"):
+                self.edges[0].remove()
+            self.assertTrue(self.scene.isInBatch())
+            self.assertEqual(self.target.input_changes, 0)
+            self.edges[1].remove()
+        self.assertFalse(self.scene.isInBatch())
+        self.assertEqual(self.target.input_changes, 1)
+        self.assertEqual([stamp['desc'] for stamp in self.scene.history.history_stack][1:], ["Outer"])
+
+    def test_removed_node_not_notified(self):
+        """Test that nodes removed inside the batch don't get notifications"""
+        with self.scene.batch("Remove"):
+            self.edges[0].remove()
+            self.target.remove()
+        self.assertEqual(self.target.input_changes, 0)
+        self.assertEqual(self.sources[0].connection_changes, 1)
+
+    def test_batch_exception(self):
+        """Test that notifications are dispatched even when the batch fails"""
+        with self.assertRaises(RuntimeError):
+            with self.scene.batch("Failing"):
+                self.edges[0].remove()
+                raise RuntimeError("failure")
+        self.assertFalse(self.scene.isInBatch())
+        self.assertEqual(self.target.input_changes, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+
+"""Tests for :class:`~nodeeditor.node_scene_compiler.SceneCompiler`."""
+
+import unittest
+
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_node import Node
+from nodeeditor.node_scene import Scene
+from examples.example_calculator.calc_conf import get_class_from_opcode, \
+    OP_NODE_INPUT, OP_NODE_ADD, OP_NODE_SUB, OP_NODE_DIV, OP_NODE_OUTPUT
+
+
+class ScaledAdd(get_class_from_opcode(OP_NODE_ADD)):
+    """Add node multiplying the sum by a factor stored in its content"""
+
+    def getFactor(self):
+        return self.content_state.get('factor', 1)
+
+    def setFactor(self, factor):
+        self.content_state['factor'] = factor
+        self.onContentChanged()
+
+    def evalOperation(self, input1, input2):
+        return (input1 + input2) * self.getFactor()
+
+    def compileOperation(self, input1, input2):
+        return "((%s + %s) * %r)" % (input1, input2, self.getFactor())
+
+
+class TestSceneCompiler(unittest.TestCase):
+    """Tests for compiling calculator scenes into Python functions"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        # (a - b) / (a + b)
+        self.scene = Scene(headless=True)
+        self.a = get_class_from_opcode(OP_NODE_INPUT)(self.scene)
+        self.b = get_class_from_opcode(OP_NODE_INPUT)(self.scene)
+        self.sub = get_class_from_opcode(OP_NODE_SUB)(self.scene)
+        self.add = get_class_from_opcode(OP_NODE_ADD)(self.scene)
+        self.div = get_class_from_opcode(OP_NODE_DIV)(self.scene)
+        self.output = get_class_from_opcode(OP_NODE_OUTPUT)(self.scene)
+        for node in (self.sub, self.add):
+            Edge(self.scene, self.a.outputs[0], node.inputs[0])
+            Edge(self.scene, self.b.outputs[0], node.inputs[1])
+        Edge(self.scene, self.sub.outputs[0], self.div.inputs[0])
+        Edge(self.scene, self.add.outputs[0], self.div.inputs[1])
+        Edge(self.scene, self.div.outputs[0], self.output.inputs[0])
+        self.compiler = self.scene.compiler
+
+    def test_compiled_function(self):
+        """Test that the compiled function computes the same values as the nodes"""
+        compiled = self.compiler.getCompiled()
+        self.assertEqual(compiled.argument_nodes, [self.a, self.b])
+        values = dict(zip(compiled.nodes, compiled("5", "3")))
+        self.assertEqual(values[self.output], 0.25)
+        self.assertIsNone(dict(zip(compiled.nodes, compiled("3", "-3")))[self.output])
+
+    def test_cached_until_topology_changes(self):
+        """Test that the compiled function is reused until the graph changes"""
+        compiled = self.compiler.getCompiled()
+        self.assertIs(self.compiler.getCompiled(), compiled)
+        Edge(self.scene, self.add.outputs[0], self.div.inputs[0])
+        self.assertIsNot(self.compiler.getCompiled(), compiled)
+
+    def test_input_change(self):
+        """Test that editing an input is evaluated by the compiled function when enabled"""
+        self.compiler.setEnabled()
+        self.b.setInputText("3")
+        self.a.setInputText("5")
+        self.assertEqual(self.output.value, 0.25)
+        self.assertFalse(any(node.isDirty() or node.isInvalid() for node in self.scene.nodes))
+
+        # errors fall back to the usual evaluation, which sets the tooltips
+        self.a.setInputText("x")
+        self.assertTrue(self.a.isInvalid())
+        self.assertIn("invalid literal", self.a.getToolTip())
+
+    def test_content_change(self):
+        """Test that content changing the expression of a node drops the compiled function"""
+        scaled = ScaledAdd(self.scene)
+        Edge(self.scene, self.a.outputs[0], scaled.inputs[0])
+        Edge(self.scene, self.b.outputs[0], scaled.inputs[1])
+        output = get_class_from_opcode(OP_NODE_OUTPUT)(self.scene)
+        Edge(self.scene, scaled.outputs[0], output.inputs[0])
+        self.compiler.setEnabled()
+        self.a.setInputText("2")
+        self.assertEqual(output.value, 3)
+
+        compiled = self.compiler.getCompiled()
+        scaled.setFactor(10)
+        self.assertIsNot(self.compiler.getCompiled(), compiled)
+        self.assertEqual(output.value, 30)
+
+        # input values are arguments of the compiled function, it is kept
+        compiled = self.compiler.getCompiled()
+        self.a.setInputText("4")
+        self.assertIs(self.compiler.getCompiled(), compiled)
+        self.assertEqual(output.value, 50)
+
+    def test_not_compilable(self):
+        """Test that scene with a node without compiled expression is not compiled"""
+        Node(self.scene)
+        self.assertIsNone(self.compiler.getCompiled())
+        self.assertIsNone(self.compiler.evaluate())
+
+
+if __name__ == '__main__':
+    unittest.main()
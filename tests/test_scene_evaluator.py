@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+
+"""Tests for :class:`~nodeeditor.node_scene_evaluator.SceneEvaluator`."""
+
+import threading
+import time
+import unittest
+
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_node import Node
+from nodeeditor.node_scene import Scene
+from examples.example_calculator.calc_conf import get_class_from_opcode, OP_NODE_INPUT, OP_NODE_ADD, OP_NODE_OUTPUT
+
+
+class CountingAdd(get_class_from_opcode(OP_NODE_ADD)):
+    """Add node counting its evaluations"""
+
+    def __init__(self, scene):
+        self.evaluations = 0
+        super().__init__(scene)
+
+    def evalImplementation(self):
+        self.evaluations += 1
+        return super().evalImplementation()
+
+
+class TestSceneEvaluator(unittest.TestCase):
+    """Tests for topological evaluation of `Scene`"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.scene = Scene(headless=True)
+        self.input = get_class_from_opcode(OP_NODE_INPUT)(self.scene)
+
+    def buildDiamonds(self, depth):
+        # every layer has two Add nodes, both taking both nodes of the previous layer as inputs
+        layer = [self.input, self.input]
+        adds = []
+        for i in range(depth):
+            new_layer = [CountingAdd(self.scene), CountingAdd(self.scene)]
+            for node in new_layer:
+                Edge(self.scene, layer[0].outputs[0], node.inputs[0])
+                Edge(self.scene, layer[1].outputs[0], node.inputs[1])
+            adds.extend(new_layer)
+            layer = new_layer
+        output = get_class_from_opcode(OP_NODE_OUTPUT)(self.scene)
+        Edge(self.scene, layer[0].outputs[0], output.inputs[0])
+        return adds, output
+
+    def test_topological_order(self):
+        """Test that every node comes after its inputs and an edge agreeing with the order doesn't change it"""
+        adds, output = self.buildDiamonds(3)
+        order = self.scene.evaluator.getTopologicalOrder()
+        self.assertEqual(len(order), len(self.scene.nodes))
+        for edge in self.scene.edges:
+            self.assertLess(order.index(edge.start_socket.node), order.index(edge.end_socket.node))
+
+        self.assertIs(self.scene.evaluator.getTopologicalOrder(), order)
+        version = self.scene.evaluator.getTopologyVersion()
+        Edge(self.scene, self.input.outputs[0], adds[-1].inputs[0])
+        self.assertIs(self.scene.evaluator.getTopologicalOrder(), order)
+        self.assertNotEqual(self.scene.evaluator.getTopologyVersion(), version)
+
+    def test_diamonds_evaluated_once(self):
+        """Test that shared descendants are evaluated once per change"""
+        adds, output = self.buildDiamonds(12)
+        self.input.setInputText("1")
+        self.assertEqual(output.value, 2 ** 12)
+        for node in adds: node.evaluations = 0
+
+        self.input.setInputText("3")
+        self.assertEqual(output.value, 3 * 2 ** 12)
+        self.assertEqual([node.evaluations for node in adds], [1] * len(adds))
+
+    def test_deep_chain(self):
+        """Test that long chains don't hit the recursion limit"""
+        other_input = get_class_from_opcode(OP_NODE_INPUT)(self.scene)
+        prev = self.input
+        for i in range(3000):
+            add = CountingAdd(self.scene)
+            Edge(self.scene, prev.outputs[0], add.inputs[0])
+            Edge(self.scene, other_input.outputs[0], add.inputs[1])
+            prev = add
+        output = get_class_from_opcode(OP_NODE_OUTPUT)(self.scene)
+        Edge(self.scene, prev.outputs[0], output.inputs[0])
+
+        self.assertEqual(self.scene.evaluator.evaluate([output]), [3001])
+        self.input.setInputText("2")
+        self.assertEqual(output.value, 3002)
+
+
+class SlowNode(Node):
+    """Thread-safe `Node` summing its inputs, recording where it runs"""
+    eval_thread_safe = True
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+
+    def __init__(self, scene, inputs=[1], outputs=[1]):
+        self.value = 0
+        self.eval_threads = []
+        self.mark_threads = []
+        super().__init__(scene, "Slow", inputs=inputs, outputs=outputs)
+
+    def onMarkedDirty(self):
+        self.mark_threads.append(threading.get_ident())
+
+    def eval(self):
+        cls = self.__class__
+        with cls.lock:
+            cls.running += 1
+            cls.max_running = max(cls.max_running, cls.running)
+        self.eval_threads.append(threading.get_ident())
+        time.sleep(0.01)
+        self.value = 1 + sum(node.value for socket in self.inputs for node in self.getInputs(socket.index))
+        with cls.lock: cls.running -= 1
+
+        self.markDirty(False)
+        self.setToolTip("value %d" % self.value)
+        self.markDescendantsDirty()
+        self.evalChildren()
+        return self.value
+
+
+class TestParallelEvaluation(unittest.TestCase):
+    """Tests for evaluation on worker threads"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.scene = Scene(headless=True)
+        self.scene.evaluator.setMaxWorkers(4)
+        SlowNode.max_running = 0
+
+    def tearDown(self):
+        """Tear down test fixtures, if any."""
+        self.scene.evaluator.shutdown()
+
+    def test_fan_out(self):
+        """Test that independent branches run in parallel and dependencies are respected"""
+        source = SlowNode(self.scene, inputs=[])
+        sink = SlowNode(self.scene, inputs=[1])
+        sink.inputs[0].is_multi_edges = True
+        branches = [SlowNode(self.scene) for i in range(8)]
+        for node in branches:
+            Edge(self.scene, source.outputs[0], node.inputs[0])
+            Edge(self.scene, node.outputs[0], sink.inputs[0])
+
+        main_thread = threading.get_ident()
+        self.assertEqual(self.scene.evaluator.evaluate([source]), [1])
+
+        self.assertGreater(SlowNode.max_running, 1)
+        self.assertEqual(sink.value, 1 + 8 * 2)
+        self.assertEqual(len(sink.eval_threads), 1)
+        for node in branches + [sink]:
+            self.assertEqual(len(node.eval_threads), 1)
+            self.assertNotEqual(node.eval_threads[0], main_thread)
+            self.assertFalse(node.isDirty())
+            self.assertEqual(set(node.mark_threads), {main_thread})
+        self.assertEqual(sink.getToolTip(), "value 17")
+
+    def test_calc_nodes_in_gui_thread(self):
+        """Test that nodes which are not thread-safe evaluate the same way"""
+        input_node = get_class_from_opcode(OP_NODE_INPUT)(self.scene)
+        add = get_class_from_opcode(OP_NODE_ADD)(self.scene)
+        slow = SlowNode(self.scene)
+        output = get_class_from_opcode(OP_NODE_OUTPUT)(self.scene)
+        Edge(self.scene, input_node.outputs[0], add.inputs[0])
+        Edge(self.scene, input_node.outputs[0], add.inputs[1])
+        Edge(self.scene, input_node.outputs[0], slow.inputs[0])
+        Edge(self.scene, add.outputs[0], output.inputs[0])
+
+        input_node.setInputText("21")
+        self.assertEqual(output.value, 42)
+        self.assertEqual(slow.value, 22)
+
+
+class CountingNode(Node):
+    """`Node` counting how many times it was marked"""
+
+    def __init__(self, scene):
+        self.dirty_marks = 0
+        self.invalid_marks = 0
+        super().__init__(scene, "Counting", inputs=[1, 1], outputs=[1])
+
+    def onMarkedDirty(self):
+        self.dirty_marks += 1
+
+    def onMarkedInvalid(self):
+        self.invalid_marks += 1
+
+
+class TestMarkPropagation(unittest.TestCase):
+    """Tests for propagating `Dirty` and `Invalid` marks to descendants"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.scene = Scene(headless=True)
+        self.root = CountingNode(self.scene)
+
+    def test_deep_chain(self):
+        """Test that marks reach all descendants, not just two levels"""
+        prev, chain = self.root, []
+        for i in range(5000):
+            node = CountingNode(self.scene)
+            Edge(self.scene, prev.outputs[0], node.inputs[0])
+            chain.append(node)
+            prev = node
+
+        self.root.markDescendantsDirty()
+        self.assertTrue(all(node.isDirty() for node in chain))
+        self.assertFalse(self.root.isDirty())
+        self.root.markDescendantsInvalid()
+        self.assertTrue(all(node.isInvalid() for node in chain))
+        self.root.markDescendantsDirty(False)
+        self.assertFalse(any(node.isDirty() for node in chain))
+
+    def test_shared_descendants_visited_once(self):
+        """Test that each descendant of a diamond lattice is marked once"""
+        layer, nodes = [self.root, self.root], []
+        for i in range(20):
+            new_layer = [CountingNode(self.scene), CountingNode(self.scene)]
+            for node in new_layer:
+                Edge(self.scene, layer[0].outputs[0], node.inputs[0])
+                Edge(self.scene, layer[1].outputs[0], node.inputs[1])
+            nodes.extend(new_layer)
+            layer = new_layer
+
+        self.root.markDescendantsDirty()
+        self.assertEqual([node.dirty_marks for node in nodes], [1] * len(nodes))
+        self.root.markDescendantsDirty()
+        self.assertEqual([node.dirty_marks for node in nodes], [2] * len(nodes))
+
+    def test_cycle(self):
+        """Test that propagation terminates on cycles and doesn't mark the node itself"""
+        node = CountingNode(self.scene)
+        Edge(self.scene, self.root.outputs[0], node.inputs[0])
+        Edge(self.scene, node.outputs[0], self.root.inputs[0])
+        self.root.markDescendantsDirty()
+        self.assertTrue(node.isDirty())
+        self.assertFalse(self.root.isDirty())
+
+
+if __name__ == '__main__':
+    unittest.main()
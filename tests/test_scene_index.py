@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+
+"""Tests for the id indexes of :class:`~nodeeditor.node_scene.Scene`."""
+
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_node import Node
+from nodeeditor.node_scene import Scene
+
+
+class TestSceneIndex(unittest.TestCase):
+    """Tests for `Scene` id -> object lookups"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.app = QApplication.instance() or QApplication([])
+        self.scene = Scene()
+        self.node1 = Node(self.scene, "Node 1", inputs=[1], outputs=[1])
+        self.node2 = Node(self.scene, "Node 2", inputs=[1], outputs=[1])
+        self.edge = Edge(self.scene, self.node1.outputs[0], self.node2.inputs[0])
+
+    def assertIndexConsistent(self, scene=None):
+        scene = self.scene if scene is None else scene
+        for node in scene.nodes:
+            self.assertIs(scene.getNodeByID(node.id), node)
+            for socket in node.inputs + node.outputs:
+                self.assertIs(scene.getSocketByID(socket.id), socket)
+        for edge in scene.edges:
+            self.assertIs(scene.getEdgeByID(edge.id), edge)
+
+    def test_lookups(self):
+        """Test that added objects can be found by their id"""
+        self.assertIndexConsistent()
+        self.assertIsNone(self.scene.getNodeByID(-1))
+
+    def test_remove(self):
+        """Test that removed objects are dropped from the indexes"""
+        socket_id = self.node1.outputs[0].id
+        edge_id = self.edge.id
+        self.node1.remove()
+        self.assertIsNone(self.scene.getNodeByID(self.node1.id))
+        self.assertIsNone(self.scene.getSocketByID(socket_id))
+        self.assertIsNone(self.scene.getEdgeByID(edge_id))
+        self.assertIndexConsistent()
+
+    def test_deserialize_restores_ids(self):
+        """Test that deserialization into a fresh scene re-indexes restored ids"""
+        data = self.scene.serialize()
+        other = Scene()
+        other.deserialize(data)
+        self.assertEqual(len(other.nodes), 2)
+        self.assertEqual(len(other.edges), 1)
+        self.assertIsNotNone(other.getNodeByID(self.node1.id))
+        self.assertIsNotNone(other.getEdgeByID(self.edge.id))
+        self.assertIsNotNone(other.getSocketByID(self.node2.inputs[0].id))
+        self.assertIndexConsistent(other)
+
+    def test_undo_reuses_nodes(self):
+        """Test that history restore matches existing nodes through the index"""
+        self.scene.history.storeHistory("Initial")
+        self.node2.remove()
+        self.scene.history.storeHistory("Removed")
+        self.scene.history.undo()
+        self.assertEqual(len(self.scene.nodes), 2)
+        self.assertEqual(len(self.scene.edges), 1)
+        self.assertIs(self.scene.getNodeByID(self.node1.id), self.node1)
+        self.assertIndexConsistent()
+
+
+if __name__ == '__main__':
+    unittest.main()
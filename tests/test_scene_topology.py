@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+
+"""Tests for :class:`~nodeeditor.node_scene_topology.SceneTopology`."""
+
+import random
+import unittest
+
+from nodeeditor.node_edge import Edge
+from nodeeditor.node_node import Node
+from nodeeditor.node_scene import Scene
+
+
+class TestSceneTopology(unittest.TestCase):
+    """Tests for incremental topological order and cycle detection"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.scene = Scene(headless=True)
+        self.topology = self.scene.topology
+
+    def createChain(self, length):
+        nodes = [Node(self.scene, inputs=[1], outputs=[1]) for i in range(length)]
+        for parent, child in zip(nodes, nodes[1:]):
+            Edge(self.scene, parent.outputs[0], child.inputs[0])
+        return nodes
+
+    def assertTopological(self):
+        order = self.topology.getOrder()
+        self.assertEqual(len(order), len(self.scene.nodes))
+        positions = [self.topology.getPosition(node) for node in order]
+        self.assertEqual(positions, sorted(positions))
+        for edge in self.scene.edges:
+            self.assertLess(self.topology.getPosition(edge.start_socket.node),
+                            self.topology.getPosition(edge.end_socket.node))
+
+    def test_backward_edges(self):
+        """Test that edges pointing against the order of creation reorder the nodes"""
+        random.seed(3)
+        nodes = [Node(self.scene, inputs=[1], outputs=[1]) for i in range(40)]
+        # edges of a random DAG over a shuffled order, created in random order
+        ranking = list(range(len(nodes)))
+        random.shuffle(ranking)
+        pairs = [(a, b) for a in range(len(nodes)) for b in range(len(nodes)) if ranking[a] < ranking[b]]
+        for a, b in random.sample(pairs, 80):
+            Edge(self.scene, nodes[a].outputs[0], nodes[b].inputs[0])
+            self.assertTopological()
+        self.assertFalse(self.topology.hasCycle())
+
+    def test_would_create_cycle(self):
+        """Test detecting edges which close a cycle, in both directions of dragging"""
+        nodes = self.createChain(5)
+        self.assertTrue(self.topology.wouldCreateCycle(nodes[4].outputs[0], nodes[0].inputs[0]))
+        self.assertTrue(self.topology.wouldCreateCycle(nodes[0].inputs[0], nodes[4].outputs[0]))
+        self.assertTrue(self.topology.wouldCreateCycle(nodes[2].outputs[0], nodes[2].inputs[0]))
+        self.assertFalse(self.topology.wouldCreateCycle(nodes[0].outputs[0], nodes[4].inputs[0]))
+
+        other = Node(self.scene, inputs=[1], outputs=[1])
+        self.assertFalse(self.topology.wouldCreateCycle(nodes[4].outputs[0], other.inputs[0]))
+        self.assertFalse(self.topology.wouldCreateCycle(other.outputs[0], nodes[0].inputs[0]))
+
+    def test_cycle_created_by_api(self):
+        """Test that a cycle created without the check is flagged and the order recovers when it is broken"""
+        nodes = self.createChain(3)
+        edge = Edge(self.scene, nodes[2].outputs[0], nodes[0].inputs[0])
+        self.assertTrue(self.topology.hasCycle())
+        self.assertEqual(len(self.topology.getOrder()), 3)
+
+        edge.remove()
+        self.assertFalse(self.topology.hasCycle())
+        self.assertTopological()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+
+"""Tests for :mod:`nodeeditor.node_scene_spatial_index`."""
+
+import math
+import os
+import random
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from nodeeditor.node_edge import Edge, EDGE_TYPE_BEZIER
+from nodeeditor.node_node import Node
+from nodeeditor.node_scene import Scene
+from nodeeditor.node_scene_spatial_index import GridIndex, rect_distance, segment_intersects_rect
+
+
+def random_rect(rnd, big=False):
+    x, y = rnd.uniform(-5000, 5000), rnd.uniform(-5000, 5000)
+    size = 8000 if big else 300
+    return (x, y, x + rnd.uniform(0, size), y + rnd.uniform(0, size))
+
+
+class TestGridIndex(unittest.TestCase):
+    """Tests comparing `GridIndex` queries with brute force"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.rnd = random.Random(42)
+        self.index = GridIndex(cell_size=200)
+        self.rects = {}
+        for i in range(500):
+            self.rects[i] = random_rect(self.rnd, big=(i % 50 == 0))
+            self.index.insert(i, self.rects[i])
+
+    def test_query_rect(self):
+        """Test rectangle queries"""
+        for i in range(50):
+            query = random_rect(self.rnd)
+            expected = [item for item, r in self.rects.items()
+                        if r[0] <= query[2] and r[2] >= query[0] and r[1] <= query[3] and r[3] >= query[1]]
+            self.assertEqual(self.index.queryRect(query), expected)
+
+    def test_query_segment(self):
+        """Test segment queries"""
+        for i in range(50):
+            p1 = (self.rnd.uniform(-6000, 6000), self.rnd.uniform(-6000, 6000))
+            p2 = (self.rnd.uniform(-6000, 6000), self.rnd.uniform(-6000, 6000))
+            expected = [item for item, r in self.rects.items() if segment_intersects_rect(*p1, *p2, r)]
+            self.assertEqual(self.index.querySegment(p1, p2), expected)
+
+    def test_nearest(self):
+        """Test k-nearest queries"""
+        for i in range(30):
+            x, y = self.rnd.uniform(-7000, 7000), self.rnd.uniform(-7000, 7000)
+            distances = sorted(rect_distance(r, x, y) for r in self.rects.values())
+            found = self.index.nearest(x, y, k=5)
+            self.assertEqual([rect_distance(self.rects[item], x, y) for item in found], distances[:5])
+
+    def test_update_and_remove(self):
+        """Test moving and removing items"""
+        self.index.insert(1, (10000, 10000, 10010, 10010))
+        self.assertEqual(self.index.queryRect((9999, 9999, 10001, 10001)), [1])
+        self.assertNotIn(1, self.index.queryRect(self.rects[1]))
+        self.index.remove(1)
+        self.assertNotIn(1, self.index)
+        self.assertEqual(self.index.queryRect((9999, 9999, 10001, 10001)), [])
+        self.assertEqual(len(self.index), 499)
+
+
+class TestSceneSpatialIndex(unittest.TestCase):
+    """Tests for the spatial index of `Scene`"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.scene = Scene(headless=True)
+        self.node1 = Node(self.scene, "Node 1", inputs=[1], outputs=[1])
+        self.node2 = Node(self.scene, "Node 2", inputs=[1, 1], outputs=[1])
+        self.node2.setPos(1000, 0)
+        self.edge = Edge(self.scene, self.node1.outputs[0], self.node2.inputs[0])
+
+    def test_nodes_follow_positions(self):
+        """Test that moving nodes updates the index"""
+        index = self.scene.spatial_index
+        self.assertEqual(index.nodesInRect((900, 0, 1100, 10)), [self.node2])
+        self.node2.setPos(5000, 5000)
+        self.assertEqual(index.nodesInRect((900, 0, 1100, 10)), [])
+        self.assertEqual(index.nearestNodes(5100, 5100), [self.node2])
+        self.assertEqual(index.edgesInRect((4900, 4900, 5000, 5300)), [self.edge])
+        self.node2.remove()
+        self.assertEqual(len(index.nodes), 1)
+        self.assertEqual(len(index.edges), 0)
+
+    def test_edges(self):
+        """Test that edges are indexed while connected"""
+        index = self.scene.spatial_index
+        sx, sy = self.node1.getSocketScenePosition(self.node1.outputs[0])
+        dx, dy = self.node2.getSocketScenePosition(self.node2.inputs[0])
+        self.assertEqual(index.edgesNearSegment(((sx + dx) / 2, -1000), ((sx + dx) / 2, 1000)), [self.edge])
+        self.assertEqual(index.edgesNearSegment((sx, -1000), (dx, -900)), [])
+        self.edge.remove()
+        self.assertEqual(index.edgesInRect((-10000, -10000, 10000, 10000)), [])
+
+    def test_nearest_sockets(self):
+        """Test nearest sockets against brute force"""
+        sockets = [socket for node in self.scene.nodes for socket in node.inputs + node.outputs]
+        for x, y in ((0, 0), (190, 50), (990, 200), (600, 100)):
+            distances = sorted(
+                math.hypot(x - sx, y - sy) for sx, sy in (s.node.getSocketScenePosition(s) for s in sockets)
+            )
+            found = self.scene.spatial_index.nearestSockets(x, y, k=2)
+            self.assertEqual(
+                [math.hypot(x - sx, y - sy) for sx, sy in (s.node.getSocketScenePosition(s) for s in found)],
+                distances[:2]
+            )
+
+
+class TestEdgeBoundingRect(unittest.TestCase):
+    """Tests that model bounding boxes contain the painted paths"""
+
+    def setUp(self):
+        """Set up test fixtures, if any."""
+        self.app = QApplication.instance() or QApplication([])
+        self.scene = Scene()
+
+    def test_bezier_contained(self):
+        """Test bezier edges in both directions"""
+        node1 = Node(self.scene, "Node 1", inputs=[1], outputs=[1])
+        node2 = Node(self.scene, "Node 2", inputs=[1], outputs=[1])
+        for pos in ((600, 300), (-600, 300), (-600, -300), (100, 0)):
+            node2.setPos(*pos)
+            for start, end in ((node1.outputs[0], node2.inputs[0]), (node2.outputs[0], node1.inputs[0])):
+                edge = Edge(self.scene, start, end, edge_type=EDGE_TYPE_BEZIER)
+                path_rect = edge.grEdge.calcPath().boundingRect()
+                x1, y1, x2, y2 = edge.getBoundingRect()
+                self.assertLessEqual(x1, path_rect.left() + 1e-6)
+                self.assertLessEqual(y1, path_rect.top() + 1e-6)
+                self.assertGreaterEqual(x2, path_rect.right() - 1e-6)
+                self.assertGreaterEqual(y2, path_rect.bottom() - 1e-6)
+                edge.remove()
+
+
+if __name__ == '__main__':
+    unittest.main()